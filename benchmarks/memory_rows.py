@@ -0,0 +1,82 @@
+"""Compare the memory used by buffered report rows, as dicts and compact rows.
+
+Run with ``nox -s benchmarks`` or ``python benchmarks/memory_rows.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from tap_criteo.dedup import LatestRowIndex
+from tap_criteo.rows import make_row_type
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ROWS = 200_000
+DIMENSIONS = ("Day", "CampaignId", "Campaign", "Device", "Os", "Channel")
+METRICS = ("Clicks", "Displays", "AdvertiserCost", "SalesPc30d")
+
+DEVICES = ("Desktop", "Smartphone", "Tablet", "Other")
+SYSTEMS = ("Android", "iOS", "Windows", "macOS", "Linux")
+CHANNELS = ("Display", "Native", "Video", "Retail Media")
+CAMPAIGNS = [(str(1000 + i), f"Campaign {i} - Retargeting - EMEA") for i in range(50)]
+
+
+def generate_rows(count: int) -> list[str]:
+    """Return serialized report rows, decoded while buffering like API responses."""
+    rng = random.Random(0)  # noqa: S311
+    rows = []
+    for i in range(count):
+        campaign_id, campaign = rng.choice(CAMPAIGNS)
+        row = {
+            "Day": f"2025-06-{i % 30 + 1:02d}",
+            "CampaignId": campaign_id,
+            "Campaign": campaign,
+            "Device": rng.choice(DEVICES),
+            "Os": rng.choice(SYSTEMS),
+            "Channel": rng.choice(CHANNELS),
+            "Currency": "USD",
+            **{metric: str(rng.randint(0, 10_000)) for metric in METRICS},
+        }
+        rows.append(json.dumps(row))
+    return rows
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """Return the memory held by the result of a function, in bytes."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    """Print the memory used by a full de-duplication index of each row type."""
+    lines = generate_rows(ROWS)
+    row_type = make_row_type(
+        "ReportRow",
+        [*DIMENSIONS, "Currency", *METRICS],
+        interned=[*DIMENSIONS, "Currency"],
+    )
+
+    def fill(index: LatestRowIndex) -> LatestRowIndex:
+        for i, line in enumerate(lines):
+            index.add((i,), json.loads(line))
+        return index
+
+    dicts = measure(lambda: fill(LatestRowIndex(memory_rows=ROWS)))
+    compact = measure(lambda: fill(LatestRowIndex(memory_rows=ROWS, row_type=row_type)))
+
+    print(f"{ROWS} buffered rows")  # noqa: T201
+    print(f"dict rows:    {dicts / 2**20:8.1f} MiB")  # noqa: T201
+    print(f"compact rows: {compact / 2**20:8.1f} MiB ({compact / dicts:.0%})")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare the throughput of report row conversion in each numeric mode.
+
+Run with ``nox -s benchmarks`` or ``python benchmarks/numeric_modes.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from singer_sdk.singerlib.json import serialize_json
+
+from tap_criteo.streams.reports import NUMERIC_MODES, coerce_row, get_value_funcs
+
+ROWS = 200_000
+METRICS = ("Clicks", "Displays", "AdvertiserCost", "Cpc", "ECpm", "RoasPc30d")
+
+
+def generate_rows(count: int) -> list[dict[str, str]]:
+    """Return report rows with string values, as the API returns them."""
+    rng = random.Random(0)  # noqa: S311
+    return [
+        {
+            "Day": f"2025-06-{i % 30 + 1:02d}",
+            "Clicks": str(rng.randint(0, 10_000)),
+            "Displays": str(rng.randint(0, 1_000_000)),
+            **{
+                metric: f"{rng.uniform(0, 10_000):.6f}"
+                for metric in METRICS
+                if metric not in {"Clicks", "Displays"}
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    """Print the rows converted and serialized per second in each numeric mode."""
+    rows = generate_rows(ROWS)
+    print(f"{ROWS} report rows")  # noqa: T201
+    for mode in NUMERIC_MODES:
+        value_funcs = get_value_funcs(mode)
+        batch = [dict(row) for row in rows]
+        start = time.perf_counter()
+        for row in batch:
+            serialize_json(coerce_row(row, value_funcs))
+        elapsed = time.perf_counter() - start
+        print(f"{mode:<10} {ROWS / elapsed:>12,.0f} rows/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Measure the throughput of full syncs replayed from recorded cassettes.
+
+Record a cassette by syncing with the ``cassette_path`` setting, then run with
+``nox -s benchmarks`` or ``python benchmarks/replay_sync.py [CASSETTE ...]``.
+Cassettes default to ``benchmarks/cassettes/*.jsonl.gz``. Responses are served
+immediately, unless a ``REPLAY_SPEED`` is set in the environment, e.g. ``1`` to keep
+their recorded latency.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from tap_criteo.offload import PreparedRecordWriter
+
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+
+
+def replay(path: Path, speed: float) -> None:
+    """Sync all streams from a cassette, and print its throughput."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(next(file))
+
+    tap = TapCriteo(
+        config={
+            "client_id": "replay",
+            "client_secret": "replay",
+            "advertiser_ids": header["advertiser_ids"],
+            "start_date": header["start_date"],
+            "reports": header["reports"],
+            "cassette_path": str(path),
+            "cassette_mode": "replay",
+            "cassette_speed": speed,
+        },
+    )
+    for name, stream in tap.streams.items():
+        stream.selected = name in header["streams"]
+
+    writer = cast("PreparedRecordWriter", tap.message_writer)
+    with Path(os.devnull).open("w") as output:
+        writer.output = output
+        start = time.perf_counter()
+        try:
+            tap.run_sync()
+        finally:
+            elapsed = time.perf_counter() - start
+            tap.close()
+
+    records = tap.telemetry.total("records")
+    requests = tap.telemetry.total("requests")
+    print(  # noqa: T201
+        f"{path.name}: {records:,.0f} records, {requests:,.0f} requests in "
+        f"{elapsed:.2f}s ({records / elapsed:,.0f} records/s)",
+    )
+
+
+def main() -> None:
+    """Replay each cassette."""
+    paths = [Path(arg) for arg in sys.argv[1:]] or sorted(
+        CASSETTES_DIR.glob("*.jsonl.gz"),
+    )
+    if not paths:
+        print(f"No cassettes to replay in {CASSETTES_DIR}")  # noqa: T201
+        return
+
+    speed = float(os.environ.get("REPLAY_SPEED", "0"))
+    for path in paths:
+        replay(path, speed)
+
+
+if __name__ == "__main__":
+    main()
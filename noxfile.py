@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import sys
+from pathlib import Path
 
 import nox
 
@@ -65,3 +66,21 @@ def tests(session: nox.Session) -> None:
         env=env,
     )
     session.run("pytest", *session.posargs)
+
+
+@nox.session()
+def benchmarks(session: nox.Session) -> None:
+    """Run the benchmarks."""
+    env = {
+        "UV_PROJECT_ENVIRONMENT": session.virtualenv.location,
+    }
+    if isinstance(session.python, str):
+        env["UV_PYTHON"] = session.python
+
+    session.run_install(
+        *UV_SYNC_COMMAND,
+        env=env,
+    )
+    scripts = session.posargs or sorted(str(p) for p in Path("benchmarks").glob("*.py"))
+    for script in scripts:
+        session.run("python", script)
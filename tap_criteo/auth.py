@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from singer_sdk.authenticators import OAuthAuthenticator
 
+if TYPE_CHECKING:
+    from tap_criteo.telemetry import Telemetry
+
 
 class CriteoAuthenticator(OAuthAuthenticator):
     """Authenticator class for Criteo."""
 
+    #: Metrics that token refreshes are counted in.
+    telemetry: Telemetry | None = None
+
     @property
     def oauth_request_body(self) -> dict:
         """Define the OAuth request body for the Criteo API.
@@ -20,3 +28,9 @@ class CriteoAuthenticator(OAuthAuthenticator):
             "client_secret": self.client_secret,
             "grant_type": "client_credentials",
         }
+
+    def update_access_token(self) -> None:
+        """Request a new access token."""
+        super().update_access_token()
+        if self.telemetry:
+            self.telemetry.inc("token_refreshes")
@@ -0,0 +1,49 @@
+"""Run-level time budget."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+
+class SyncBudget:
+    """Time budget of a sync run.
+
+    Once the budget runs out, streams and partitions that have not started yet are
+    deferred: they are skipped, and their bookmarks are left where they were, so the
+    next run resumes them. Streams and partitions already started are not
+    interrupted, except between report windows.
+    """
+
+    def __init__(self, seconds: float | None = None) -> None:
+        """Initialize the budget.
+
+        Args:
+            seconds: Duration of the budget. Without it, the budget never runs out.
+        """
+        self.seconds = seconds
+        self.deferred: dict[str, list[dict[str, Any] | None]] = {}
+        self._deadline: float | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the budget of a new run."""
+        self._deadline = time.monotonic() + self.seconds if self.seconds else None
+        with self._lock:
+            self.deferred.clear()
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the budget ran out."""
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def defer(self, stream_name: str, context: dict[str, Any] | None) -> None:
+        """Record a stream or partition deferred to the next run.
+
+        Args:
+            stream_name: Name of the stream.
+            context: Partition, or None for the whole stream.
+        """
+        with self._lock:
+            self.deferred.setdefault(stream_name, []).append(context)
@@ -0,0 +1,370 @@
+"""Recording of anonymized HTTP exchanges, and their offline replay."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from datetime import timedelta
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests  # type: ignore[import-untyped]
+from requests.adapters import BaseAdapter, HTTPAdapter  # type: ignore[import-untyped]
+
+from tap_criteo.enrichment import NAME_DIMENSIONS
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+    from pathlib import Path
+
+CASSETTE_MODES = ("record", "replay")
+
+#: Request body keys left out when matching requests, as they depend on the run date
+VOLATILE_KEYS = frozenset({"startDate", "endDate"})
+
+#: Keys whose values are entity names, replaced by placeholders of the same length
+NAME_KEYS = frozenset({"name", *NAME_DIMENSIONS})
+
+#: Keys whose values are secrets
+SECRET_KEYS = frozenset({"access_token", "refresh_token", "client_secret"})
+
+
+class Scrubber:
+    """Anonymization of the IDs, names and secrets of HTTP exchanges.
+
+    Each ID is replaced by a pseudonym of the same length, consistently across
+    URLs, request bodies and responses, so that requests still refer to the entities
+    of earlier responses. Pseudonyms have no leading zeros, so that IDs served as
+    JSON numbers keep their pseudonym once parsed, e.g. in the URLs of later
+    requests.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a scrubber without pseudonyms."""
+        self.pseudonyms: dict[str, str] = {}
+        self._used: set[str] = set()
+        self._lock = threading.Lock()
+
+    def scrub_id(self, value: str) -> str:
+        """Return the pseudonym of an ID.
+
+        Args:
+            value: Original ID.
+
+        Returns:
+            A number with as many digits as the ID has characters, or more once
+            those run out.
+        """
+        with self._lock:
+            if value not in self.pseudonyms:
+                number = 10 ** (len(value) - 1) + len(self.pseudonyms) + 1
+                while str(number) in self._used:
+                    number += 1
+                self.pseudonyms[value] = str(number)
+                self._used.add(str(number))
+            return self.pseudonyms[value]
+
+    def scrub_value(self, key: str, value: Any) -> Any:  # noqa: ANN401
+        """Scrub a value of a JSON document, according to its key.
+
+        Args:
+            key: Key of the value.
+            value: Value.
+
+        Returns:
+            The scrubbed value.
+        """
+        if isinstance(value, dict):
+            return self.scrub(value)
+        if isinstance(value, list):
+            return [self.scrub_value(key, item) for item in value]
+        if key in SECRET_KEYS:
+            return "scrubbed"
+        if key in NAME_KEYS or key.endswith("Name"):
+            return "x" * len(value) if isinstance(value, str) else value
+        if key == "id" or key.endswith(("Id", "Ids")):
+            return self._scrub_ids(value)
+        return value
+
+    def _scrub_ids(self, value: Any) -> Any:  # noqa: ANN401
+        """Scrub an ID, or comma-separated IDs, keeping their type."""
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            return value
+        scrubbed = ",".join(self.scrub_id(part) for part in str(value).split(","))
+        return int(scrubbed) if isinstance(value, int) else scrubbed
+
+    def scrub(self, document: Any) -> Any:  # noqa: ANN401
+        """Scrub a JSON document.
+
+        Args:
+            document: Parsed JSON.
+
+        Returns:
+            A scrubbed copy of the document.
+        """
+        if isinstance(document, dict):
+            return {
+                key: self.scrub_value(key, value) for key, value in document.items()
+            }
+        if isinstance(document, list):
+            return [self.scrub(item) for item in document]
+        return document
+
+    def scrub_url(self, url: str) -> str:
+        """Scrub the numeric path segments and ID parameters of a URL.
+
+        Args:
+            url: Request URL.
+
+        Returns:
+            The path and query string of the URL, without its host.
+        """
+        parts = urlsplit(url)
+        path = "/".join(
+            self.scrub_id(segment) if segment.isdigit() else segment
+            for segment in parts.path.split("/")
+        )
+        query = urlencode(
+            [
+                (key, self.scrub_value(key, value))
+                for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            ],
+        )
+        return f"{path}?{query}" if query else path
+
+    def scrub_body(self, body: bytes | str | None) -> Any:  # noqa: ANN401
+        """Scrub a JSON body. Other bodies, e.g. OAuth forms, are dropped.
+
+        Args:
+            body: Raw body.
+
+        Returns:
+            The scrubbed JSON document, or None.
+        """
+        if not body:
+            return None
+        try:
+            return self.scrub(json.loads(body))
+        except ValueError:
+            return None
+
+
+def get_request_key(method: str, url: str, body: Any) -> str:  # noqa: ANN401
+    """Return the key a recorded request is matched on.
+
+    Args:
+        method: HTTP method.
+        url: Path and query string.
+        body: JSON body, or None.
+
+    Returns:
+        The key.
+    """
+    if isinstance(body, dict):
+        body = {key: value for key, value in body.items() if key not in VOLATILE_KEYS}
+    return json.dumps([method.upper(), url, body], sort_keys=True)
+
+
+class CassetteRecorder:
+    """Anonymized HTTP exchanges written to a gzip-compressed JSON Lines file.
+
+    The first line is a header with the anonymized advertiser IDs, the reports and
+    the selected streams of the recorded sync, to configure a replay. Each following
+    line is one exchange, with its duration.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        config: Mapping[str, Any],
+        streams: Collection[str] = (),
+    ) -> None:
+        """Create the cassette file.
+
+        Args:
+            path: Path of the cassette file.
+            config: Configuration of the recorded sync.
+            streams: Names of the streams the sync selects.
+        """
+        self.scrubber = Scrubber()
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")  # noqa: SIM115
+        advertiser_ids = [
+            advertiser_id
+            for tenant in config.get("tenants") or [config]
+            for advertiser_id in tenant.get("advertiser_ids", [])
+        ]
+        self._write(
+            {
+                "advertiser_ids": [self.scrubber.scrub_id(i) for i in advertiser_ids],
+                "start_date": config.get("start_date"),
+                "reports": config.get("reports", []),
+                "streams": sorted(streams),
+            },
+        )
+
+    def _write(self, document: dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(document) + "\n")
+
+    def record(self, response: requests.Response, elapsed: float) -> None:
+        """Record an exchange.
+
+        Args:
+            response: Response, along with its request.
+            elapsed: Duration of the exchange, in seconds.
+        """
+        request = response.request
+        try:
+            content = self.scrubber.scrub(response.json())
+        except ValueError:
+            content = None
+        self._write(
+            {
+                "method": request.method,
+                "url": self.scrubber.scrub_url(request.url),
+                "body": self.scrubber.scrub_body(request.body),
+                "status": response.status_code,
+                "content_type": response.headers.get("Content-Type"),
+                "content": content,
+                "elapsed": round(elapsed, 6),
+            },
+        )
+
+    def close(self) -> None:
+        """Close the cassette file."""
+        with self._lock:
+            self._file.close()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter recording its exchanges into a cassette."""
+
+    def __init__(self, recorder: CassetteRecorder, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize the adapter.
+
+        Args:
+            recorder: Cassette the exchanges are recorded into.
+            kwargs: Keyword arguments for :class:`requests.adapters.HTTPAdapter`.
+        """
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> requests.Response:
+        """Send a request and record the exchange.
+
+        Returns:
+            The response.
+        """
+        start = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+        # Read the body, so that its download counts towards the duration
+        _ = response.content
+        self.recorder.record(response, time.perf_counter() - start)
+        return response
+
+    def close(self) -> None:
+        """Close the connection pool and the cassette."""
+        super().close()
+        self.recorder.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter serving the exchanges of a cassette.
+
+    Requests are matched on their method, URL and body, leaving report dates out.
+    Repeated requests get the recorded responses in order, then from the first one
+    again. Requests missing from the cassette get a 404 response.
+    """
+
+    def __init__(self, path: str | Path, *, speed: float = 1) -> None:
+        """Load a cassette.
+
+        Args:
+            path: Path of the cassette file.
+            speed: Replay speed: responses take their recorded duration divided by
+                the speed. With 0, they are served immediately.
+        """
+        super().__init__()
+        self.speed = speed
+        self.exchanges: dict[str, list[dict[str, Any]]] = {}
+        self._served: dict[str, int] = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            self.header = json.loads(next(file))
+            for line in file:
+                exchange = json.loads(line)
+                key = get_request_key(
+                    exchange["method"],
+                    exchange["url"],
+                    exchange["body"],
+                )
+                self.exchanges.setdefault(key, []).append(exchange)
+
+    def _next_exchange(self, key: str) -> dict[str, Any] | None:
+        """Return the next recorded exchange of a request, if any."""
+        exchanges = self.exchanges.get(key)
+        if not exchanges:
+            return None
+        with self._lock:
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+        return exchanges[index % len(exchanges)]
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        *_: Any,  # noqa: ANN401
+        **__: Any,  # noqa: ANN401
+    ) -> requests.Response:
+        """Serve the recorded response of a request.
+
+        Returns:
+            The response.
+        """
+        parts = urlsplit(request.url)
+        url = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        body = None
+        if request.body:
+            try:
+                body = json.loads(request.body)
+            except ValueError:
+                body = None
+        exchange = self._next_exchange(get_request_key(request.method, url, body))
+
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.headers["Content-Type"] = "application/json"
+        if exchange is None:
+            response.status_code = HTTPStatus.NOT_FOUND
+            response._content = json.dumps(  # noqa: SLF001
+                {"errors": [{"title": f"Request not in cassette: {url}"}]},
+            ).encode()
+            return response
+
+        if self.speed:
+            time.sleep(exchange["elapsed"] / self.speed)
+        response.status_code = exchange["status"]
+        response.reason = HTTPStatus(exchange["status"]).phrase
+        response.elapsed = timedelta(seconds=exchange["elapsed"])
+        if exchange["content_type"]:
+            response.headers["Content-Type"] = exchange["content_type"]
+        response._content = (  # noqa: SLF001
+            b""
+            if exchange["content"] is None
+            else json.dumps(exchange["content"]).encode()
+        )
+        return response
+
+    def close(self) -> None:
+        """Nothing to release."""
@@ -0,0 +1,116 @@
+"""Cache of the discovered catalog."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from tap_criteo.files import write_text_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+#: Report settings the catalog depends on
+CATALOG_REPORT_FIELDS = ("name", "dimensions", "metrics", "numeric_mode", "intraday")
+
+
+def get_catalog_key(config: Mapping[str, Any]) -> str:
+    """Return a key identifying the catalog a configuration discovers.
+
+    The catalog only depends on the tap version, on the configured reports, and on
+    whether tenants are configured, which adds the tenant property to schemas.
+
+    Args:
+        config: Tap configuration.
+
+    Returns:
+        A hex digest.
+    """
+    reports = [
+        {field: report.get(field) for field in CATALOG_REPORT_FIELDS}
+        for report in config.get("reports", [])
+    ]
+    payload = {
+        "version": version("tap-criteo"),
+        "reports": reports,
+        "tenants": bool(config.get("tenants")),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class CatalogCache:
+    """Discovered catalog kept in a JSON file, along with its key."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: Path of the JSON file.
+        """
+        self.path = Path(path)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached catalog.
+
+        Args:
+            key: Key of the expected catalog, see :func:`get_catalog_key`.
+
+        Returns:
+            The catalog, or None if it is missing or was discovered for another key.
+        """
+        try:
+            cached = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        return cached["catalog"] if cached.get("key") == key else None
+
+    def save(self, key: str, catalog: dict[str, Any]) -> None:
+        """Replace the cached catalog, atomically for concurrent tap processes.
+
+        Args:
+            key: Key of the catalog, see :func:`get_catalog_key`.
+            catalog: The discovered catalog.
+        """
+        write_text_atomic(self.path, json.dumps({"key": key, "catalog": catalog}))
+
+
+def get_cached_catalog(args: Sequence[str]) -> dict[str, Any] | None:
+    """Return the cached catalog for a ``--discover`` command line.
+
+    Only command lines made of ``--discover`` and ``--config`` files are answered
+    from the cache, e.g. not those reading the configuration from the environment.
+
+    Args:
+        args: Command line arguments, without the program name.
+
+    Returns:
+        The catalog, or None if the command line must be handled by the tap.
+    """
+    if "--discover" not in args:
+        return None
+
+    config_paths = []
+    remaining = list(args)
+    remaining.remove("--discover")
+    while remaining:
+        option, *value = remaining[:2]
+        if option != "--config" or not value or value[0] == "ENV":
+            return None
+        config_paths.append(value[0])
+        del remaining[:2]
+
+    config: dict[str, Any] = {}
+    try:
+        for config_path in config_paths:
+            config.update(json.loads(Path(config_path).read_text()))
+    except (OSError, ValueError):
+        return None
+
+    cache_path = config.get("catalog_cache_path")
+    if not cache_path:
+        return None
+    return CatalogCache(cache_path).get(get_catalog_key(config))
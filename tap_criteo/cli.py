@@ -0,0 +1,134 @@
+"""Command line entry point of tap-criteo."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from tap_criteo.catalog_cache import get_cached_catalog
+from tap_criteo.files import write_text_atomic
+
+#: Version printed for packages that are not installed, like the Singer SDK does
+UNKNOWN_VERSION = "[could not be detected]"
+
+#: Output formats of ``--about``
+ABOUT_FORMATS = ("text", "json", "markdown")
+
+#: Module defining the tap's settings, which the ``--about`` output is built from
+SETTINGS_MODULE = Path(__file__).with_name("tap.py")
+
+
+def _get_version(package: str) -> str:
+    """Return the installed version of a package."""
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return UNKNOWN_VERSION
+
+
+def get_about_format(args: list[str]) -> str | None:
+    """Return the output format of an ``--about`` command line.
+
+    Args:
+        args: Command line arguments, without the program name.
+
+    Returns:
+        The format, or None if the command line is not only ``--about`` and an
+        optional ``--format`` supported by the Singer SDK.
+    """
+    if args == ["--about"]:
+        return "text"
+    if args[:1] != ["--about"]:
+        return None
+    # Both "--format json" and "--format=json"
+    option, _, output_format = "=".join(args[1:]).partition("=")
+    if option == "--format" and output_format in ABOUT_FORMATS:
+        return output_format
+    return None
+
+
+def get_about_cache_path(output_format: str) -> Path:
+    """Return the file the ``--about`` output of a format is cached in.
+
+    Args:
+        output_format: Output format, e.g. ``json``.
+
+    Returns:
+        A path in the user's cache directory.
+    """
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_dir) / "tap-criteo" / f"about.{output_format}"
+
+
+def _get_about_key() -> str:
+    """Return a key identifying the ``--about`` output of the installed tap."""
+    return json.dumps(
+        [
+            _get_version("tap-criteo"),
+            _get_version("singer_sdk"),
+            SETTINGS_MODULE.stat().st_mtime_ns,
+        ],
+    )
+
+
+def _print_about(output_format: str) -> None:
+    """Print the ``--about`` output, from the cache when it is up to date."""
+    cache_path = get_about_cache_path(output_format)
+    key = _get_about_key()
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cached = {}
+    if cached.get("key") == key:
+        sys.stdout.write(cached["output"])
+        return
+
+    from tap_criteo.tap import TapCriteo  # noqa: PLC0415
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        TapCriteo.print_about(output_format)
+    sys.stdout.write(output.getvalue())
+    with contextlib.suppress(OSError):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(
+            cache_path,
+            json.dumps({"key": key, "output": output.getvalue()}),
+        )
+
+
+def main() -> None:
+    """Run the tap's command line interface.
+
+    ``--version`` is printed from the package metadata, and ``--about`` and
+    ``--discover`` are answered from their caches when they are up to date, all
+    without importing the tap and the Singer SDK. The ``--about`` output only
+    depends on the installed versions and the tap's settings, so it is cached in
+    the user's cache directory the first time it is printed. Other commands load
+    the tap.
+    """
+    args = sys.argv[1:]
+    if args == ["--version"]:
+        sys.stdout.write(
+            f"tap-criteo v{_get_version('tap-criteo')}, "
+            f"Meltano SDK v{_get_version('singer_sdk')}\n",
+        )
+        return
+
+    if (output_format := get_about_format(args)) is not None:
+        _print_about(output_format)
+        return
+
+    catalog = get_cached_catalog(args)
+    if catalog is not None:
+        sys.stdout.write(json.dumps(catalog, indent=2) + "\n")
+        return
+
+    from tap_criteo.tap import TapCriteo  # noqa: PLC0415
+
+    TapCriteo.cli()
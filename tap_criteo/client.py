@@ -2,12 +2,38 @@
 
 from __future__ import annotations
 
+import copy
+import functools
 import sys
-from typing import TYPE_CHECKING, Any
+import threading
+import time
+from contextlib import contextmanager
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, cast
 
+import requests  # type: ignore[import-untyped]
+from singer_sdk.exceptions import RetriableAPIError
 from singer_sdk.streams import RESTStream
 
-from tap_criteo.auth import CriteoAuthenticator
+from tap_criteo.decoding import ENVELOPE_JSONPATH, EnvelopeDecoder
+from tap_criteo.history import get_partition_key
+from tap_criteo.pipeline import (
+    BATCH_SIZE,
+    DEFAULT_PREFETCH_DEPTH,
+    Prefetcher,
+    ProcessedRecord,
+    batched,
+    pipelined,
+)
+from tap_criteo.resilience import (
+    HEDGE_QUANTILE,
+    CircuitOpenError,
+    hedged_call,
+    is_idempotent,
+)
+from tap_criteo.sharding import shard_advertiser_ids
+from tap_criteo.tenants import TENANT_KEY
+from tap_criteo.validation import RecordValidator
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -15,7 +41,18 @@ else:
     from typing_extensions import override
 
 if TYPE_CHECKING:
-    from singer_sdk.helpers.types import Context, Record
+    from collections.abc import Generator, Iterable, Iterator, Mapping
+
+    from backoff.types import Details
+    from singer_sdk import Tap
+    from singer_sdk.helpers.types import Context, Record, RequestFunc
+
+    from tap_criteo.auth import CriteoAuthenticator
+    from tap_criteo.budget import SyncBudget
+    from tap_criteo.resilience import EndpointHealth
+    from tap_criteo.tap import TapCriteo
+    from tap_criteo.telemetry import Telemetry
+    from tap_criteo.tenants import Tenant
 
 
 class CriteoStream(RESTStream):
@@ -23,21 +60,723 @@ class CriteoStream(RESTStream):
 
     url_base = "https://api.criteo.com"
 
-    records_jsonpath = "$.data[*]"
+    records_jsonpath = ENVELOPE_JSONPATH
 
     primary_keys = ("id",)
 
+    #: Whether the stream only covers the configured advertisers. When the tap is
+    #: sharded, other streams are only synced by the first shard.
+    advertiser_scoped = False
+
+    #: Number of pages parsed for the partition being synced
+    _page_number = 0
+
+    #: Tenant of the partition being synced, or None for the first tenant
+    _tenant_name: str | None = None
+
+    #: Whether this instance requests the pages of a prefetched partition
+    _prefetching = False
+
+    #: Partitions requested ahead during the current sync
+    _prefetcher: Prefetcher[list[dict]] | None = None
+
+    def __init__(self, tap: Tap, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize the stream, and the request costs of its partitions.
+
+        Args:
+            tap: The tap instance.
+            args: Positional arguments of the SDK stream.
+            kwargs: Keyword arguments of the SDK stream.
+        """
+        super().__init__(tap, *args, **kwargs)
+        #: Seconds spent requesting each partition during the current sync
+        self.partition_costs: dict[str, float] = {}
+        # Copies of the stream share the costs, which they update from prefetch
+        # threads
+        self._costs_lock = threading.Lock()
+
+    @property
+    def tenants(self) -> list[Tenant]:
+        """Return the tenants of the tap."""
+        return cast("TapCriteo", self._tap).tenants
+
+    def get_tenant_advertiser_ids(self, tenant: Tenant) -> list[str]:
+        """Return the advertisers of a tenant that belong to this tap's shard.
+
+        Args:
+            tenant: Tenant.
+
+        Returns:
+            Advertiser IDs.
+        """
+        return shard_advertiser_ids(
+            tenant.advertiser_ids,
+            shard_index=self.config.get("shard_index", 0),
+            shard_count=self.config.get("shard_count", 1),
+        )
+
+    @property
+    def advertiser_ids(self) -> list[str]:
+        """Return the configured advertisers that belong to this tap's shard."""
+        return [
+            advertiser_id
+            for tenant in self.tenants
+            for advertiser_id in self.get_tenant_advertiser_ids(tenant)
+        ]
+
+    def get_advertiser_partitions(self, key: str) -> list[dict]:
+        """Return one partition per advertiser of this tap's shard.
+
+        A tenant without configured advertisers gets a single partition without
+        the advertiser key, which covers all of its advertisers. It is synced by
+        the first shard only.
+
+        Args:
+            key: Partition key of the advertiser ID.
+
+        Returns:
+            Partitions, tagged with their tenant in multi-tenant mode.
+        """
+        partitions = []
+        for tenant in self.tenants:
+            if not tenant.advertiser_ids:
+                if not self.config.get("shard_index", 0):
+                    partitions.append(dict(tenant.tag))
+                continue
+            partitions.extend(
+                {**tenant.tag, key: advertiser_id}
+                for advertiser_id in self.get_tenant_advertiser_ids(tenant)
+            )
+        return partitions
+
+    @override
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Return one partition per tenant in multi-tenant mode."""
+        if self.config.get("tenants"):
+            return [tenant.tag for tenant in self.tenants]
+        return super().partitions
+
     @override
     @property
     def authenticator(self) -> CriteoAuthenticator:
-        """Return a new authenticator object."""
-        return CriteoAuthenticator(
-            client_id=self.config["client_id"],
-            client_secret=self.config["client_secret"],
-            auth_endpoint="https://api.criteo.com/oauth2/token",
+        """Return the tenant's authenticator, so its access token is shared."""
+        return cast("TapCriteo", self._tap).get_authenticator(self._tenant_name)
+
+    @override
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the tap's session, so connections are shared."""
+        return cast("TapCriteo", self._tap).requests_session
+
+    @property
+    def telemetry(self) -> Telemetry:
+        """Return the tap's metrics."""
+        return cast("TapCriteo", self._tap).telemetry
+
+    @property
+    def budget(self) -> SyncBudget:
+        """Return the tap's sync time budget."""
+        return cast("TapCriteo", self._tap).budget
+
+    @property
+    def endpoint_health(self) -> EndpointHealth:
+        """Return the latencies and circuit breaker of the stream's endpoint."""
+        return cast("TapCriteo", self._tap).endpoints.get(self.path)
+
+    def defer_partition(self, context: Context | None) -> bool:
+        """Defer a partition to the next run.
+
+        Partitions are deferred once the sync budget ran out, or while the circuit
+        of the stream's endpoint is open.
+
+        Args:
+            context: Stream partition.
+
+        Returns:
+            True if the partition was deferred.
+        """
+        if context is None or not (
+            self.budget.exhausted or self.endpoint_health.breaker.is_open
+        ):
+            return False
+
+        self.budget.defer(self.name, dict(context))
+        return True
+
+    @contextmanager
+    def deferring_open_circuit(self, context: Context | None) -> Iterator[None]:
+        """Defer the partition being synced if the circuit of its endpoint opens.
+
+        The records written before the circuit opened are kept, and the next run
+        syncs the partition again.
+
+        Args:
+            context: Stream partition.
+
+        Yields:
+            Nothing.
+        """
+        try:
+            yield
+        except CircuitOpenError as error:
+            self.logger.warning(
+                "Deferring partition %s of stream '%s': %s",
+                context,
+                self.name,
+                error,
+            )
+            self.budget.defer(self.name, dict(context) if context else None)
+
+    def prioritize_partitions(self, partitions: list[dict]) -> list[dict]:
+        """Order partitions by staleness, then by their cost in previous runs.
+
+        The partitions the previous run deferred come first, then the ones never
+        synced, then the cheapest ones according to the seconds spent requesting
+        them, so that a sync budget is not spent on the most expensive partitions
+        first.
+
+        Args:
+            partitions: Stream partitions.
+
+        Returns:
+            The partitions, previously deferred ones first, then by increasing cost.
+        """
+        history = cast("TapCriteo", self._tap).history
+        deferred = history.streams.get(self.name, {}).get("deferred_partitions", [])
+        costs = history.get_partition_costs(self.name)
+        return sorted(
+            partitions,
+            key=lambda partition: (
+                partition not in deferred,
+                costs.get(get_partition_key(partition), 0.0),
+            ),
+        )
+
+    def get_cost_partition(self, context: Context) -> dict:
+        """Return the partition whose cost a request adds to.
+
+        Args:
+            context: Context the request was sent for.
+
+        Returns:
+            The stream partition.
+        """
+        return dict(context)
+
+    @override
+    def calculate_sync_cost(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        context: Context | None,
+    ) -> dict[str, int]:
+        """Count the request and its milliseconds."""
+        return {
+            "requests": 1,
+            "request_ms": round(response.elapsed.total_seconds() * 1000),
+        }
+
+    @override
+    def update_sync_costs(
+        self,
+        request: requests.PreparedRequest,
+        response: requests.Response,
+        context: Context | None,
+    ) -> dict[str, int]:
+        """Add the cost of a request to the stream's, and to its partition's.
+
+        Prefetched partitions are requested by copies of the stream, on their own
+        threads, so the costs are shared and updated in place, under a lock.
+        """
+        call_costs = self.calculate_sync_cost(request, response, context)
+        with self._costs_lock:
+            for domain, cost in call_costs.items():
+                self._sync_costs[domain] = self._sync_costs.get(domain, 0) + cost
+            if context is not None:
+                key = get_partition_key(self.get_cost_partition(context))
+                self.partition_costs[key] = (
+                    self.partition_costs.get(key, 0.0)
+                    + response.elapsed.total_seconds()
+                )
+            return dict(self._sync_costs)
+
+    def pop_partition_costs(self) -> dict[str, float]:
+        """Return the request seconds of each partition synced, and reset them.
+
+        Returns:
+            The seconds per partition, keyed by ``get_partition_key``.
+        """
+        with self._costs_lock:
+            costs = dict(self.partition_costs)
+            self.partition_costs.clear()
+        return costs
+
+    @functools.cached_property
+    def record_validator(self) -> RecordValidator | None:
+        """Return the validator of the stream records, if validation is enabled."""
+        mode = self.config.get("record_validation", "none")
+        if mode == "none":
+            return None
+        return RecordValidator(
+            self.schema,
+            mode=mode,
+            sample_interval=self.config.get("validation_sample_interval", 100),
         )
 
-    # flatten attributes field
+    @functools.cached_property
+    def record_decoder(self) -> EnvelopeDecoder | None:
+        """Return the decoder of the stream's responses into flat records.
+
+        Streams whose records are not ``{id, type, attributes}`` entries are decoded
+        with their ``records_jsonpath`` instead.
+        """
+        if self.records_jsonpath != ENVELOPE_JSONPATH:
+            return None
+        return EnvelopeDecoder(self.schema)
+
+    @property
+    def pipeline_depth(self) -> int:
+        """Return the number of record batches buffered between pipeline stages.
+
+        Zero disables the pipeline: records are requested, post-processed and
+        written inline.
+        """
+        return self.config.get("pipeline_queue_depth", 0)
+
+    @property
+    def prefetch_partitions(self) -> int:
+        """Return the number of partitions requested ahead of the one being synced.
+
+        Zero disables prefetching: partitions are requested one after the other.
+        """
+        return self.config.get("prefetch_partitions", 0)
+
+    @property
+    def in_first_page(self) -> bool:
+        """Whether the records being written come from the partition's first page.
+
+        With the pipeline or prefetching, pages are requested ahead of the records
+        being written, so first page records are validated as they are requested
+        instead.
+        """
+        return (
+            not self.pipeline_depth
+            and not self.prefetch_partitions
+            and self._page_number <= 1
+        )
+
+    def _iter_pages(self, records: Iterable[dict]) -> Iterator[list[dict]]:
+        """Group requested records by page, validating those of the first page.
+
+        Records decoded from envelopes are already in their final shape, so they
+        can be validated before they are post-processed.
+        """
+        validator = self.record_validator
+        validate = (
+            validator is not None
+            and validator.mode == "first_page"
+            and self.record_decoder is not None
+        )
+        page: list[dict] = []
+        page_number = self._page_number
+        for record in records:
+            if page and (page_number != self._page_number or len(page) >= BATCH_SIZE):
+                yield page
+                page = []
+            page_number = self._page_number
+            if validate and page_number <= 1:
+                self.validate_record(record, first_page=True)
+            page.append(record)
+        if page:
+            yield page
+
+    def transform_records(
+        self,
+        records: Iterable[dict],
+        context: Context | None,
+    ) -> Iterable[dict]:
+        """Post-process records on a separate thread, if the pipeline is enabled.
+
+        Processed records are passed on in batches, as :class:`ProcessedRecord`
+        instances, which :meth:`post_process` leaves as they are.
+
+        Args:
+            records: Records, requested on the calling thread.
+            context: Stream partition.
+
+        Returns:
+            The records, unchanged without the pipeline.
+        """
+        depth = self.pipeline_depth
+        if not depth:
+            return records
+
+        def transform() -> Iterator[list[ProcessedRecord]]:
+            for batch in batched(records):
+                processed = []
+                for record in batch:
+                    result = self.post_process(record, context)
+                    if isinstance(result, ProcessedRecord):
+                        processed.append(result)
+                    elif result is not None:
+                        processed.append(ProcessedRecord(result))
+                if processed:
+                    yield processed
+
+        return (
+            record
+            for batch in pipelined(
+                transform(),
+                depth=depth,
+                lock=cast("TapCriteo", self._tap).sync_lock,
+                name=f"{self.name}-transform",
+            )
+            for record in batch
+        )
+
+    def validate_record(self, record: Record, *, first_page: bool) -> None:
+        """Validate a record against the stream schema, if it is selected for it.
+
+        Invalid records are logged and counted, but still written.
+
+        Args:
+            record: Record data.
+            first_page: Whether the record comes from the partition's first page.
+        """
+        validator = self.record_validator
+        if validator is None or not validator.selects(first_page=first_page):
+            return
+
+        start = time.perf_counter()
+        error = validator.validate(record)
+        self.telemetry.inc("validated_records", stream=self.name)
+        self.telemetry.inc(
+            "validation_seconds",
+            time.perf_counter() - start,
+            stream=self.name,
+        )
+        if error is not None:
+            self.telemetry.inc("invalid_records", stream=self.name)
+            self.logger.warning("Invalid record in stream '%s': %s", self.name, error)
+
+    def get_prefetch_contexts(self) -> list[dict]:
+        """Return the partitions whose requests may be sent ahead.
+
+        Child streams are partitioned by the advertisers their parent syncs, so
+        only configured advertisers can be prefetched.
+        """
+        if self.parent_stream_type:
+            return [
+                context
+                for context in self.get_advertiser_partitions("advertiserId")
+                if "advertiserId" in context
+            ]
+        return self.partitions or []
+
+    def fetch_records(self, context: Context | None) -> Iterable[dict]:
+        """Return the records of a partition, before they are post-processed.
+
+        This is called on the stream's thread, with the state up to date, but the
+        records may be requested on a prefetch thread.
+
+        Args:
+            context: Stream partition.
+
+        Returns:
+            The partition's records, requested as they are iterated.
+        """
+        return self.request_records(context)
+
+    def _fetch_pages(self, context: Mapping[str, Any]) -> Iterable[list[dict]]:
+        """Return the pages of a partition, requested by a copy of the stream.
+
+        The copy counts the pages and tracks the tenant of the partition on its
+        own, so that several partitions can be requested at the same time.
+        """
+        self._write_starting_replication_value(context)
+        fetcher = copy.copy(self)
+        fetcher._prefetching = True  # noqa: SLF001
+        return fetcher._iter_pages(fetcher.fetch_records(context))  # noqa: SLF001
+
+    def prefetched_records(self, context: Context | None) -> Iterable[dict]:
+        """Return the records of a partition, requested ahead if prefetching.
+
+        With ``prefetch_partitions``, taking a partition starts requesting the next
+        ones, each on its own thread, so that the requests of a few partitions
+        overlap.
+
+        Args:
+            context: Stream partition.
+
+        Returns:
+            The partition's records.
+        """
+        if not self.prefetch_partitions or context is None:
+            return self.fetch_records(context)
+
+        if self._prefetcher is None:
+            self._prefetcher = Prefetcher(
+                self.get_prefetch_contexts(),
+                self._fetch_pages,
+                ahead=self.prefetch_partitions,
+                depth=self.pipeline_depth or DEFAULT_PREFETCH_DEPTH,
+                lock=cast("TapCriteo", self._tap).sync_lock,
+                name=f"{self.name}-prefetch",
+            )
+        pages = self._prefetcher.take(context)
+        if pages is None:
+            pages = iter(self._fetch_pages(context))
+        return (record for page in pages for record in page)
+
+    def close_prefetchers(self) -> None:
+        """Stop requesting partitions ahead for this stream and its children."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        for child in self.child_streams:
+            cast("CriteoStream", child).close_prefetchers()
+
+    @override
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> Generator[dict, Any, Any]:
+        """Sync the records, then stop the partitions still requested ahead.
+
+        Child streams are synced once per parent record, so their prefetched
+        partitions are stopped with the parent's.
+        """
+        try:
+            yield from super()._sync_records(context, write_messages=write_messages)
+        finally:
+            if context is None:
+                self.close_prefetchers()
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[dict[str, Any]]:
+        """Count pages from the start of each partition, unless it is deferred.
+
+        Partitions are also deferred when the circuit of the stream's endpoint
+        opens while they are synced. With the pipeline, records are post-processed
+        on a separate thread.
+        """
+        self._page_number = 0
+        if self.defer_partition(context):
+            return
+        with self.deferring_open_circuit(context):
+            yield from self.transform_records(self.prefetched_records(context), context)
+
+    @override
+    def request_records(self, context: Context | None) -> Iterable[dict]:
+        """Request records with the credentials of the partition's tenant.
+
+        With the pipeline, pages are requested on a separate thread, up to
+        ``pipeline_queue_depth`` batches ahead of the caller, unless they are
+        already requested on a prefetch thread.
+        """
+        self._tenant_name = (context or {}).get(TENANT_KEY)
+        records = super().request_records(context)
+        if not self.pipeline_depth or self._prefetching:
+            yield from records
+            return
+
+        for page in pipelined(
+            self._iter_pages(records),
+            depth=self.pipeline_depth,
+            lock=cast("TapCriteo", self._tap).sync_lock,
+            name=f"{self.name}-fetch",
+        ):
+            yield from page
+
+    @override
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Count the page and decode its records, flattening their attributes."""
+        self._page_number += 1
+        decoder = self.record_decoder
+        if decoder is None:
+            yield from super().parse_response(response)
+            return
+
+        yield from decoder.decode(response.content)
+
+    @override
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        """Send a request, sending it again if it is slower than usual.
+
+        With ``hedge_requests``, idempotent requests, i.e. GET, search and report
+        requests, taking longer than the 95th percentile of the recent latencies of
+        their endpoint are hedged: a duplicate is sent, once the rate limit of the
+        partition's tenant allows it, and the first response wins.
+
+        Args:
+            prepared_request: Request to send.
+            context: Stream partition.
+
+        Returns:
+            The first successful response.
+        """
+        delay = None
+        if self.config.get("hedge_requests", False) and is_idempotent(
+            prepared_request,
+        ):
+            delay = self.endpoint_health.latencies.quantile(HEDGE_QUANTILE)
+        if delay is None:
+            return super()._request(prepared_request, context)
+
+        tap = cast("TapCriteo", self._tap)
+        send = super()._request
+        limiter = tap.get_rate_limiter(self._tenant_name)
+
+        def send_hedge() -> requests.Response:
+            if limiter and (waited := limiter.acquire()):
+                self.telemetry.inc("rate_limit_wait_seconds", waited, stream=self.name)
+            return send(prepared_request.copy(), context)
+
+        response, hedged, hedge_won = hedged_call(
+            tap.hedge_executor,
+            lambda: send(prepared_request.copy(), context),
+            delay=delay,
+            slots=tap.hedge_slots,
+            hedge=send_hedge,
+        )
+        if hedged:
+            self.telemetry.inc("hedged_requests", stream=self.name, endpoint=self.path)
+        if hedge_won:
+            self.telemetry.inc("hedge_wins", stream=self.name, endpoint=self.path)
+        return response
+
+    def _record_endpoint_failure(self, health: EndpointHealth) -> None:
+        """Count a failed request to the endpoint, which may open its circuit."""
+        if health.breaker.record_failure():
+            self.telemetry.inc("circuit_trips", stream=self.name, endpoint=self.path)
+            self.logger.warning(
+                "Opened the circuit of endpoint '%s' after %d consecutive failures",
+                self.path,
+                health.breaker.failures,
+            )
+
+    def _send_attempt(self, func: RequestFunc, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Send a request attempt through the circuit breaker of its endpoint.
+
+        Attempts also wait for the rate limit of the partition's tenant, if any.
+        Failed attempts are only counted by the breaker for the trial request of an
+        open circuit, other requests once their retries ran out.
+
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint is open.
+        """
+        health = self.endpoint_health
+        if not health.breaker.allow():
+            self.telemetry.inc(
+                "circuit_rejections",
+                stream=self.name,
+                endpoint=self.path,
+            )
+            msg = f"Circuit of endpoint '{self.path}' is open, request not sent"
+            raise CircuitOpenError(msg)
+
+        limiter = cast("TapCriteo", self._tap).get_rate_limiter(self._tenant_name)
+        if limiter and (waited := limiter.acquire()):
+            self.telemetry.inc("rate_limit_wait_seconds", waited, stream=self.name)
+
+        start = time.perf_counter()
+        try:
+            response = func(*args, **kwargs)
+        except (
+            RetriableAPIError,
+            requests.exceptions.RequestException,
+            ConnectionResetError,
+        ):
+            if health.breaker.in_trial:
+                self._record_endpoint_failure(health)
+            raise
+        except BaseException:
+            # Other errors, e.g. client errors, do not tell whether it recovered
+            if health.breaker.in_trial:
+                health.breaker.release_trial()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.telemetry.observe_latency(
+                elapsed,
+                stream=self.name,
+                endpoint=self.path,
+            )
+
+        health.breaker.record_success()
+        health.latencies.observe(elapsed)
+        return response
+
+    @override
+    def request_decorator(self, func: RequestFunc) -> RequestFunc:
+        """Time each request attempt and let other streams run while it waits.
+
+        Attempts also go through the circuit breaker of the stream's endpoint,
+        which counts a failure once the retries of a request ran out.
+        """
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            return self._send_attempt(func, *args, **kwargs)
+
+        decorated = super().request_decorator(timed)
+        sync_lock = cast("TapCriteo", self._tap).sync_lock
+
+        @functools.wraps(decorated)
+        def request(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            with sync_lock.released():
+                try:
+                    return decorated(*args, **kwargs)
+                except (
+                    RetriableAPIError,
+                    requests.exceptions.RequestException,
+                    ConnectionResetError,
+                ):
+                    self._record_endpoint_failure(self.endpoint_health)
+                    raise
+
+        return request
+
+    @override
+    def validate_response(self, response: requests.Response) -> None:
+        """Count the response before validating it."""
+        self.telemetry.inc(
+            "requests",
+            stream=self.name,
+            endpoint=self.path,
+            status=str(response.status_code),
+        )
+        self.telemetry.inc(
+            "response_bytes",
+            len(response.content),
+            stream=self.name,
+            endpoint=self.path,
+        )
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self.telemetry.inc("rate_limited", stream=self.name, endpoint=self.path)
+        super().validate_response(response)
+
+    @override
+    def backoff_handler(self, details: Details) -> None:
+        """Count the retry before logging it."""
+        self.telemetry.inc("retries", stream=self.name, endpoint=self.path)
+        super().backoff_handler(details)
+
+    @override
+    def _write_record_message(self, record: Record) -> None:
+        """Validate and count the record before writing it."""
+        self.validate_record(record, first_page=self.in_first_page)
+        self.telemetry.inc("records", stream=self.name)
+        super()._write_record_message(record)
+
+    # flatten attributes field of records not decoded by the record decoder
     @override
     def post_process(
         self,
@@ -45,6 +784,8 @@ class CriteoStream(RESTStream):
         context: Context | None = None,
     ) -> Record | None:
         """Flatten the 'attributes' dictionary into top-level."""
+        if isinstance(row, ProcessedRecord):
+            return row
         if "attributes" in row and isinstance(row["attributes"], dict):
             attributes = row.pop("attributes")
 
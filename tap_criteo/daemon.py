@@ -0,0 +1,326 @@
+"""Long-running daemon mode, syncing on a schedule or on request."""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+import click
+
+from tap_criteo.files import atomic_write, write_text_atomic
+from tap_criteo.streams.v202601 import IntradayReportStream, StatsReportStream
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+    from contextlib import AbstractContextManager
+    from typing import IO
+
+    from tap_criteo.hashes import RowHashStore
+    from tap_criteo.offload import PreparedRecordWriter
+
+#: Suffix of the files the Singer messages of each sync are written to
+OUTPUT_SUFFIX = ".singer.jsonl"
+
+UTC = timezone.utc
+
+logger = logging.getLogger(__name__)
+
+
+class SyncDaemon:
+    """Tap process that stays alive between syncs.
+
+    A single tap instance runs every sync, so its HTTP connection pool, OAuth access
+    token, entity names and report worker processes are reused instead of being set
+    up again for each sync. The state is carried over from one sync to the next.
+
+    The Singer messages of each sync are either written to a new file in an output
+    directory, which is renamed into place once the sync succeeds and only the
+    latest ``keep`` of which are kept, or to a named pipe.
+
+    Intraday report streams can also be synced on their own, more often than the
+    other streams.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        tap: TapCriteo,
+        *,
+        output_dir: str | Path | None = None,
+        output_pipe: str | Path | None = None,
+        keep: int = 24,
+        interval: float | None = None,
+        intraday_interval: float | None = None,
+        trigger_path: str | Path | None = None,
+        state_path: str | Path | None = None,
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            tap: The tap, with its initial state.
+            output_dir: Directory sync outputs are written to.
+            output_pipe: Named pipe sync outputs are written to instead.
+            keep: Number of sync outputs kept in ``output_dir``.
+            interval: Seconds between the start of scheduled syncs. Without an
+                interval, syncs only run on request.
+            intraday_interval: Seconds between the start of syncs of the intraday
+                report streams alone.
+            trigger_path: File whose creation requests a sync. It is deleted when
+                the sync starts.
+            state_path: JSON file the state is saved to after each sync.
+        """
+        self.tap = tap
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.output_pipe = Path(output_pipe) if output_pipe else None
+        self.keep = keep
+        self.interval = interval
+        self.intraday_interval = intraday_interval
+        self.trigger_path = Path(trigger_path) if trigger_path else None
+        self.state_path = Path(state_path) if state_path else None
+        self._stopped = threading.Event()
+
+    def _open_output(self, started_at: datetime) -> AbstractContextManager[IO[str]]:
+        """Open the output of a sync."""
+        if self.output_pipe:
+            return self.output_pipe.open("w")
+
+        output_dir = self.output_dir or Path()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"run-{started_at:%Y%m%dT%H%M%S.%fZ}{OUTPUT_SUFFIX}"
+        return atomic_write(output_dir / name)
+
+    def _rotate(self) -> None:
+        """Delete the oldest sync outputs, beyond the ones to keep."""
+        if self.output_pipe:
+            return
+
+        outputs = sorted((self.output_dir or Path()).glob(f"run-*{OUTPUT_SUFFIX}"))
+        for path in outputs[: max(len(outputs) - self.keep, 0)]:
+            path.unlink()
+
+    def _save_state(self) -> None:
+        """Save the tap state, replacing the state file atomically."""
+        if self.state_path:
+            write_text_atomic(self.state_path, json.dumps(self.tap.state, indent=2))
+
+    @property
+    def intraday_streams(self) -> list[str]:
+        """Return the names of the intraday report streams."""
+        return [
+            stream.name
+            for stream in self.tap.streams.values()
+            if isinstance(stream, IntradayReportStream)
+        ]
+
+    def run_once(self, stream_names: Collection[str] | None = None) -> None:
+        """Run a sync, writing its Singer messages to a new output.
+
+        The output file of a failed sync is deleted, and the state and row hashes
+        go back to where they were before the sync, so the next one emits its
+        records again.
+
+        Args:
+            stream_names: Only sync the streams with these names.
+        """
+        writer = cast("PreparedRecordWriter", self.tap.message_writer)
+        if "name_index" in vars(self.tap):
+            self.tap.name_index.allow_refresh()
+
+        started_at = datetime.now(UTC)
+        logger.info("Starting sync at %s", started_at.isoformat())
+        state = cast("dict[str, Any]", self.tap.state)
+        state_before = copy.deepcopy(state)
+        hash_stores = self._get_row_hash_stores()
+        for store in hash_stores:
+            store.checkpoint()
+        try:
+            with self._open_output(started_at) as output:
+                writer.output = output
+                try:
+                    self.tap.run_sync(stream_names)
+                finally:
+                    writer.output = None
+        except BaseException:
+            # Streams hold on to the state dictionary, so it is restored in place
+            state.clear()
+            state.update(state_before)
+            for store in hash_stores:
+                store.rollback()
+            raise
+
+        self._save_state()
+        self._rotate()
+        logger.info(
+            "Finished sync in %.1f seconds",
+            (datetime.now(UTC) - started_at).total_seconds(),
+        )
+
+    def _get_row_hash_stores(self) -> list[RowHashStore]:
+        """Return the row hash stores of the report streams, without duplicates."""
+        stores = {
+            id(store): store
+            for stream in self.tap.streams.values()
+            if isinstance(stream, StatsReportStream)
+            and (store := stream.row_hashes) is not None
+        }
+        return list(stores.values())
+
+    def _is_triggered(self) -> bool:
+        """Check whether a sync was requested, consuming the trigger file."""
+        if not self.trigger_path:
+            return False
+        try:
+            self.trigger_path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def serve(self, poll_seconds: float = 1) -> None:
+        """Run syncs on schedule or on request, until :meth:`stop` is called.
+
+        A failed sync is logged, and the daemon waits for the next one.
+
+        Args:
+            poll_seconds: Seconds between two checks of the trigger file.
+        """
+        next_run = time.monotonic() if self.interval else None
+        next_intraday_run = time.monotonic() if self.intraday_interval else None
+        try:
+            while not self._stopped.is_set():
+                now = time.monotonic()
+                stream_names: list[str] | None
+                if (next_run is not None and now >= next_run) or self._is_triggered():
+                    if self.interval:
+                        next_run = now + self.interval
+                    stream_names = None
+                elif next_intraday_run is not None and now >= next_intraday_run:
+                    if self.intraday_interval:
+                        next_intraday_run = now + self.intraday_interval
+                    stream_names = self.intraday_streams
+                else:
+                    self._stopped.wait(poll_seconds)
+                    continue
+
+                try:
+                    self.run_once(stream_names)
+                except Exception:
+                    logger.exception("Sync failed")
+        finally:
+            self.tap.close()
+
+    def stop(self) -> None:
+        """Stop serving once the current sync, if any, ends."""
+        self._stopped.set()
+
+
+def _load_json_files(paths: tuple[str, ...]) -> Iterator[dict[str, Any]]:
+    """Read JSON files."""
+    for path in paths:
+        yield json.loads(Path(path).read_text())
+
+
+@click.command()
+@click.option(
+    "--config",
+    "config_paths",
+    multiple=True,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Configuration file location. Can be passed several times.",
+)
+@click.option(
+    "--catalog",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Singer catalog file.",
+)
+@click.option(
+    "--state",
+    "state_path",
+    type=click.Path(dir_okay=False),
+    help="State file, read at startup and saved after each sync.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    default=".",
+    show_default=True,
+    help="Directory the Singer messages of each sync are written to.",
+)
+@click.option(
+    "--output-pipe",
+    type=click.Path(dir_okay=False),
+    help="Named pipe the Singer messages of each sync are written to instead.",
+)
+@click.option(
+    "--keep",
+    type=click.IntRange(min=1),
+    default=24,
+    show_default=True,
+    help="Number of sync outputs kept in the output directory.",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=1),
+    help="Seconds between scheduled syncs. Without it, syncs only run on request.",
+)
+@click.option(
+    "--intraday-interval",
+    type=click.FloatRange(min=1),
+    help="Seconds between syncs of the intraday report streams alone.",
+)
+@click.option(
+    "--trigger-path",
+    type=click.Path(dir_okay=False),
+    help="File whose creation requests a sync.",
+)
+def daemon_command(  # noqa: PLR0913
+    config_paths: tuple[str, ...],
+    catalog: str | None,
+    state_path: str | None,
+    output_dir: str,
+    output_pipe: str | None,
+    keep: int,
+    interval: float | None,
+    intraday_interval: float | None,
+    trigger_path: str | None,
+) -> None:
+    """Run tap-criteo as a daemon, syncing on a schedule or on request.
+
+    The daemon stops on SIGINT or SIGTERM, once the current sync ends.
+    """
+    if not interval and not intraday_interval and not trigger_path:
+        msg = "One of --interval, --intraday-interval or --trigger-path is required"
+        raise click.UsageError(msg)
+
+    config: dict[str, Any] = {}
+    for config_file in _load_json_files(config_paths):
+        config.update(config_file)
+    state = None
+    if state_path and Path(state_path).is_file():
+        state = json.loads(Path(state_path).read_text())
+
+    tap = TapCriteo(
+        config=config,
+        catalog=next(_load_json_files((catalog,))) if catalog else None,
+        state=state,
+    )
+    daemon = SyncDaemon(
+        tap,
+        output_dir=output_dir,
+        output_pipe=output_pipe,
+        keep=keep,
+        interval=interval,
+        intraday_interval=intraday_interval,
+        trigger_path=trigger_path,
+        state_path=state_path,
+    )
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: daemon.stop())
+    daemon.serve()
@@ -0,0 +1,58 @@
+"""Decoding of API responses straight into flat records."""
+
+from __future__ import annotations
+
+import decimal
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+#: Records path of responses made of ``{id, type, attributes}`` entries
+ENVELOPE_JSONPATH = "$.data[*]"
+
+
+class EnvelopeDecoder:
+    """Decoder of responses whose ``data`` is a list of ``{id, type, attributes}``.
+
+    Entries are flattened as they are read from the decoded document: their
+    attributes are merged with their ``id`` and ``type`` into a single record, which
+    only keeps the fields listed by the stream schema. This replaces the JSONPath
+    extraction of the records and the flattening of their attributes afterwards.
+    """
+
+    def __init__(self, schema: Mapping[str, Any]) -> None:
+        """Initialize the decoder.
+
+        Args:
+            schema: Stream schema.
+        """
+        self.fields = frozenset(schema.get("properties", {}))
+
+    def decode(self, content: bytes | str) -> Iterator[dict[str, Any]]:
+        """Decode the records of a response.
+
+        Args:
+            content: Response body.
+
+        Yields:
+            Flat records.
+        """
+        data = json.loads(content, parse_float=decimal.Decimal).get("data") or []
+        if isinstance(data, dict):
+            data = [data]
+
+        fields = self.fields
+        for entry in data:
+            attributes = entry.get("attributes")
+            record = {
+                key: value
+                for key, value in entry.items()
+                if key in fields and key != "attributes"
+            }
+            if isinstance(attributes, dict):
+                record.update(
+                    (key, value) for key, value in attributes.items() if key in fields
+                )
+            yield record
@@ -0,0 +1,124 @@
+"""De-duplication of report rows across report windows."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import TYPE_CHECKING, Any
+
+from tap_criteo.rows import intern_values
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from tap_criteo.rows import CompactRow
+
+#: Default number of rows kept in memory before spilling to disk.
+DEFAULT_MEMORY_ROWS = 100_000
+
+
+class LatestRowIndex:
+    """Index keeping only the latest row for each key.
+
+    Rows are kept in a dictionary until there are more than ``memory_rows`` of them,
+    then moved to a temporary SQLite database, which is deleted when the index is
+    closed. Either way, rows are iterated in the order their key was first seen.
+
+    In memory, keys are interned and rows can be stored as compact rows, which
+    take a fraction of the memory of dictionaries.
+    """
+
+    def __init__(
+        self,
+        memory_rows: int = DEFAULT_MEMORY_ROWS,
+        row_type: type[CompactRow] | None = None,
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+            memory_rows: Maximum number of rows kept in memory.
+            row_type: Compact row type rows are stored as in memory.
+        """
+        self.memory_rows = memory_rows
+        self.row_type = row_type
+        self.added = 0
+        self._rows: dict[tuple, dict[str, Any] | CompactRow] = {}
+        self._db: sqlite3.Connection | None = None
+        self._seq = 0
+
+    def add(self, key: tuple, row: dict[str, Any]) -> None:
+        """Add a row, replacing any previous row with the same key.
+
+        Args:
+            key: Row key, e.g. its dimension values.
+            row: Row data. It must be JSON-serializable.
+        """
+        self.added += 1
+        if self._db is None:
+            self._rows[intern_values(key)] = (
+                self.row_type.from_dict(row) if self.row_type else row
+            )
+            if len(self._rows) > self.memory_rows:
+                self._spill()
+            return
+
+        self._seq += 1
+        self._db.execute(
+            "INSERT INTO rows (key, seq, row) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET row = excluded.row",
+            (json.dumps(key), self._seq, json.dumps(row)),
+        )
+
+    def _spill(self) -> None:
+        """Move the rows held in memory to a temporary database."""
+        # An empty path opens a private on-disk database, deleted on close
+        self._db = sqlite3.connect("")
+        self._db.execute(
+            "CREATE TABLE rows (seq INTEGER PRIMARY KEY, key TEXT UNIQUE, row TEXT)",
+        )
+        self._db.executemany(
+            "INSERT INTO rows (seq, key, row) VALUES (?, ?, ?)",
+            (
+                (seq, json.dumps(key), json.dumps(self._to_dict(row)))
+                for seq, (key, row) in enumerate(self._rows.items(), start=1)
+            ),
+        )
+        self._seq = len(self._rows)
+        self._rows.clear()
+
+    @staticmethod
+    def _to_dict(row: dict[str, Any] | CompactRow) -> dict[str, Any]:
+        """Return a row stored in memory as a dictionary."""
+        return row if isinstance(row, dict) else row.to_dict()
+
+    @property
+    def duplicates(self) -> int:
+        """Number of rows that replaced a previous row with the same key."""
+        return self.added - len(self)
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys."""
+        if self._db is None:
+            return len(self._rows)
+        return self._db.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Iterate over the latest row of each key.
+
+        Yields:
+            Rows, in the order their key was first added.
+        """
+        if self._db is None:
+            for row in self._rows.values():
+                yield self._to_dict(row)
+            return
+
+        for (row,) in self._db.execute("SELECT row FROM rows ORDER BY seq"):
+            yield json.loads(row)
+
+    def close(self) -> None:
+        """Release the rows and delete the temporary database, if any."""
+        self._rows.clear()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
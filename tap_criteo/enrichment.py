@@ -0,0 +1,180 @@
+"""Local enrichment of report rows with entity names."""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from tap_criteo.files import write_text_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from singer_sdk import Stream
+
+    from tap_criteo.client import CriteoStream
+    from tap_criteo.scheduling import SyncLock
+
+#: Report name dimensions, mapped to their ID dimension and to the stream and field
+#: their names are looked up in
+NAME_DIMENSIONS = {
+    "Advertiser": ("AdvertiserId", "advertisers", "advertiserName"),
+    "Campaign": ("CampaignId", "campaigns", "name"),
+    "Adset": ("AdsetId", "ad_sets", "name"),
+}
+
+
+class NameIndex:
+    """ID to name lookups for advertisers, campaigns and ad sets.
+
+    Names are read from an optional JSON cache file. When an ID is missing from it,
+    the names of the whole stream are requested again, at most once per run, and the
+    cache file is updated.
+
+    Lookups may happen on several threads at once, e.g. pipeline threads. The first
+    one missing a name requests the stream's names, without holding any lock, while
+    the others wait until the names are stored.
+    """
+
+    def __init__(
+        self,
+        streams: Mapping[str, Stream],
+        cache_path: str | Path | None = None,
+        *,
+        lock: SyncLock | None = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            streams: The tap streams, by name.
+            cache_path: JSON file names are cached in between runs.
+            lock: Sync lock, released while waiting for another thread's refresh.
+        """
+        self.streams = streams
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.lock = lock
+        self.names: dict[str, dict[str, str]] = {}
+        #: Refreshes started in this run, set once their names are stored
+        self._refreshes: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        if self.cache_path and self.cache_path.is_file():
+            self.names = json.loads(self.cache_path.read_text())
+
+    def refresh(self, stream_name: str) -> None:
+        """Request the names of all the entities of a stream.
+
+        Records are requested and post-processed like during a sync, for each
+        partition, e.g. each tenant, but no Singer messages are written. They are
+        requested by a copy of the stream, which may be syncing at the same time.
+
+        Args:
+            stream_name: Name of the stream, e.g. ``campaigns``.
+        """
+        stream = cast("CriteoStream", copy.copy(self.streams[stream_name]))
+        # Request pages on this thread, instead of a pipeline or prefetch thread
+        stream._prefetching = True  # noqa: SLF001
+        field = next(f for _, s, f in NAME_DIMENSIONS.values() if s == stream_name)
+
+        names = {}
+        contexts: list[dict | None] = [None]
+        if stream.partitions:
+            contexts = list(stream.partitions)
+        for context in contexts:
+            for record in stream.request_records(context):
+                processed = stream.post_process(record, context)
+                if processed and processed.get(field) is not None:
+                    names[str(processed["id"])] = processed[field]
+
+        with self._lock:
+            self.names = {**self.names, stream_name: names}
+            if self.cache_path:
+                write_text_atomic(self.cache_path, json.dumps(self.names, indent=2))
+
+    def allow_refresh(self) -> None:
+        """Let the names of each stream be requested again, e.g. for a new sync."""
+        with self._lock:
+            self._refreshes.clear()
+
+    def get(self, stream_name: str, entity_id: Any) -> str | None:  # noqa: ANN401
+        """Return the name of an entity.
+
+        Args:
+            stream_name: Name of the stream the entity belongs to.
+            entity_id: ID of the entity.
+
+        Returns:
+            The name, or None if the entity is unknown.
+        """
+        if entity_id is None:
+            return None
+
+        key = str(entity_id)
+        names = self.names.get(stream_name, {})
+        if key in names:
+            return names[key]
+
+        with self._lock:
+            refreshed = self._refreshes.get(stream_name)
+            started = refreshed is None
+            if refreshed is None:
+                refreshed = self._refreshes[stream_name] = threading.Event()
+
+        if started:
+            try:
+                self.refresh(stream_name)
+            finally:
+                refreshed.set()
+        elif not refreshed.is_set():
+            # The refreshing thread needs the sync lock back after each request
+            with self.lock.released() if self.lock else contextlib.nullcontext():
+                refreshed.wait()
+        return self.names.get(stream_name, {}).get(key)
+
+
+def get_request_dimensions(dimensions: Iterable[str]) -> list[str]:
+    """Replace name dimensions by their ID dimension.
+
+    Args:
+        dimensions: Report dimensions.
+
+    Returns:
+        The dimensions to request, without duplicates, in their original order.
+    """
+    requested = (NAME_DIMENSIONS.get(d, (d,))[0] for d in dimensions)
+    return list(dict.fromkeys(requested))
+
+
+def enrich_rows(
+    rows: Iterable[dict[str, Any]],
+    *,
+    dimensions: Iterable[str],
+    index: NameIndex,
+) -> Iterable[dict[str, Any]]:
+    """Fill the name dimensions of report rows from their ID dimension.
+
+    ID dimensions that were only requested to look names up are removed.
+
+    Args:
+        rows: Report rows, requested with :func:`get_request_dimensions`.
+        dimensions: Report dimensions, as configured.
+        index: Name lookups.
+
+    Yields:
+        The enriched rows.
+    """
+    dimensions = list(dimensions)
+    names = {d: NAME_DIMENSIONS[d] for d in dimensions if d in NAME_DIMENSIONS}
+    extra_ids = {id_dimension for id_dimension, _, _ in names.values()}
+    extra_ids.difference_update(dimensions)
+
+    for row in rows:
+        for name_dimension, (id_dimension, stream_name, _) in names.items():
+            row[name_dimension] = index.get(stream_name, row.get(id_dimension))
+        for id_dimension in extra_ids:
+            row.pop(id_dimension, None)
+        yield row
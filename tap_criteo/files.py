@@ -0,0 +1,52 @@
+"""Atomic file writes."""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import IO
+
+
+@contextmanager
+def atomic_write(path: str | Path) -> Iterator[IO[str]]:
+    """Open a text file for writing, replacing it atomically once written.
+
+    The content goes to a temporary file next to it, which only replaces the file
+    when the block completes. Readers, e.g. other tap processes, never see the file
+    half written, and a failure leaves the previous file in place and deletes the
+    temporary one.
+
+    Args:
+        path: Path of the file.
+
+    Yields:
+        The temporary file, open for writing.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp",
+    )
+    try:
+        with tmp_path.open("w") as file:
+            yield file
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
+
+
+def write_text_atomic(path: str | Path, text: str) -> None:
+    """Replace the content of a text file atomically, see :func:`atomic_write`.
+
+    Args:
+        path: Path of the file.
+        text: New content of the file.
+    """
+    with atomic_write(path) as file:
+        file.write(text)
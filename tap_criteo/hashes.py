@@ -0,0 +1,201 @@
+"""Hashes of previously emitted report rows."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from datetime import timedelta
+    from pathlib import Path
+
+
+class RowHashBatch:
+    """Hashes of the rows of a batch, e.g. a report partition, not saved yet."""
+
+    def __init__(self, store: RowHashStore) -> None:
+        """Start a batch.
+
+        Args:
+            store: Store the batch compares hashes with, and saves them to.
+        """
+        self.store = store
+        self.pending: dict[str, str] = {}
+        self.unchanged = 0
+
+    def changed(self, key: Sequence[Any], values: Sequence[Any]) -> bool:
+        """Check whether the values of a row changed since they were last committed.
+
+        Args:
+            key: Row key, e.g. its stream name, advertiser and dimension values.
+            values: Row values to compare, e.g. its metrics.
+
+        Returns:
+            True if the row is new or any of its values changed.
+        """
+        encoded_key = json.dumps(key)
+        digest = hashlib.blake2b(
+            json.dumps(values).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        if self.store.get(encoded_key) == digest:
+            self.unchanged += 1
+            return False
+
+        self.pending[encoded_key] = digest
+        return True
+
+    def commit(self) -> None:
+        """Save the hashes of the rows that changed."""
+        self.store.save(self.pending)
+        self.pending.clear()
+
+
+class RowHashStore:
+    """Hashes of the metric values of report rows, kept in a SQLite file.
+
+    Hashes are compared in batches, and only saved when their batch is committed,
+    so rows emitted by a run that fails before committing are emitted again by the
+    next one. Batches may be used by other threads than the one that opened the
+    store.
+
+    After a checkpoint, the hashes replaced by later commits are remembered, so a
+    run whose output is discarded can roll them back. Hashes saved long ago can be
+    pruned, e.g. those of rows no longer requested.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open the store, creating it if needed.
+
+        Args:
+            path: Path of the SQLite file.
+        """
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._replaced: dict[str, str | None] | None = None
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS row_hashes "
+                "(key TEXT PRIMARY KEY, hash TEXT, saved_at REAL)",
+            )
+            columns = {
+                row[1] for row in self._db.execute("PRAGMA table_info(row_hashes)")
+            }
+            if "saved_at" not in columns:
+                # Files written before hashes were pruned
+                self._db.execute("ALTER TABLE row_hashes ADD COLUMN saved_at REAL")
+
+    def batch(self) -> RowHashBatch:
+        """Start a batch of hashes, committed together.
+
+        Returns:
+            An empty batch.
+        """
+        return RowHashBatch(self)
+
+    def get(self, key: str) -> str | None:
+        """Return the committed hash of a row.
+
+        Args:
+            key: Encoded row key.
+
+        Returns:
+            The hash of the row values, or None for new rows.
+        """
+        with self._lock:
+            return self._get(key)
+
+    def save(self, hashes: Mapping[str, str]) -> None:
+        """Save row hashes.
+
+        Args:
+            hashes: Hashes of the row values, by encoded row key.
+        """
+        with self._lock, self._db:
+            if self._replaced is not None:
+                for key in hashes.keys() - self._replaced.keys():
+                    self._replaced[key] = self._get(key)
+            self._save(hashes)
+
+    def checkpoint(self) -> None:
+        """Start remembering the hashes replaced by later commits."""
+        with self._lock:
+            self._replaced = {}
+
+    def rollback(self) -> None:
+        """Restore the hashes replaced since the last checkpoint."""
+        with self._lock, self._db:
+            replaced, self._replaced = self._replaced or {}, {}
+            self._db.executemany(
+                "DELETE FROM row_hashes WHERE key = ?",
+                [(key,) for key, digest in replaced.items() if digest is None],
+            )
+            self._save(
+                {key: digest for key, digest in replaced.items() if digest is not None},
+            )
+
+    def prune(self, max_age: timedelta, key_prefix: Sequence[Any] = ()) -> int:
+        """Delete the hashes saved longer ago than a maximum age.
+
+        Hashes saved before their save time was recorded are deleted too.
+
+        Args:
+            max_age: Age of the oldest hashes to keep.
+            key_prefix: Only delete the hashes of the row keys starting with these
+                values, e.g. a stream name.
+
+        Returns:
+            The number of deleted hashes.
+        """
+        # Encoded keys are JSON arrays, so a prefix is the array without its end
+        prefix = json.dumps(list(key_prefix))[:-1]
+        if key_prefix:
+            prefix += ","
+        with self._lock, self._db:
+            return self._db.execute(
+                "DELETE FROM row_hashes "
+                "WHERE substr(key, 1, length(?)) = ? "
+                "AND (saved_at IS NULL OR saved_at < ?)",
+                (prefix, prefix, time.time() - max_age.total_seconds()),
+            ).rowcount
+
+    def _get(self, key: str) -> str | None:
+        """Return the saved hash of a row, with the lock held."""
+        saved = self._db.execute(
+            "SELECT hash FROM row_hashes WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return saved[0] if saved else None
+
+    def _save(self, hashes: Mapping[str, str]) -> None:
+        """Save row hashes along with the current time, with the lock held."""
+        saved_at = time.time()
+        self._db.executemany(
+            "INSERT INTO row_hashes (key, hash, saved_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE "
+            "SET hash = excluded.hash, saved_at = excluded.saved_at",
+            [(key, digest, saved_at) for key, digest in hashes.items()],
+        )
+
+    def close(self) -> None:
+        """Close the store."""
+        with self._lock:
+            self._db.close()
+
+
+class MemoryRowHashStore(RowHashStore):
+    """Row hashes kept in memory, for as long as the store is referenced.
+
+    A long-running process can reuse the store across syncs, pruning the hashes of
+    the rows it no longer requests so the store does not keep growing.
+    """
+
+    def __init__(self) -> None:
+        """Open an empty store."""
+        super().__init__(":memory:")
@@ -0,0 +1,104 @@
+"""Sync statistics kept between runs."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from tap_criteo.files import write_text_atomic
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+def get_partition_key(context: Mapping[str, Any]) -> str:
+    """Return the key of a stream partition in the history.
+
+    Args:
+        context: Stream partition.
+
+    Returns:
+        The partition as canonical JSON.
+    """
+    return json.dumps(context, sort_keys=True)
+
+
+class RunHistory:
+    """Per-stream sync statistics from previous runs.
+
+    The history is a small JSON document, keyed by stream name, that is read at the
+    start of a run and rewritten at the end of it.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Initialize the run history.
+
+        Args:
+            path: JSON file the history is read from and saved to. Without a path the
+                history only lives for the current run.
+        """
+        self.path = Path(path) if path else None
+        self.streams: dict[str, dict[str, Any]] = {}
+
+        if self.path and self.path.is_file():
+            self.streams = json.loads(self.path.read_text()).get("streams", {})
+
+    def get_duration(self, stream_name: str) -> float | None:
+        """Return the last known sync duration of a stream, in seconds.
+
+        Args:
+            stream_name: Name of the stream.
+
+        Returns:
+            The duration, or None if the stream was never synced.
+        """
+        return self.streams.get(stream_name, {}).get("duration")
+
+    def get_partition_costs(self, stream_name: str) -> dict[str, float]:
+        """Return the request seconds of each partition of a stream.
+
+        Args:
+            stream_name: Name of the stream.
+
+        Returns:
+            The seconds spent requesting each partition the last time it was synced,
+            keyed by ``get_partition_key``.
+        """
+        return self.streams.get(stream_name, {}).get("partition_seconds", {})
+
+    def record_partition_costs(
+        self,
+        stream_name: str,
+        costs: Mapping[str, float],
+    ) -> None:
+        """Record the request seconds of the partitions synced by the latest run.
+
+        Partitions not synced, e.g. deferred ones, keep their previous costs.
+
+        Args:
+            stream_name: Name of the stream.
+            costs: Request seconds per partition, keyed by ``get_partition_key``.
+        """
+        if costs:
+            self.record(
+                stream_name,
+                partition_seconds={**self.get_partition_costs(stream_name), **costs},
+            )
+
+    def record(self, stream_name: str, **stats: Any) -> None:  # noqa: ANN401
+        """Record statistics about the latest sync of a stream.
+
+        Args:
+            stream_name: Name of the stream.
+            stats: Statistics to record, e.g. the sync ``duration`` in seconds.
+        """
+        self.streams.setdefault(stream_name, {}).update(stats)
+
+    def save(self) -> None:
+        """Write the history to its file, if any, replacing it atomically."""
+        if self.path:
+            write_text_atomic(
+                self.path,
+                json.dumps({"streams": self.streams}, indent=2),
+            )
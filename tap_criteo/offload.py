@@ -0,0 +1,198 @@
+"""Offloading of report post-processing to worker processes."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import conform_record_data_types
+from singer_sdk.helpers._util import utc_now
+from singer_sdk.io_base import SingerWriter
+from singer_sdk.singerlib import RecordMessage
+from singer_sdk.singerlib.json import serialize_json
+
+from tap_criteo.pipeline import ProcessedRecord
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import IO
+
+    from singer_sdk.helpers.conform import TypeConformanceLevel
+    from singer_sdk.singerlib import Message, SelectionMask
+
+    from tap_criteo.scheduling import SyncLock
+
+#: Number of report rows sent to a worker at once.
+CHUNK_SIZE = 1000
+
+
+class PreparedRecord(ProcessedRecord):
+    """Record that was already serialized into its RECORD message by a worker."""
+
+    __slots__ = ("line",)
+
+    def __init__(self, record: dict[str, Any], line: str) -> None:
+        """Initialize the record.
+
+        Args:
+            record: Record data.
+            line: Serialized RECORD message.
+        """
+        super().__init__(record)
+        self.line = line
+
+
+class PreparedRecordWriter(SingerWriter):
+    """Singer writer that can also write pre-serialized messages."""
+
+    #: Stream messages are written to, instead of stdout
+    output: IO[str] | None = None
+
+    def write_message(self, message: Message) -> None:
+        """Write a message to the output.
+
+        Args:
+            message: The message to write.
+        """
+        self.write_line(self.format_message(message))
+
+    def write_line(self, line: str) -> None:
+        """Write a serialized message to the output.
+
+        Args:
+            line: The serialized message.
+        """
+        output = self.output or sys.stdout
+        output.write(line + "\n")
+        output.flush()
+
+
+def create_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Create the process pool report rows are post-processed on.
+
+    Workers are spawned rather than forked, since the tap may already be running
+    stream threads.
+
+    Args:
+        max_workers: Number of worker processes.
+
+    Returns:
+        The process pool.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def prepare_records(  # noqa: PLR0913
+    rows: list[dict[str, Any]],
+    *,
+    stream_name: str,
+    schema: dict,
+    mask: SelectionMask,
+    context: dict[str, Any],
+    version: int | None,
+    level: TypeConformanceLevel,
+    numeric_mode: str = "decimal",
+    numeric_scale: int = 6,
+) -> list[tuple[dict[str, Any], str]]:
+    """Coerce, conform and serialize report rows.
+
+    This runs in a worker process and mirrors what the stream would do on the main
+    thread for each row: post-processing, adding the partition keys, dropping
+    deselected properties, conforming types and serializing the RECORD message.
+
+    Args:
+        rows: Raw report rows.
+        stream_name: Name of the report stream.
+        schema: Schema of the report stream.
+        mask: Property selection of the report stream.
+        context: Partition keys added to every record.
+        version: Stream version of the RECORD messages.
+        level: Type conformance level of the stream.
+        numeric_mode: How currency and rate metrics are converted.
+        numeric_scale: Decimal places kept by the ``scaled_int`` numeric mode.
+
+    Returns:
+        Pairs of records and their serialized RECORD messages, in order.
+    """
+    # Imported here, so that loading the tap does not load the report mappings
+    from tap_criteo.streams.reports import coerce_row, get_value_funcs  # noqa: PLC0415
+
+    logger = logging.getLogger(stream_name)
+    value_funcs = get_value_funcs(numeric_mode, numeric_scale)
+    prepared = []
+    for row in rows:
+        record = coerce_row(row, value_funcs)
+        record.update(context)
+        pop_deselected_record_properties(record, schema, mask)
+        record = conform_record_data_types(
+            stream_name=stream_name,
+            record=record,
+            schema=schema,
+            level=level,
+            logger=logger,
+        )
+        message = RecordMessage(
+            stream=stream_name,
+            record=record,
+            version=version,
+            time_extracted=utc_now(),
+        )
+        prepared.append((record, serialize_json(message.to_dict())))
+    return prepared
+
+
+def offload_records(
+    rows: Iterable[dict[str, Any]],
+    *,
+    executor: Executor,
+    lock: SyncLock,
+    max_pending: int,
+    **kwargs: Any,  # noqa: ANN401
+) -> Iterator[PreparedRecord]:
+    """Post-process report rows on a process pool.
+
+    Rows are sent to the workers in chunks of :data:`CHUNK_SIZE`, and the prepared
+    records are yielded back in their original order. Other streams may run while
+    this one waits on the workers.
+
+    At most ``max_pending`` chunks are submitted ahead of the records being yielded,
+    so rows are only read from ``rows`` as the workers need them.
+
+    Args:
+        rows: Raw report rows.
+        executor: Process pool to run :func:`prepare_records` on.
+        lock: Lock serializing everything but I/O.
+        max_pending: Maximum number of chunks submitted and not yielded yet.
+        kwargs: Keyword arguments for :func:`prepare_records`.
+
+    Yields:
+        Prepared records.
+    """
+    iterator = iter(rows)
+    chunks = iter(lambda: list(islice(iterator, CHUNK_SIZE)), [])
+    pending: deque[Future] = deque(
+        executor.submit(prepare_records, chunk, **kwargs)
+        for chunk in islice(chunks, max_pending)
+    )
+    try:
+        while pending:
+            with lock.released():
+                chunk = pending.popleft().result()
+            pending.extend(
+                executor.submit(prepare_records, next_chunk, **kwargs)
+                for next_chunk in islice(chunks, 1)
+            )
+            for record, line in chunk:
+                yield PreparedRecord(record, line)
+    finally:
+        for future in pending:
+            future.cancel()
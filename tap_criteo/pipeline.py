@@ -0,0 +1,272 @@
+"""Staged record pipeline, decoupling HTTP requests from message writing."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from contextlib import AbstractContextManager, nullcontext
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+
+    from tap_criteo.scheduling import SyncLock
+
+T = TypeVar("T")
+
+#: Maximum number of records passed between two stages at once
+BATCH_SIZE = 100
+
+#: Batches of records buffered for each prefetched partition, without the pipeline
+DEFAULT_PREFETCH_DEPTH = 10
+
+#: Maximum number of partitions prefetched at the same time, each on its own thread
+MAX_PREFETCH_PARTITIONS = 32
+
+#: Seconds a stage blocked on a full queue waits before checking if it should stop
+POLL_SECONDS = 0.1
+
+
+class ProcessedRecord(dict):
+    """Record that was already post-processed, e.g. by a pipeline stage."""
+
+    __slots__ = ()
+
+
+class _Done:
+    """End of the items of a stage."""
+
+
+class _Failure(Generic[T]):
+    """Error raised while iterating the items of a stage."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def batched(items: Iterable[T], size: int = BATCH_SIZE) -> Iterator[list[T]]:
+    """Group items into lists.
+
+    Args:
+        items: Items to group.
+        size: Maximum number of items of each list.
+
+    Yields:
+        Lists of consecutive items.
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class _Stage(Generic[T]):
+    """Items iterated on a background thread, through a bounded queue."""
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        *,
+        depth: int,
+        lock: SyncLock | None,
+        name: str,
+    ) -> None:
+        self.items = items
+        self.lock = lock
+        self.name = name
+        self._queue: queue.Queue[T | _Done | _Failure] = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _released(self) -> AbstractContextManager[None]:
+        """Let other streams run while the caller waits."""
+        return self.lock.released() if self.lock is not None else nullcontext()
+
+    def _put(self, item: T | _Done | _Failure) -> bool:
+        """Wait for room in the queue, unless the caller stopped."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=POLL_SECONDS)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _produce(self) -> None:
+        """Iterate the items into the queue."""
+        iterator = iter(self.items)
+        try:
+            for item in iterator:
+                if not self._put(item):
+                    return
+            self._put(_Done())
+        except BaseException as error:  # noqa: BLE001
+            self._put(_Failure(error))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _get(self) -> T | _Done | _Failure:
+        """Take the next item, letting other streams run if none is ready."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            with self._released():
+                return self._queue.get()
+
+    def start(self) -> None:
+        """Start iterating the items on the background thread, if not started yet."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._produce,
+                name=self.name,
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting for the item it is iterating."""
+        self._stop.set()
+        if self._thread is not None:
+            with self._released():
+                self._thread.join()
+
+    def __iter__(self) -> Iterator[T]:
+        self.start()
+        try:
+            while not isinstance(item := self._get(), _Done):
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            self.stop()
+
+
+def pipelined(
+    items: Iterable[T],
+    *,
+    depth: int,
+    lock: SyncLock | None = None,
+    name: str = "pipeline",
+) -> Iterator[T]:
+    """Iterate items on a background thread, ahead of the caller.
+
+    The items are passed through a queue of ``depth`` items. Once it is full, the
+    background thread blocks until the caller takes the next item, so memory stays
+    bounded however slow the caller is. Errors raised by the items are raised again
+    to the caller, after the items before them. If the caller stops early, the
+    background thread stops and closes the items.
+
+    The thread starts with the first item requested. While the caller waits for the
+    next item, other streams can run.
+
+    Args:
+        items: Items to iterate, e.g. a generator sending HTTP requests.
+        depth: Maximum number of items iterated ahead of the caller.
+        lock: Lock released while waiting for the next item.
+        name: Name of the background thread.
+
+    Returns:
+        An iterator of the items, in order.
+    """
+    return iter(_Stage(items, depth=depth, lock=lock, name=name))
+
+
+def _get_key(context: Mapping[str, Any]) -> tuple:
+    """Return a hashable key of a partition."""
+    return tuple(sorted(context.items()))
+
+
+class Prefetcher(Generic[T]):
+    """Partitions iterated on background threads, ahead of the one being synced.
+
+    Each partition runs on its own thread through a bounded queue, like
+    :func:`pipelined`. Taking a partition starts it, if it was not started yet,
+    and the following ones, so that up to ``ahead`` other partitions are iterated
+    at the same time, in their listed order.
+
+    Items are fetched with blocking calls, one thread per partition, so this
+    overlaps the requests of a few partitions rather than keeping many requests in
+    flight on a few threads.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        contexts: Sequence[Mapping[str, Any]],
+        fetch: Callable[[Mapping[str, Any]], Iterable[T]],
+        *,
+        ahead: int,
+        depth: int,
+        lock: SyncLock | None = None,
+        name: str = "prefetch",
+    ) -> None:
+        """Initialize the prefetcher.
+
+        Args:
+            contexts: Partitions that may be prefetched, in the order they are
+                expected to be taken.
+            fetch: Function returning the items of a partition. It is called on the
+                calling thread, and the items are iterated on a background thread.
+            ahead: Maximum number of partitions iterated ahead of the one taken.
+            depth: Maximum number of items of each partition iterated ahead.
+            lock: Lock released while waiting for the next item.
+            name: Prefix of the names of the background threads.
+        """
+        self.contexts = list(contexts)
+        self.fetch = fetch
+        self.ahead = ahead
+        self.depth = depth
+        self.lock = lock
+        self.name = name
+        self._indexes = {
+            _get_key(context): index for index, context in enumerate(self.contexts)
+        }
+        self._stages: dict[int, _Stage[T]] = {}
+        self._current: _Stage[T] | None = None
+        self._taken: set[int] = set()
+        self._cursor = 0
+
+    def _start(self, index: int) -> _Stage[T]:
+        """Start iterating the items of a partition in the background."""
+        stage = _Stage(
+            self.fetch(self.contexts[index]),
+            depth=self.depth,
+            lock=self.lock,
+            name=f"{self.name}-{index}",
+        )
+        stage.start()
+        return stage
+
+    def take(self, context: Mapping[str, Any]) -> Iterator[T] | None:
+        """Return the items of a partition, and start prefetching the next ones.
+
+        Args:
+            context: Partition being synced.
+
+        Returns:
+            An iterator of the items of the partition, or None if it is not one of
+            the partitions that may be prefetched.
+        """
+        index = self._indexes.get(_get_key(context))
+        if index is None or index in self._taken:
+            return None
+
+        self._taken.add(index)
+        stage = self._stages.pop(index, None) or self._start(index)
+        self._current = stage
+        while len(self._stages) < self.ahead and self._cursor < len(self.contexts):
+            if self._cursor not in self._taken and self._cursor not in self._stages:
+                self._stages[self._cursor] = self._start(self._cursor)
+            self._cursor += 1
+        return iter(stage)
+
+    def close(self) -> None:
+        """Stop iterating the partitions, including those that were not taken."""
+        stages = [*self._stages.values()]
+        if self._current is not None:
+            stages.append(self._current)
+        for stage in stages:
+            stage.stop()
+        self._stages.clear()
+        self._current = None
@@ -0,0 +1,170 @@
+"""Dry-run planning of the HTTP requests a sync would issue."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+from tap_criteo.streams.v202601 import StatsReportStream
+from tap_criteo.tenants import TENANT_KEY
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from singer_sdk import Stream
+
+    from tap_criteo.client import CriteoStream
+    from tap_criteo.history import RunHistory
+    from tap_criteo.tap import TapCriteo
+
+
+def _iter_planned_streams(streams: Iterable[Stream]) -> Iterable[CriteoStream]:
+    """Yield the selected streams and their selected descendants."""
+    for stream in streams:
+        if stream.selected:
+            yield cast("CriteoStream", stream)
+        yield from _iter_planned_streams(stream.child_streams)
+
+
+def plan_stream_requests(stream: CriteoStream) -> list[dict[str, Any]]:
+    """Expand a stream into the requests of its first page for each partition.
+
+    Report streams are not paginated, so their requests are exact: one per
+    advertiser and report window. Child streams get one partition per advertiser,
+    as the advertisers stream only returns the configured advertisers, and other
+    streams one request per partition, e.g. per tenant, if they are partitioned.
+
+    Args:
+        stream: Stream to plan.
+
+    Returns:
+        The planned requests, with their HTTP method and URL.
+    """
+    if isinstance(stream, StatsReportStream):
+        for partition in stream.partitions or []:
+            stream._write_starting_replication_value(partition)  # noqa: SLF001
+        return [
+            {
+                "stream": stream.name,
+                "method": stream.http_method.upper(),
+                "url": stream.get_url(partition),
+                **(
+                    {TENANT_KEY: partition[TENANT_KEY]}
+                    if TENANT_KEY in partition
+                    else {}
+                ),
+                **({"advertiserId": advertiser_id} if advertiser_id else {}),
+                "startDate": start.isoformat(),
+                "endDate": end.isoformat(),
+            }
+            for partition in stream.partitions or []
+            for advertiser_id in [partition.get("AdvertiserId")]
+            for start, end in stream.get_report_windows(partition)
+        ]
+
+    contexts: list[dict | None] = [None]
+    if stream.parent_stream_type:
+        # Advertisers are only known once synced when none are configured
+        contexts = [
+            context
+            for context in stream.get_advertiser_partitions("advertiserId")
+            if "advertiserId" in context
+        ]
+    elif stream.partitions:
+        contexts = list(stream.partitions)
+
+    return [
+        {
+            "stream": stream.name,
+            "method": stream.http_method.upper(),
+            "url": stream.get_url(context),
+        }
+        for context in contexts
+    ]
+
+
+def estimate_stream(
+    stream: CriteoStream,
+    planned_requests: int,
+    history: RunHistory,
+) -> dict[str, Any]:
+    """Estimate the cost of syncing a stream from the previous run.
+
+    Paginated streams are assumed to need as many requests as last time, at least
+    one per planned partition. Rows and durations are scaled from the averages per
+    request of the previous run.
+
+    Args:
+        stream: Stream to estimate.
+        planned_requests: Number of planned requests for the stream.
+        history: Statistics of previous runs.
+
+    Returns:
+        The planned and estimated request counts, estimated rows and seconds.
+        Estimates are None for streams never synced before.
+    """
+    stats = history.streams.get(stream.name, {})
+    last_requests = stats.get("requests")
+    estimate: dict[str, Any] = {
+        "planned_requests": planned_requests,
+        "estimated_requests": planned_requests,
+        "estimated_rows": None,
+        "estimated_seconds": None,
+    }
+    if not last_requests:
+        return estimate
+
+    if not isinstance(stream, StatsReportStream):
+        estimate["estimated_requests"] = max(planned_requests, last_requests)
+
+    requests = estimate["estimated_requests"]
+    estimate["estimated_rows"] = round(
+        stats.get("records", 0) / last_requests * requests,
+    )
+    estimate["estimated_seconds"] = round(
+        stats.get("request_seconds", 0) / last_requests * requests,
+        1,
+    )
+    return estimate
+
+
+def plan_sync(tap: TapCriteo) -> dict[str, Any]:
+    """Plan the requests a sync of the tap would issue, without sending any.
+
+    Args:
+        tap: The tap, with its config, catalog and state.
+
+    Returns:
+        The planned requests, per-stream estimates and totals. The total rows are
+        None, i.e. unknown, if any stream was never synced before. The total
+        duration assumes streams are spread evenly over ``max_concurrent_streams``
+        workers.
+    """
+    requests = []
+    streams = {}
+    for stream in _iter_planned_streams(tap.get_sync_streams()):
+        planned = plan_stream_requests(stream)
+        requests.extend(planned)
+        streams[stream.name] = estimate_stream(stream, len(planned), tap.history)
+
+    rows = [s["estimated_rows"] for s in streams.values()]
+    seconds = [s["estimated_seconds"] for s in streams.values()]
+    known_seconds = [s for s in seconds if s is not None]
+    workers = tap.config.get("max_concurrent_streams", 1)
+    return {
+        "requests": requests,
+        "streams": streams,
+        "total": {
+            "planned_requests": len(requests),
+            "estimated_requests": sum(
+                s["estimated_requests"] for s in streams.values()
+            ),
+            "estimated_rows": None if None in rows else sum(rows),
+            "estimated_seconds": round(
+                max(max(known_seconds, default=0), sum(known_seconds) / workers),
+                1,
+            ),
+            "streams_without_history": [
+                name for name, s in streams.items() if s["estimated_seconds"] is None
+            ],
+        },
+    }
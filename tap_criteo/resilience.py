@@ -0,0 +1,301 @@
+"""Tail-latency protection: hedged requests and per-endpoint circuit breakers."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import TYPE_CHECKING, TypeVar
+from urllib.parse import urlsplit
+
+from singer_sdk.exceptions import FatalAPIError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Executor, Future
+
+    import requests  # type: ignore[import-untyped]
+
+T = TypeVar("T")
+
+#: Quantile of the recent latencies of an endpoint after which a request is hedged
+HEDGE_QUANTILE = 0.95
+
+#: Number of recent latencies kept for each endpoint
+LATENCY_WINDOW = 200
+
+#: Number of latencies recorded for an endpoint before its requests are hedged
+MIN_LATENCY_SAMPLES = 20
+
+#: Path suffixes of the POST endpoints that only read data, i.e. entity searches and
+#: statistics reports, so their requests can be sent twice
+IDEMPOTENT_POST_PATHS = ("/search", "/statistics/report")
+
+
+class CircuitOpenError(FatalAPIError):
+    """Request not sent because the circuit of its endpoint is open."""
+
+
+def is_idempotent(request: requests.PreparedRequest) -> bool:
+    """Check whether a request can be sent twice without side effects.
+
+    Args:
+        request: Request to send.
+
+    Returns:
+        True for GET requests, and for POST requests to read-only endpoints.
+    """
+    if request.method == "GET":
+        return True
+    return request.method == "POST" and urlsplit(request.url).path.endswith(
+        IDEMPOTENT_POST_PATHS,
+    )
+
+
+class LatencyTracker:
+    """Recent latencies of an endpoint."""
+
+    def __init__(
+        self,
+        window: int = LATENCY_WINDOW,
+        min_samples: int = MIN_LATENCY_SAMPLES,
+    ) -> None:
+        """Initialize an empty tracker.
+
+        Args:
+            window: Number of recent latencies kept.
+            min_samples: Number of latencies needed to estimate quantiles.
+        """
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a successful request.
+
+        Args:
+            seconds: Request duration.
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """Return a quantile of the recent latencies.
+
+        Args:
+            q: Quantile, between 0 and 1.
+
+        Returns:
+            The quantile in seconds, or None without enough latencies.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(math.ceil(q * len(latencies)), len(latencies)) - 1]
+
+
+class CircuitBreaker:
+    """Circuit breaker of an endpoint.
+
+    The circuit opens after ``threshold`` consecutive failed requests, each counted
+    once its retries ran out, and requests are then rejected. Once
+    ``reset_seconds`` have passed, a single trial request is let through: the
+    circuit closes if it succeeds, and opens again otherwise.
+    """
+
+    def __init__(self, threshold: int = 5, reset_seconds: float = 60) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            threshold: Consecutive failures that open the circuit.
+            reset_seconds: Seconds before a trial request is let through.
+        """
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at: float | None = None
+        #: Thread sending the trial request, if any
+        self._trial: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are rejected, and no trial request is due."""
+        opened_at = self._opened_at
+        return (
+            opened_at is not None and time.monotonic() - opened_at < self.reset_seconds
+        )
+
+    @property
+    def in_trial(self) -> bool:
+        """Whether the current thread sends the trial request of an open circuit."""
+        return self._trial == threading.get_ident()
+
+    def allow(self) -> bool:
+        """Check whether a request can be sent.
+
+        Returns:
+            True if the circuit is closed, or for the trial request of an open
+            circuit.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if (
+                self._trial is not None
+                or time.monotonic() - self._opened_at < self.reset_seconds
+            ):
+                return False
+            self._trial = threading.get_ident()
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = None
+
+    def record_failure(self) -> bool:
+        """Count a failed request, opening the circuit at the threshold.
+
+        Returns:
+            True if the circuit just opened.
+        """
+        with self._lock:
+            self.failures += 1
+            if self._trial is not None or (
+                self._opened_at is None and self.failures >= self.threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._trial = None
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """End the trial request without a verdict, e.g. after a client error.
+
+        The circuit stays open, and the next request becomes the trial request.
+        """
+        with self._lock:
+            self._trial = None
+
+
+class EndpointHealth:
+    """Latencies and circuit breaker of an endpoint."""
+
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        """Initialize the health of an endpoint.
+
+        Args:
+            threshold: Consecutive failures that open the circuit.
+            reset_seconds: Seconds before a trial request is let through.
+        """
+        self.latencies = LatencyTracker()
+        self.breaker = CircuitBreaker(threshold, reset_seconds)
+
+
+class EndpointRegistry:
+    """Health of each endpoint, shared by the streams requesting it."""
+
+    def __init__(self, threshold: int = 5, reset_seconds: float = 60) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            threshold: Consecutive failures that open the circuit of an endpoint.
+            reset_seconds: Seconds before a trial request is let through.
+        """
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._endpoints: dict[str, EndpointHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> EndpointHealth:
+        """Return the health of an endpoint.
+
+        Args:
+            endpoint: Endpoint path, e.g. ``/2026-01/statistics/report``.
+
+        Returns:
+            The endpoint health.
+        """
+        with self._lock:
+            if endpoint not in self._endpoints:
+                self._endpoints[endpoint] = EndpointHealth(
+                    self.threshold,
+                    self.reset_seconds,
+                )
+            return self._endpoints[endpoint]
+
+
+def _release_when_done(futures: list[Future], slots: threading.Semaphore) -> None:
+    """Release a hedging slot once all the calls of a hedged call completed."""
+    pending = len(futures)
+    lock = threading.Lock()
+
+    def done(_: Future) -> None:
+        nonlocal pending
+        with lock:
+            pending -= 1
+            last = not pending
+        if last:
+            slots.release()
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+def hedged_call(
+    executor: Executor,
+    func: Callable[[], T],
+    *,
+    delay: float,
+    slots: threading.Semaphore,
+    hedge: Callable[[], T] | None = None,
+) -> tuple[T, bool, bool]:
+    """Call a function, calling it again if the first call is slow.
+
+    The first call to succeed wins. If a call fails while the other is still
+    running, the other one is awaited. The result of the losing call is dropped,
+    but the call keeps running, and its executor thread, until it completes, e.g.
+    until its request times out.
+
+    Each hedged call takes a slot until both of its calls complete, so at most two
+    executor threads per slot are in use. Without a free slot, the function is
+    called once, on the calling thread.
+
+    Args:
+        executor: Thread pool running the calls, with two threads per slot.
+        func: Idempotent function, e.g. sending a GET request.
+        delay: Seconds after which the function is called again.
+        slots: Hedged calls that may run at the same time.
+        hedge: Function making the second call instead of ``func``, e.g. waiting
+            for a rate limit first.
+
+    Returns:
+        The result, whether the function was called again, and whether the second
+        call won.
+    """
+    if not slots.acquire(blocking=False):
+        return func(), False, False
+
+    calls = [executor.submit(func)]
+    try:
+        done, _ = wait(calls, timeout=delay)
+        if done:
+            return calls[0].result(), False, False
+
+        hedge_call = executor.submit(hedge or func)
+        calls.append(hedge_call)
+        pending: set[Future[T]] = set(calls)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Successful calls first, in case both calls completed
+            for future in sorted(done, key=lambda f: f.exception() is not None):
+                if future.exception() is None or not pending:
+                    return future.result(), True, future is hedge_call
+    finally:
+        _release_when_done(calls, slots)
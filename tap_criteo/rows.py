@@ -0,0 +1,106 @@
+"""Compact representation of buffered report rows."""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, ClassVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_MISSING = object()
+
+
+def intern_values(values: Iterable[Any]) -> tuple:
+    """Intern the strings among some values.
+
+    Args:
+        values: Values, e.g. the dimensions of a row.
+
+    Returns:
+        The values, with strings replaced by their interned copy.
+    """
+    return tuple(sys.intern(v) if isinstance(v, str) else v for v in values)
+
+
+class CompactRow:
+    """Report row stored in slots rather than in a dictionary.
+
+    Subclasses are built per report with :func:`make_row_type`. Values of
+    ``interned`` fields are interned, so that repeated dimension values such as
+    device or campaign names are only stored once. Fields a row does not have take
+    no space, and unexpected keys are kept in a separate dictionary.
+    """
+
+    __slots__ = ("_extra",)
+
+    fields: ClassVar[tuple[str, ...]] = ()
+    interned: ClassVar[frozenset[str]] = frozenset()
+    _field_set: ClassVar[frozenset[str]] = frozenset()
+
+    _extra: dict[str, Any]
+
+    @classmethod
+    def from_dict(cls, row: dict[str, Any]) -> CompactRow:
+        """Build a compact row from a dictionary.
+
+        Args:
+            row: Row data.
+
+        Returns:
+            The compact row.
+        """
+        compact = cls()
+        extra = {}
+        for key, value in row.items():
+            if key not in cls._field_set:
+                extra[key] = value
+            elif key in cls.interned and isinstance(value, str):
+                setattr(compact, key, sys.intern(value))
+            else:
+                setattr(compact, key, value)
+        if extra:
+            compact._extra = extra
+        return compact
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the row as a dictionary.
+
+        Returns:
+            Row data, with its fields in the order of the row type.
+        """
+        row = {}
+        for field in self.fields:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                row[field] = value
+        row.update(getattr(self, "_extra", {}))
+        return row
+
+
+def make_row_type(
+    name: str,
+    fields: Iterable[str],
+    interned: Iterable[str] = (),
+) -> type[CompactRow]:
+    """Create a compact row type for a report.
+
+    Args:
+        name: Name of the row type.
+        fields: Names of the fields of the report rows.
+        interned: Fields whose values are interned, typically dimensions.
+
+    Returns:
+        A :class:`CompactRow` subclass.
+    """
+    fields = tuple(dict.fromkeys(fields))
+    return type(
+        name,
+        (CompactRow,),
+        {
+            "__slots__": fields,
+            "fields": fields,
+            "interned": frozenset(interned),
+            "_field_set": frozenset(fields),
+        },
+    )
@@ -0,0 +1,181 @@
+"""Concurrent stream scheduling."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
+    from singer_sdk import Stream
+
+    from tap_criteo.budget import SyncBudget
+    from tap_criteo.history import RunHistory
+
+
+class SyncLock:
+    """Lock serializing stream syncs, except while they wait on the network.
+
+    Streams synced concurrently share the tap state, the state writer and standard
+    output. Holding this lock for everything but HTTP requests keeps all of those
+    single-threaded, so Singer messages are written whole and each stream still
+    writes its SCHEMA message before its records, while the slow part of a sync,
+    waiting on the API, overlaps between streams.
+
+    When no thread holds the lock, e.g. during a regular sequential sync, releasing
+    it is a no-op.
+
+    The time each thread spends waiting to acquire the lock is accumulated, so that
+    it can be left out of stream durations.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the lock."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def is_held(self) -> bool:
+        """Whether the current thread holds the lock."""
+        return getattr(self._local, "held", False)
+
+    @property
+    def wait_seconds(self) -> float:
+        """Total time the current thread spent waiting to acquire the lock."""
+        return getattr(self._local, "wait_seconds", 0.0)
+
+    def _acquire(self) -> None:
+        """Acquire the lock, accounting for the time spent waiting for it."""
+        start = time.perf_counter()
+        self._lock.acquire()
+        self._local.wait_seconds = self.wait_seconds + time.perf_counter() - start
+        self._local.held = True
+
+    @contextmanager
+    def held(self) -> Iterator[None]:
+        """Hold the lock for the duration of the context."""
+        self._acquire()
+        try:
+            yield
+        finally:
+            self._local.held = False
+            self._lock.release()
+
+    @contextmanager
+    def released(self) -> Iterator[None]:
+        """Let other threads run for the duration of the context."""
+        if not self.is_held:
+            yield
+            return
+
+        self._local.held = False
+        self._lock.release()
+        try:
+            yield
+        finally:
+            self._acquire()
+
+
+def schedule_streams(
+    streams: Sequence[Stream],
+    history: RunHistory,
+    *,
+    priorities: Mapping[str, int] | None = None,
+    shortest_first: bool = False,
+) -> list[Stream]:
+    """Order streams by priority, then so that the longest ones start first.
+
+    Streams without a recorded duration are assumed to be the longest, since they
+    are typically new reports that need a full backfill.
+
+    Args:
+        streams: Streams to sync.
+        history: Durations recorded in previous runs.
+        priorities: Stream priorities, by name. Higher priorities start first, and
+            streams default to 0.
+        shortest_first: Start the shortest streams first instead, e.g. so that a
+            time budget syncs as many streams as possible.
+
+    Returns:
+        The ordered streams.
+    """
+    priorities = priorities or {}
+    direction = 1 if shortest_first else -1
+    return sorted(
+        streams,
+        key=lambda stream: (
+            -priorities.get(stream.name, 0),
+            direction * (history.get_duration(stream.name) or math.inf),
+        ),
+    )
+
+
+def sync_streams(  # noqa: PLR0913
+    streams: Sequence[Stream],
+    *,
+    lock: SyncLock,
+    history: RunHistory,
+    max_workers: int = 1,
+    budget: SyncBudget | None = None,
+    priorities: Mapping[str, int] | None = None,
+) -> None:
+    """Sync top-level streams on a pool of worker threads.
+
+    Child streams are synced by their parent, in the parent's worker. The first
+    failure stops any stream that has not started yet and is re-raised once the
+    running ones finish.
+
+    The recorded duration of a stream is the time it held the lock or waited on the
+    network, leaving out the time it waited for other streams.
+
+    Args:
+        streams: Top-level streams to sync.
+        lock: Lock serializing everything but network I/O.
+        history: Run history to read and record stream durations.
+        max_workers: Maximum number of streams synced at the same time.
+        budget: Time budget. Streams are started shortest first, and those that
+            have not started when it runs out are deferred.
+        priorities: Stream priorities, by name, see :func:`schedule_streams`.
+    """
+
+    def sync(stream: Stream) -> None:
+        if budget is not None and budget.exhausted:
+            budget.defer(stream.name, None)
+            return
+
+        start = time.perf_counter()
+        waited = lock.wait_seconds
+        with lock.held():
+            stream.sync()
+            stream.finalize_state_progress_markers()
+            elapsed = time.perf_counter() - start
+            history.record(
+                stream.name,
+                duration=elapsed - (lock.wait_seconds - waited),
+            )
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="stream",
+    ) as executor:
+        futures = [
+            executor.submit(sync, stream)
+            for stream in schedule_streams(
+                streams,
+                history,
+                priorities=priorities,
+                shortest_first=budget is not None and budget.seconds is not None,
+            )
+        ]
+        _, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+
+    for future in futures:
+        if not future.cancelled():
+            future.result()
@@ -0,0 +1,115 @@
+"""Sharding of advertisers across tap processes."""
+
+from __future__ import annotations
+
+import copy
+import json
+import zlib
+from typing import TYPE_CHECKING, Any
+
+import click
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from typing import IO
+
+
+def get_shard(advertiser_id: str, shard_count: int) -> int:
+    """Return the shard an advertiser belongs to.
+
+    A CRC32 checksum is used instead of :func:`hash` so that every process, on every
+    machine, assigns an advertiser to the same shard.
+
+    Args:
+        advertiser_id: The advertiser ID.
+        shard_count: Total number of shards.
+
+    Returns:
+        The index of the shard, between 0 and ``shard_count - 1``.
+    """
+    return zlib.crc32(advertiser_id.encode()) % shard_count
+
+
+def shard_advertiser_ids(
+    advertiser_ids: Sequence[str],
+    *,
+    shard_index: int,
+    shard_count: int,
+) -> list[str]:
+    """Return the advertisers that belong to a shard.
+
+    Args:
+        advertiser_ids: All configured advertiser IDs.
+        shard_index: Index of the shard.
+        shard_count: Total number of shards.
+
+    Returns:
+        The advertiser IDs of the shard, in their configured order.
+    """
+    return [
+        advertiser_id
+        for advertiser_id in advertiser_ids
+        if get_shard(advertiser_id, shard_count) == shard_index
+    ]
+
+
+def _is_newer(state: dict, other: dict) -> bool:
+    """Check whether a bookmark is further ahead than another one."""
+    value = state.get("replication_key_value")
+    other_value = other.get("replication_key_value")
+    if value is None:
+        return False
+    return other_value is None or value > other_value
+
+
+def merge_states(states: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Merge the states written by several shards into one.
+
+    Stream and partition bookmarks are merged independently. When more than one
+    shard has a bookmark for the same stream or partition, the one furthest ahead
+    wins, since a shard may carry stale copies of bookmarks owned by other shards.
+
+    Args:
+        states: Shard states.
+
+    Returns:
+        The merged state.
+    """
+    bookmarks: dict[str, dict[str, Any]] = {}
+
+    for state in states:
+        for stream_name, stream_state in state.get("bookmarks", {}).items():
+            merged = bookmarks.setdefault(stream_name, {})
+
+            for partition in stream_state.get("partitions", []):
+                partitions = merged.setdefault("partitions", [])
+                existing = next(
+                    (p for p in partitions if p["context"] == partition["context"]),
+                    None,
+                )
+                if existing is None:
+                    partitions.append(copy.deepcopy(partition))
+                elif _is_newer(partition, existing):
+                    partitions[partitions.index(existing)] = copy.deepcopy(partition)
+
+            stream_bookmark = {
+                key: value for key, value in stream_state.items() if key != "partitions"
+            }
+            if stream_bookmark and (
+                _is_newer(stream_bookmark, merged)
+                or "replication_key_value" not in merged
+            ):
+                merged.update(copy.deepcopy(stream_bookmark))
+
+    return {"bookmarks": bookmarks}
+
+
+@click.command()
+@click.argument("states", nargs=-1, required=True, type=click.File())
+def merge_state_command(states: tuple[IO[str], ...]) -> None:
+    """Merge the state files of several tap-criteo shards into one.
+
+    The merged state is written to standard output.
+    """
+    merged = merge_states(json.load(state) for state in states)
+    click.echo(json.dumps(merged, indent=2))
@@ -1 +1,45 @@
-"""Streams for tap-criteo."""
+"""Streams for tap-criteo.
+
+Stream classes are registered by import path and only imported when the tap
+instantiates its streams, so that commands like ``--about`` do not load stream
+modules and their dependencies.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from tap_criteo.client import CriteoStream
+
+#: Object stream classes, by API version
+OBJECT_STREAMS: dict[str, list[str]] = {
+    "current": [
+        "tap_criteo.streams.v202601:AudiencesStream",
+        "tap_criteo.streams.v202601:AdvertisersStream",
+        "tap_criteo.streams.v202601:CampaignsStream",
+        "tap_criteo.streams.v202601:AdSetsStream",
+        "tap_criteo.streams.v202601:AdsStream",
+        "tap_criteo.streams.v202601:CreativesStream",
+    ],
+}
+
+#: Base class of the configured report streams
+REPORTS_BASE = "tap_criteo.streams.v202601:StatsReportStream"
+
+#: Class of the intraday streams of reports
+INTRADAY_REPORTS_BASE = "tap_criteo.streams.v202601:IntradayReportStream"
+
+
+def load_stream_class(path: str) -> type[CriteoStream]:
+    """Import a registered stream class.
+
+    Args:
+        path: Import path of the class, as ``module:ClassName``.
+
+    Returns:
+        The stream class.
+    """
+    module_name, class_name = path.split(":")
+    return cast("type[CriteoStream]", getattr(import_module(module_name), class_name))
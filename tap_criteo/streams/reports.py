@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+import functools
 from datetime import datetime, timezone
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Mapping
 
 UTC = timezone.utc
 
+#: How currency and rate metrics are converted: to exact decimals, to floats, or
+#: to integers scaled by ``10 ** numeric_scale``
+NUMERIC_MODES = ("decimal", "float", "scaled_int")
+
+#: Default number of decimal places kept by the ``scaled_int`` numeric mode
+DEFAULT_NUMERIC_SCALE = 6
+
 
 def _parse_date(date: str) -> datetime:
     """Parse date.
@@ -612,3 +620,88 @@ value_func_mapping: dict[str, Callable[[str], Any]] = {
         int,
     ),
 }
+
+
+def to_scaled_int(value: str | float | Decimal, scale: int) -> int:
+    """Convert a decimal value to an integer number of ``10 ** -scale`` units.
+
+    Decimal strings are scaled exactly without building a :class:`Decimal`, and
+    extra decimal places are rounded half away from zero.
+
+    Args:
+        value: Decimal value, e.g. ``"12.3456"``.
+        scale: Number of decimal places to keep.
+
+    Returns:
+        The scaled value, e.g. ``123456`` with a scale of 4.
+    """
+    if isinstance(value, str) and "e" not in value and "E" not in value:
+        whole, _, fraction = value.partition(".")
+        scaled = int(whole + fraction[:scale].ljust(scale, "0"))
+        if fraction[scale : scale + 1] >= "5":
+            scaled += -1 if whole.startswith("-") else 1
+        return scaled
+    return int(Decimal(value).scaleb(scale).to_integral_value(ROUND_HALF_UP))
+
+
+def get_field_schema(name: str, numeric_mode: str = "decimal") -> dict:
+    """Return the JSON schema of a report field.
+
+    Args:
+        name: Dimension or metric name.
+        numeric_mode: One of :data:`NUMERIC_MODES`.
+
+    Returns:
+        The field schema.
+    """
+    if numeric_mode == "scaled_int" and value_func_mapping.get(name) is Decimal:
+        return {"type": "integer"}
+    return analytics_type_mappings[name]
+
+
+@functools.cache
+def get_value_funcs(
+    numeric_mode: str = "decimal",
+    scale: int = DEFAULT_NUMERIC_SCALE,
+) -> Mapping[str, Callable[[Any], Any]]:
+    """Return the converters of report fields for a numeric mode.
+
+    Args:
+        numeric_mode: One of :data:`NUMERIC_MODES`.
+        scale: Number of decimal places kept by the ``scaled_int`` mode.
+
+    Returns:
+        Converters, by field name.
+    """
+    if numeric_mode == "decimal":
+        return value_func_mapping
+
+    func: Callable[[Any], Any] = (
+        float
+        if numeric_mode == "float"
+        else functools.partial(to_scaled_int, scale=scale)
+    )
+    return {
+        key: func if value_func is Decimal else value_func
+        for key, value_func in value_func_mapping.items()
+    }
+
+
+def coerce_row(
+    row: dict[str, Any],
+    value_funcs: Mapping[str, Callable[[Any], Any]] = value_func_mapping,
+) -> dict[str, Any]:
+    """Convert the string values of a report row to their Python types.
+
+    Args:
+        row: Report row, updated in place.
+        value_funcs: Converters, by field name, see :func:`get_value_funcs`.
+
+    Returns:
+        The report row.
+    """
+    for key, value in row.items():
+        func = value_funcs.get(key)
+        if func:
+            row[key] = func(value)
+    return row
@@ -3,17 +3,33 @@
 from __future__ import annotations
 
 import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from importlib.resources import files
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 from dateutil.parser import parse
-from singer_sdk import SchemaDirectory, StreamSchema
+from singer_sdk import SchemaDirectory
+from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.helpers._state import PROGRESS_MARKER_NOTE, PROGRESS_MARKERS
+from singer_sdk.mapper import SameRecordTransform
 from singer_sdk.pagination import OffsetPaginator
 
 from tap_criteo import schemas
 from tap_criteo.client import CriteoSearchStream, CriteoStream
-from tap_criteo.streams.reports import analytics_type_mappings, value_func_mapping
+from tap_criteo.dedup import DEFAULT_MEMORY_ROWS, LatestRowIndex
+from tap_criteo.enrichment import enrich_rows, get_request_dimensions
+from tap_criteo.hashes import MemoryRowHashStore, RowHashBatch, RowHashStore
+from tap_criteo.offload import PreparedRecord, PreparedRecordWriter, offload_records
+from tap_criteo.pipeline import ProcessedRecord
+from tap_criteo.rows import make_row_type
+from tap_criteo.streams.reports import (
+    DEFAULT_NUMERIC_SCALE,
+    analytics_type_mappings,
+    coerce_row,
+    get_field_schema,
+    get_value_funcs,
+)
+from tap_criteo.tenants import TENANT_KEY, TenantStreamSchema, add_tenant_property
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -21,20 +37,73 @@ else:
     from typing_extensions import override
 
 if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator
+    from concurrent.futures import ProcessPoolExecutor
+
     from singer_sdk.helpers.types import Context, Record
     from singer_sdk.tap_base import Tap
 
+    from tap_criteo.tap import TapCriteo
+
 PAGE_SIZE = 50
 SCHEMAS_DIR = SchemaDirectory(files(schemas) / "v2026.01")
 UTC = timezone.utc
+PARTITION_KEY = "AdvertiserId"
+
+# Report replication key candidates, from finest to coarsest grain
+TIME_DIMENSIONS = ("Hour", "Day", "Week", "Month", "Year")
+
+# Report end dates are inclusive, so each window ends this long before the next
+# one starts, by replication key. Coarser grains still request whole days.
+WINDOW_GAPS = {"Hour": timedelta(hours=1)}
+
+# Intraday rows are only requested on their day and the hour after, so hashes
+# kept for longer than this are never compared again
+INTRADAY_HASH_MAX_AGE = timedelta(days=2)
 
 
 class AudiencesStream(CriteoSearchStream):
-    """Audiences stream."""
+    """Audiences stream.
+
+    Audiences are partitioned by advertiser, so each advertiser keeps its own
+    ``updatedAt`` bookmark. The search endpoint cannot filter on update times, so
+    audiences that did not change since the bookmark are dropped as they are read.
+    """
 
     name = "audiences"
     path = "/2026-01/marketing-solutions/audiences/search"
-    schema = StreamSchema(SCHEMAS_DIR, key="audience")
+    schema = TenantStreamSchema(SCHEMAS_DIR, key="audience")
+    advertiser_scoped = True
+    replication_key = "updatedAt"
+    is_sorted = False
+
+    @override
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Return one partition per configured advertiser."""
+        return self.prioritize_partitions(
+            self.get_advertiser_partitions("advertiserId"),
+        )
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[dict[str, Any]]:
+        """Request the audiences of an advertiser updated since its bookmark.
+
+        Args:
+            context: Stream partition.
+
+        Yields:
+            Audiences updated at or after the partition bookmark, or all of them
+            for new partitions.
+        """
+        bookmark = self.get_context_state(context).get("replication_key_value")
+        since = parse(bookmark) if bookmark else None
+
+        for record in super().get_records(context):
+            updated_at = record.get(self.replication_key)
+            if since and updated_at and parse(updated_at) < since:
+                continue
+            yield record
 
     @override
     def prepare_request_payload(
@@ -42,13 +111,18 @@ class AudiencesStream(CriteoSearchStream):
         context: Context | None,
         next_page_token: Any | None,
     ) -> dict:
-        """Prepare request payload for audiences search."""
-        advertiser_ids = self.config.get("advertiser_ids", [])
+        """Prepare request payload for audiences search.
 
+        Without an advertiser in the partition, audiences of all advertisers are
+        searched.
+        """
+        advertiser_id = (context or {}).get("advertiserId")
         return {
             "data": {
                 "type": "AudienceSearchEntity",
-                "attributes": {"advertiserIds": advertiser_ids},
+                "attributes": {
+                    "advertiserIds": [advertiser_id] if advertiser_id else [],
+                },
             },
         }
 
@@ -58,7 +132,8 @@ class AdvertisersStream(CriteoStream):
 
     name = "advertisers"
     path = "/2026-01/advertisers/me"
-    schema = StreamSchema(SCHEMAS_DIR, key="advertiser")
+    schema = TenantStreamSchema(SCHEMAS_DIR, key="advertiser")
+    advertiser_scoped = True
 
     @override
     def get_child_context(
@@ -66,8 +141,8 @@ class AdvertisersStream(CriteoStream):
         record: Record,
         context: Context | None,
     ) -> dict:
-        """Return a context dictionary for child streams."""
-        return {"advertiserId": record["id"]}
+        """Return a context dictionary for child streams, with the tenant if any."""
+        return {**(context or {}), "advertiserId": record["id"]}
 
     @override
     def post_process(
@@ -75,13 +150,20 @@ class AdvertisersStream(CriteoStream):
         row: dict,
         context: Context | None = None,
     ) -> dict | None:
-        """Scope to provided advertisers."""
+        """Scope to the advertisers provided for the partition's tenant."""
+        if isinstance(row, ProcessedRecord):
+            return row
         if "attributes" in row and isinstance(row["attributes"], dict):
             attributes = row.pop("attributes")
             row.update(attributes)
 
-        advertiser_ids = self.config.get("advertiser_ids", [])
-        if advertiser_ids and str(row.get("id")) not in advertiser_ids:
+        tenant = self.tenants[0]
+        if context and TENANT_KEY in context:
+            tenant = cast("TapCriteo", self._tap).get_tenant(context[TENANT_KEY])
+        if not tenant.advertiser_ids:
+            # All advertisers of the tenant are synced by the first shard
+            return None if self.config.get("shard_index", 0) else row
+        if str(row.get("id")) not in self.get_tenant_advertiser_ids(tenant):
             return None
 
         return row
@@ -92,7 +174,7 @@ class CampaignsStream(CriteoSearchStream):
 
     name = "campaigns"
     path = "/2026-01/marketing-solutions/campaigns/search"
-    schema = StreamSchema(SCHEMAS_DIR, key="campaign")
+    schema = TenantStreamSchema(SCHEMAS_DIR, key="campaign")
 
 
 class AdSetsStream(CriteoSearchStream):
@@ -100,16 +182,21 @@ class AdSetsStream(CriteoSearchStream):
 
     name = "ad_sets"
     path = "/2026-01/marketing-solutions/ad-sets/search"
-    schema = StreamSchema(SCHEMAS_DIR, key="ad_set")
+    schema = TenantStreamSchema(SCHEMAS_DIR, key="ad_set")
 
 
 class StatsReportStream(CriteoStream):
-    """Statistics reports stream."""
+    """Statistics reports stream.
+
+    Reports are partitioned by advertiser, so each advertiser keeps its own bookmark
+    and is requested independently of the others.
+    """
 
     name = "statistics"
     path = "/2026-01/statistics/report"
     records_jsonpath = "$.Rows[*]"
     http_method = "post"
+    advertiser_scoped = True
 
     @override
     def __init__(
@@ -124,20 +211,382 @@ class StatsReportStream(CriteoStream):
             report: The report dictionary.
         """
         name = report["name"]
+        numeric_mode = report.get("numeric_mode", "decimal")
         schema = {"properties": {"Currency": {"type": "string"}}}
         schema["properties"].update(
-            {k: analytics_type_mappings[k] for k in report["metrics"]},
+            {k: get_field_schema(k, numeric_mode) for k in report["metrics"]},
         )
         schema["properties"].update(
             {k: analytics_type_mappings[k] for k in report["dimensions"]},
         )
+        schema["properties"][PARTITION_KEY] = analytics_type_mappings[PARTITION_KEY]
+        if tap.config.get("tenants"):
+            schema = add_tenant_property(schema)
 
         super().__init__(tap, name=name, schema=schema)
 
         self.dimensions = report["dimensions"]
         self.metrics = report["metrics"]
         self.currency = report["currency"]
-        self.primary_keys = self.dimensions
+        self.numeric_mode = numeric_mode
+        self.numeric_scale = report.get("numeric_scale", DEFAULT_NUMERIC_SCALE)
+        self.value_funcs = get_value_funcs(self.numeric_mode, self.numeric_scale)
+        self.lookback_days = report.get("lookback_days", 0)
+        self.window_days = report.get("window_days")
+        self.row_hash_path = report.get("row_hash_path")
+        # Shared with the copies of the stream requesting partitions ahead
+        self._row_hash_batches: dict[tuple, RowHashBatch] = {}
+        self.primary_keys = (
+            *self.dimensions,
+            *([PARTITION_KEY] if PARTITION_KEY not in self.dimensions else []),
+            *([TENANT_KEY] if TENANT_KEY in self.schema["properties"] else []),
+        )
+        self.replication_key = next(
+            (dim for dim in TIME_DIMENSIONS if dim in self.dimensions),
+            None,
+        )
+        self.failed_partitions: list[dict] = []
+        self.row_type = make_row_type(
+            "ReportRow",
+            self.schema["properties"],
+            interned=[*self.dimensions, "Currency"],
+        )
+
+    @override
+    @property
+    def is_timestamp_replication_key(self) -> bool:
+        """Time dimensions are always usable as timestamps, even date-only ones."""
+        return self.replication_key is not None
+
+    @override
+    @property
+    def partitions(self) -> list[dict] | None:
+        """Return one partition per configured advertiser."""
+        return self.prioritize_partitions(self.get_advertiser_partitions(PARTITION_KEY))
+
+    @property
+    def request_dimensions(self) -> list[str]:
+        """Return the dimensions to request.
+
+        When names are enriched locally, name dimensions are replaced by their ID
+        dimension.
+        """
+        if self.config.get("enrich_names", False):
+            return get_request_dimensions(self.dimensions)
+        return self.dimensions
+
+    @property
+    def selected_metrics(self) -> list[str]:
+        """Return the configured metrics that are selected in the catalog.
+
+        Dimensions are all primary keys, so they are always requested. At least one
+        metric is requested, since the API needs one.
+        """
+        selected = [
+            metric for metric in self.metrics if self.mask[("properties", metric)]
+        ]
+        return selected or self.metrics[:1]
+
+    @property
+    def report_executor(self) -> ProcessPoolExecutor | None:
+        """Return the process pool report rows are post-processed on, if any.
+
+        Rows are only offloaded when records are written as they are, since stream
+        maps would transform them on the main thread anyway.
+        """
+        stream_map = self.stream_maps[0]
+        if (
+            len(self.stream_maps) > 1
+            or not isinstance(stream_map, SameRecordTransform)
+            or stream_map.stream_alias != self.name
+        ):
+            return None
+        return cast("TapCriteo", self._tap).report_executor
+
+    def get_report_windows(
+        self,
+        context: Context | None,
+    ) -> list[tuple[datetime, datetime]]:
+        """Return the date windows to request for a partition.
+
+        The first window starts at the partition bookmark, moved back by the report
+        lookback, or at the configured start date for new partitions. End dates are
+        inclusive, so each window ends one hour or day before the next one starts.
+
+        Args:
+            context: Stream partition.
+
+        Returns:
+            A list of (start, end) datetime tuples in chronological order.
+        """
+        start_date = parse(self.config["start_date"])
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=UTC)
+
+        start = self.get_starting_timestamp(context) or start_date
+        if self.lookback_days:
+            start = max(start - timedelta(days=self.lookback_days), start_date)
+
+        end = datetime.now(UTC)
+        if not self.window_days:
+            return [(start, end)]
+
+        windows = []
+        window = timedelta(days=self.window_days)
+        gap = WINDOW_GAPS.get(self.replication_key or "", timedelta(days=1))
+        while start < end:
+            windows.append((start, min(start + window - gap, end)))
+            start += window
+        return windows
+
+    @property
+    def row_hashes(self) -> RowHashStore | None:
+        """Return the hashes of emitted rows, if only changed rows are emitted."""
+        if not self.row_hash_path:
+            return None
+        return cast("TapCriteo", self._tap).get_row_hash_store(self.row_hash_path)
+
+    @override
+    def get_cost_partition(self, context: Context) -> dict:
+        """Return the partition of a report window."""
+        return {
+            key: value
+            for key, value in context.items()
+            if key not in {"startDate", "endDate"}
+        }
+
+    def _get_hash_partition(self, context: Context | None) -> tuple:
+        """Return the partition part of the row hash keys."""
+        partition: tuple = ((context or {}).get(PARTITION_KEY),)
+        # Only tag keys in multi-tenant mode, so earlier hashes stay valid
+        if context and TENANT_KEY in context:
+            partition = (context[TENANT_KEY], *partition)
+        return partition
+
+    def _get_row_key(self, row: dict[str, Any]) -> tuple:
+        """Return the dimension values identifying a row within a partition."""
+        return tuple(row.get(dimension) for dimension in self.dimensions)
+
+    def _request_rows(self, context: Context) -> Iterable[dict[str, Any]]:
+        """Request the rows of a report window, and fill in names if enabled."""
+        rows = self.request_records(context)
+        if self.config.get("enrich_names", False):
+            rows = enrich_rows(
+                rows,
+                dimensions=self.dimensions,
+                index=cast("TapCriteo", self._tap).name_index,
+            )
+
+        validator = self.record_validator
+        if validator is not None and validator.mode == "first_page":
+            rows = self._validate_first_page(rows)
+        return rows
+
+    def _validate_first_page(
+        self,
+        rows: Iterable[dict[str, Any]],
+    ) -> Iterable[dict[str, Any]]:
+        """Validate the rows of the partition's first report window as they arrive.
+
+        Rows may be buffered before they are written, so they are validated when
+        requested instead, once coerced to their types.
+        """
+        for row in rows:
+            if self._page_number == 1:
+                self.validate_record(
+                    coerce_row(dict(row), self.value_funcs),
+                    first_page=True,
+                )
+            yield row
+
+    @override
+    @property
+    def in_first_page(self) -> bool:
+        """Report rows of the first window are validated when requested."""
+        return False
+
+    def _prepare_rows(
+        self,
+        rows: Iterable[dict[str, Any]],
+        context: Context | None,
+        hashes: RowHashBatch | None,
+    ) -> Iterable[dict[str, Any]]:
+        """Drop unchanged rows and offload post-processing, if enabled."""
+        if hashes is not None:
+            partition = self._get_hash_partition(context)
+            rows = (
+                row
+                for row in rows
+                if hashes.changed(
+                    (self.name, *partition, *self._get_row_key(row)),
+                    [row.get(metric) for metric in self.metrics],
+                )
+            )
+
+        executor = self.report_executor
+        if not executor:
+            return rows
+
+        return offload_records(
+            rows,
+            executor=executor,
+            lock=cast("TapCriteo", self._tap).sync_lock,
+            max_pending=2 * self.config.get("report_workers", 0),
+            stream_name=self.name,
+            schema=self.schema,
+            mask=self.mask,
+            context=dict(context or {}),
+            version=self._stream_version,
+            level=self.TYPE_CONFORMANCE_LEVEL,
+            numeric_mode=self.numeric_mode,
+            numeric_scale=self.numeric_scale,
+        )
+
+    def _get_budgeted_windows(
+        self,
+        windows: list[tuple[datetime, datetime]],
+        context: Context | None,
+    ) -> Iterator[tuple[datetime, datetime]]:
+        """Yield report windows until the sync budget runs out."""
+        for window in windows:
+            if self.defer_partition(context):
+                return
+            yield window
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[dict[str, Any]]:
+        """Request each report window for the partition.
+
+        Transient failures, i.e. errors still retriable once the request retries
+        ran out, are isolated to the partition: the error is logged, the remaining
+        windows are skipped and the partition bookmark is left where it was, so the
+        next run retries it without blocking other advertisers. Fatal errors, such
+        as rejected credentials, stop the sync. Likewise, when the
+        sync budget runs out, the partition is deferred before its next window, and
+        when the circuit of the report endpoint opens, the partition is deferred.
+
+        When the partition spans several windows, rows are de-duplicated on their
+        dimensions, since weekly or coarser rows can span consecutive windows. Only
+        the latest version of each row is emitted, once all windows are requested.
+
+        With a ``row_hash_path``, rows whose metrics did not change since they were
+        last emitted are dropped. The hashes of the partition's rows are committed
+        once they are all written, so rows whose writing failed are emitted again.
+
+        With the pipeline, rows are requested, de-duplicated and post-processed on
+        separate threads. With prefetching, the next partitions are requested while
+        this one is written.
+
+        Args:
+            context: Stream partition.
+
+        Yields:
+            One item per report row.
+        """
+        self._seed_progress_markers(context)
+        partition = self._get_hash_partition(context)
+        try:
+            with self.deferring_open_circuit(context):
+                yield from self.transform_records(
+                    self.prefetched_records(context),
+                    context,
+                )
+            hashes = self._row_hash_batches.pop(partition, None)
+            if hashes is not None:
+                self.logger.info(
+                    "Skipped %d unchanged rows from report '%s' for partition %s",
+                    hashes.unchanged,
+                    self.name,
+                    context,
+                )
+                hashes.commit()
+        finally:
+            self._row_hash_batches.pop(partition, None)
+
+    def _seed_progress_markers(self, context: Context | None) -> None:
+        """Start the partition's progress markers at its bookmark.
+
+        Rows are not sorted, and progress markers replace the bookmark once the
+        partition is synced. A run may only emit rows older than the bookmark, e.g.
+        with a lookback and only changed rows emitted, or when a later window
+        fails, so the markers start from the bookmark to never move it back.
+        """
+        state = self.get_context_state(context)
+        bookmark = state.get("replication_key_value")
+        if bookmark is None:
+            return
+
+        markers = state.setdefault(
+            PROGRESS_MARKERS,
+            {PROGRESS_MARKER_NOTE: "Progress is not resumable if interrupted."},
+        )
+        markers.setdefault("replication_key", self.replication_key)
+        markers.setdefault("replication_key_value", bookmark)
+
+    @override
+    def fetch_records(self, context: Context | None) -> Iterable[dict[str, Any]]:
+        """Return the rows of a partition, with its windows set from the state.
+
+        With row hashes, the hashes of the partition's rows are kept in a batch,
+        until its rows are written.
+        """
+        hashes = None
+        if (store := self.row_hashes) is not None:
+            hashes = store.batch()
+            self._row_hash_batches[self._get_hash_partition(context)] = hashes
+        return self._get_rows(context, self.get_report_windows(context), hashes)
+
+    def _get_rows(
+        self,
+        context: Context | None,
+        windows: list[tuple[datetime, datetime]],
+        hashes: RowHashBatch | None,
+    ) -> Iterator[dict[str, Any]]:
+        """Request and de-duplicate the rows of each report window."""
+        self._page_number = 0
+        index = None
+        if len(windows) > 1 and self.config.get("deduplicate_reports", True):
+            index = LatestRowIndex(
+                self.config.get("dedup_memory_rows", DEFAULT_MEMORY_ROWS),
+                row_type=self.row_type,
+            )
+
+        try:
+            for start, end in self._get_budgeted_windows(windows, context):
+                window_context = {
+                    **(context or {}),
+                    "startDate": start.isoformat(),
+                    "endDate": end.isoformat(),
+                }
+                try:
+                    rows = self._request_rows(window_context)
+                    if index is None:
+                        yield from self._prepare_rows(rows, context, hashes)
+                        continue
+
+                    for row in rows:
+                        index.add(self._get_row_key(row), row)
+                except (RetriableAPIError, OSError):
+                    self.logger.exception(
+                        "Failed to sync report '%s' for partition %s",
+                        self.name,
+                        context,
+                    )
+                    self.telemetry.inc("failed_partitions", stream=self.name)
+                    self.failed_partitions.append(dict(context or {}))
+                    break
+
+            if index is not None:
+                self.logger.info(
+                    "Dropped %d duplicate rows from report '%s' for partition %s",
+                    index.duplicates,
+                    self.name,
+                    context,
+                )
+                yield from self._prepare_rows(index, context, hashes)
+        finally:
+            if index is not None:
+                index.close()
 
     @override
     def prepare_request_payload(
@@ -148,30 +597,25 @@ class StatsReportStream(CriteoStream):
         """Prepare request payload.
 
         Args:
-            context: Stream context.
+            context: Stream partition, with the window being requested.
             next_page_token: The next page value.
 
         Returns:
             Dictionary for the JSON body of the request.
         """
-        start_date = parse(self.config["start_date"])
-        end_date = datetime.now(UTC)
-
-        advertiser_ids = ",".join(self.config.get("advertiser_ids", []))
-
+        context = context or {}
         payload = {
-            "dimensions": self.dimensions,
-            "metrics": self.metrics,
+            "dimensions": self.request_dimensions,
+            "metrics": self.selected_metrics,
             "currency": self.currency,
             "format": "json",
             "timezone": "UTC",
-            "startDate": start_date.isoformat(),
-            "endDate": end_date.isoformat(),
+            "startDate": context["startDate"],
+            "endDate": context["endDate"],
         }
-
-        if advertiser_ids:
-            payload["advertiserIds"] = advertiser_ids
-
+        # Without an advertiser in the partition, the report covers all of them
+        if PARTITION_KEY in context:
+            payload["advertiserIds"] = context[PARTITION_KEY]
         return payload
 
     @override
@@ -189,11 +633,91 @@ class StatsReportStream(CriteoStream):
         Returns:
             Mutated record dictionary.
         """
-        for key, value in row.items():
-            func = value_func_mapping.get(key)
-            if func:
-                row[key] = func(value)
-        return row
+        if isinstance(row, ProcessedRecord):
+            return row
+        return coerce_row(row, self.value_funcs)
+
+    @override
+    def _write_record_message(self, record: Record) -> None:
+        """Write out a RECORD message, unless a worker already serialized it.
+
+        Args:
+            record: A single stream record.
+        """
+        writer = self._tap.message_writer
+        if not isinstance(record, PreparedRecord) or not isinstance(
+            writer,
+            PreparedRecordWriter,
+        ):
+            super()._write_record_message(record)
+            return
+
+        self.validate_record(record, first_page=False)
+        self.telemetry.inc("records", stream=self.name)
+        writer.write_line(record.line)
+        self.state_manager.is_flushed = False
+
+
+class IntradayReportStream(StatsReportStream):
+    """Hourly report stream limited to the current day.
+
+    Each sync only requests today's hours, plus the previous hour for late
+    corrections, and only emits the rows whose metrics changed since they were
+    last emitted. The stream is named after its report with an ``_intraday``
+    suffix, so it keeps its own state.
+    """
+
+    @override
+    def __init__(
+        self,
+        tap: Tap,
+        report: dict,
+    ) -> None:
+        """Initialize an intraday report stream.
+
+        Args:
+            tap: The tap instance.
+            report: The report dictionary.
+        """
+        super().__init__(tap, report={**report, "name": f"{report['name']}_intraday"})
+        self._memory_hashes = MemoryRowHashStore()
+
+    @override
+    def get_report_windows(
+        self,
+        context: Context | None,
+    ) -> list[tuple[datetime, datetime]]:
+        """Return a single window, from the start of the day or the previous hour.
+
+        Args:
+            context: Stream partition.
+
+        Returns:
+            A list with one (start, end) datetime tuple.
+        """
+        now = datetime.now(UTC)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        start = min(hour.replace(hour=0), hour - timedelta(hours=1))
+        return [(start, now)]
+
+    @override
+    @property
+    def row_hashes(self) -> RowHashStore:
+        """Return the hashes of emitted rows, kept in memory without a path."""
+        return super().row_hashes or self._memory_hashes
+
+    @override
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> Generator[dict, Any, Any]:
+        """Forget the hashes of past days' rows, then sync the records."""
+        if context is None:
+            pruned = self.row_hashes.prune(INTRADAY_HASH_MAX_AGE, [self.name])
+            self.logger.debug("Pruned %d row hashes of past days.", pruned)
+        yield from super()._sync_records(context, write_messages=write_messages)
 
 
 class AdsStream(CriteoStream):
@@ -201,7 +725,7 @@ class AdsStream(CriteoStream):
 
     name = "ads"
     path = "/2026-01/marketing-solutions/advertisers/{advertiserId}/ads"
-    schema = StreamSchema(SCHEMAS_DIR, key="ad")
+    schema = TenantStreamSchema(SCHEMAS_DIR, key="ad")
 
     parent_stream_type = AdvertisersStream
     ignore_parent_replication_key = True
@@ -231,7 +755,7 @@ class CreativesStream(CriteoStream):
 
     name = "creatives"
     path = "/2026-01/marketing-solutions/advertisers/{advertiserId}/creatives"
-    schema = StreamSchema(SCHEMAS_DIR, key="creative")
+    schema = TenantStreamSchema(SCHEMAS_DIR, key="creative")
 
     parent_stream_type = AdvertisersStream
     ignore_parent_replication_key = True
@@ -2,13 +2,46 @@
 
 from __future__ import annotations
 
+import json
 import sys
-from typing import TYPE_CHECKING
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, cast
 
+import click
+import requests  # type: ignore[import-untyped]
 from singer_sdk import Stream, Tap
 from singer_sdk import typing as th
+from singer_sdk.exceptions import ConfigValidationError, FatalSyncError
+from singer_sdk.helpers._util import load_json
+from singer_sdk.plugin_base import _ConfigInput
 
-from tap_criteo.streams import v202601
+from tap_criteo.auth import CriteoAuthenticator
+from tap_criteo.budget import SyncBudget
+from tap_criteo.cassettes import (
+    CASSETTE_MODES,
+    CassetteRecorder,
+    RecordingAdapter,
+    ReplayAdapter,
+)
+from tap_criteo.catalog_cache import CatalogCache, get_catalog_key
+from tap_criteo.enrichment import NameIndex
+from tap_criteo.hashes import RowHashStore
+from tap_criteo.history import RunHistory
+from tap_criteo.offload import PreparedRecordWriter, create_executor
+from tap_criteo.pipeline import MAX_PREFETCH_PARTITIONS
+from tap_criteo.resilience import EndpointRegistry
+from tap_criteo.scheduling import SyncLock, sync_streams
+from tap_criteo.streams import (
+    INTRADAY_REPORTS_BASE,
+    OBJECT_STREAMS,
+    REPORTS_BASE,
+    load_stream_class,
+)
+from tap_criteo.telemetry import Telemetry, TelemetryExporter
+from tap_criteo.tenants import RateLimiter, get_tenants
+from tap_criteo.validation import VALIDATION_MODES
 
 if sys.version_info >= (3, 12):
     from typing import override
@@ -16,33 +49,80 @@ else:
     from typing_extensions import override
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Collection, Sequence
+    from concurrent.futures import ProcessPoolExecutor
+    from typing import IO
 
     from tap_criteo.client import CriteoStream
-
-OBJECT_STREAMS: dict[str, list[type[CriteoStream]]] = {
-    "current": [
-        v202601.AudiencesStream,
-        v202601.AdvertisersStream,
-        v202601.CampaignsStream,
-        v202601.AdSetsStream,
-        v202601.AdsStream,
-        v202601.CreativesStream,
-    ],
-}
-
-REPORTS_BASE = v202601.StatsReportStream
+    from tap_criteo.streams.v202601 import StatsReportStream
+    from tap_criteo.tenants import Tenant
 
 
 class TapCriteo(Tap):
     """Criteo tap class."""
 
     name = "tap-criteo"
+    message_writer_class = PreparedRecordWriter
 
     config_jsonschema = th.PropertiesList(
-        th.Property("client_id", th.StringType, required=True),
-        th.Property("client_secret", th.StringType, required=True),
-        th.Property("advertiser_ids", th.ArrayType(th.StringType), required=True),
+        th.Property(
+            "client_id",
+            th.StringType,
+            description="OAuth client ID. Required unless `tenants` are set.",
+        ),
+        th.Property(
+            "client_secret",
+            th.StringType,
+            secret=True,
+            description="OAuth client secret. Required unless `tenants` are set.",
+        ),
+        th.Property(
+            "advertiser_ids",
+            th.ArrayType(th.StringType),
+            description=(
+                "Advertisers to sync. An empty list syncs all the advertisers of the "
+                "API app. Required unless `tenants` are set."
+            ),
+        ),
+        th.Property(
+            "tenants",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property(
+                        "name",
+                        th.StringType,
+                        required=True,
+                        description="Name records and state are tagged with.",
+                    ),
+                    th.Property("client_id", th.StringType, required=True),
+                    th.Property(
+                        "client_secret",
+                        th.StringType,
+                        required=True,
+                        secret=True,
+                    ),
+                    th.Property(
+                        "advertiser_ids",
+                        th.ArrayType(th.StringType),
+                        required=True,
+                    ),
+                    th.Property(
+                        "max_requests_per_second",
+                        th.NumberType,
+                        description=(
+                            "Maximum rate of the requests sent with the tenant's "
+                            "credentials, across all streams."
+                        ),
+                    ),
+                ),
+            ),
+            description=(
+                "Criteo API apps to sync in a single run, each with its own "
+                "credentials and advertisers, instead of the top-level `client_id`, "
+                "`client_secret` and `advertiser_ids`. Records and state partitions "
+                "are tagged with the tenant name."
+            ),
+        ),
         th.Property("start_date", th.DateTimeType, required=True),
         th.Property(
             "reports",
@@ -56,22 +136,823 @@ class TapCriteo(Tap):
                     ),
                     th.Property("metrics", th.ArrayType(th.StringType), required=True),
                     th.Property("currency", th.StringType, default="USD"),
+                    th.Property(
+                        "lookback_days",
+                        th.IntegerType,
+                        default=0,
+                        description=(
+                            "Number of days before each advertiser's bookmark to "
+                            "request again, to pick up late attributed conversions."
+                        ),
+                    ),
+                    th.Property(
+                        "window_days",
+                        th.IntegerType,
+                        description=(
+                            "Split report requests into windows of this many days. "
+                            "By default the whole date range is requested at once."
+                        ),
+                    ),
+                    th.Property(
+                        "numeric_mode",
+                        th.StringType,
+                        default="decimal",
+                        # Not imported from the report mappings, which load lazily
+                        allowed_values=["decimal", "float", "scaled_int"],
+                        description=(
+                            "How currency and rate metrics are converted: to exact "
+                            "decimals, to floats, which are faster to convert and "
+                            "serialize, or to integers scaled by "
+                            "`10 ** numeric_scale`. Scaled metrics are integers in "
+                            "the stream schema."
+                        ),
+                    ),
+                    th.Property(
+                        "numeric_scale",
+                        th.IntegerType,
+                        default=6,
+                        description=(
+                            "Number of decimal places kept by the `scaled_int` "
+                            "numeric mode."
+                        ),
+                    ),
+                    th.Property(
+                        "intraday",
+                        th.BooleanType,
+                        default=False,
+                        description=(
+                            "Also add a `<name>_intraday` stream, which only "
+                            "requests today's hours and the previous one, and only "
+                            "emits rows that changed since the previous sync. The "
+                            "report must have the `Hour` dimension."
+                        ),
+                    ),
+                    th.Property(
+                        "row_hash_path",
+                        th.StringType,
+                        description=(
+                            "Path to a SQLite file keeping a hash of the metrics of "
+                            "each emitted row. Rows requested again, e.g. within "
+                            "the lookback, are only emitted if their metrics changed."
+                        ),
+                    ),
                 ),
             ),
         ),
+        th.Property(
+            "deduplicate_reports",
+            th.BooleanType,
+            default=True,
+            description=(
+                "Emit a single row per report dimension values when a report is "
+                "requested in several windows, keeping the latest version."
+            ),
+        ),
+        th.Property(
+            "dedup_memory_rows",
+            th.IntegerType,
+            default=100_000,
+            description=(
+                "Number of report rows held in memory for de-duplication before "
+                "spilling them to a temporary file."
+            ),
+        ),
+        th.Property(
+            "enrich_names",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Request the ID dimensions of reports instead of their `Advertiser`, "
+                "`Campaign` and `Adset` name dimensions, and fill names in from the "
+                "advertisers, campaigns and ad sets."
+            ),
+        ),
+        th.Property(
+            "name_cache_path",
+            th.StringType,
+            description=(
+                "Path to a JSON file where advertiser, campaign and ad set names are "
+                "cached between runs, when `enrich_names` is enabled."
+            ),
+        ),
+        th.Property(
+            "max_concurrent_streams",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of streams to sync at the same time. Streams are "
+                "synced one after another by default."
+            ),
+        ),
+        th.Property(
+            "pipeline_queue_depth",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Number of record batches buffered between the stages of each "
+                "stream: pages are requested on one thread, records are "
+                "post-processed on another, and Singer messages are written on the "
+                "stream's own thread, so that a slow target does not stall requests. "
+                "By default all stages run inline."
+            ),
+        ),
+        th.Property(
+            "prefetch_partitions",
+            th.IntegerType(minimum=0, maximum=MAX_PREFETCH_PARTITIONS),
+            default=0,
+            description=(
+                "Number of partitions, e.g. advertisers, requested ahead of the "
+                "partition being written, each on its own thread, so that the "
+                "requests of a few partitions of a stream overlap. Requests are not "
+                "sent asynchronously, so at most "
+                f"{MAX_PREFETCH_PARTITIONS} partitions are prefetched. By default "
+                "partitions are requested one after the other."
+            ),
+        ),
+        th.Property(
+            "sync_budget_seconds",
+            th.NumberType,
+            description=(
+                "Time budget of a sync. Once it runs out, the streams and partitions "
+                "not started yet are deferred to the next run, which starts with "
+                "them. When set, streams are started shortest first."
+            ),
+        ),
+        th.Property(
+            "stream_priorities",
+            th.ObjectType(additional_properties=th.IntegerType),
+            description=(
+                "Priorities of the streams, by name. Streams with a higher priority "
+                "are started first. Streams default to 0."
+            ),
+        ),
+        th.Property(
+            "history_path",
+            th.StringType,
+            description=(
+                "Path to a JSON file where stream sync durations are kept between "
+                "runs, so that the longest streams are started first."
+            ),
+        ),
+        th.Property(
+            "shard_index",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Index of this tap process among `shard_count` shards. Each shard "
+                "syncs its own subset of `advertiser_ids`."
+            ),
+        ),
+        th.Property(
+            "shard_count",
+            th.IntegerType,
+            default=1,
+            description="Number of tap processes the advertisers are split across.",
+        ),
+        th.Property(
+            "max_connections_per_host",
+            th.IntegerType,
+            default=10,
+            description=(
+                "Maximum number of connections kept open to the Criteo API, shared "
+                "by all streams."
+            ),
+        ),
+        th.Property(
+            "hedge_requests",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Send a GET, search or report request again when it takes longer "
+                "than the 95th percentile of the recent latencies of its endpoint, "
+                "and use the first response."
+            ),
+        ),
+        th.Property(
+            "circuit_breaker_threshold",
+            th.IntegerType,
+            default=5,
+            description=(
+                "Consecutive failed requests to an endpoint, once their retries ran "
+                "out, after which its circuit opens: its requests fail fast and its "
+                "partitions are deferred to the next run."
+            ),
+        ),
+        th.Property(
+            "circuit_breaker_reset_seconds",
+            th.NumberType,
+            default=60,
+            description=(
+                "Seconds after which an open circuit lets a trial request through. "
+                "The circuit closes if it succeeds."
+            ),
+        ),
+        th.Property(
+            "metrics_textfile_path",
+            th.StringType,
+            description=(
+                "Path of a file the run metrics are written to, in the Prometheus "
+                "text format, e.g. for the node exporter textfile collector."
+            ),
+        ),
+        th.Property(
+            "metrics_push_url",
+            th.StringType,
+            description=(
+                "URL the run metrics are pushed to with a PUT request, e.g. "
+                "`http://localhost:9091/metrics/job/tap-criteo` for a Prometheus "
+                "Pushgateway."
+            ),
+        ),
+        th.Property(
+            "metrics_interval_seconds",
+            th.NumberType,
+            description=(
+                "Also export the run metrics at this interval during the run. By "
+                "default they are only exported when the run ends."
+            ),
+        ),
+        th.Property(
+            "record_validation",
+            th.StringType,
+            default="none",
+            allowed_values=list(VALIDATION_MODES),
+            description=(
+                "Validate records against their stream schema: `all` of them, one "
+                "in every `validation_sample_interval` (`sample`), or those of the "
+                "first page of each partition (`first_page`). Invalid records are "
+                "logged and counted, but still written."
+            ),
+        ),
+        th.Property(
+            "validation_sample_interval",
+            th.IntegerType,
+            default=100,
+            description="Validate one in this many records in `sample` mode.",
+        ),
+        th.Property(
+            "catalog_cache_path",
+            th.StringType,
+            description=(
+                "Path to a JSON file the discovered catalog is cached in. Later "
+                "`--discover` runs with the same reports print it without loading "
+                "the tap."
+            ),
+        ),
+        th.Property(
+            "cassette_path",
+            th.StringType,
+            description=(
+                "Path of a gzip-compressed cassette of HTTP exchanges, recorded or "
+                "replayed according to `cassette_mode`."
+            ),
+        ),
+        th.Property(
+            "cassette_mode",
+            th.StringType,
+            default="record",
+            allowed_values=list(CASSETTE_MODES),
+            description=(
+                "Record the sync's HTTP exchanges into the cassette, with tokens, "
+                "IDs and names anonymized, or `replay` a cassette instead of "
+                "calling the API, e.g. to benchmark syncs offline."
+            ),
+        ),
+        th.Property(
+            "cassette_speed",
+            th.NumberType,
+            default=1,
+            description=(
+                "Speed of a replay: responses take their recorded duration divided "
+                "by this factor. With 0, they are served immediately."
+            ),
+        ),
+        th.Property(
+            "report_workers",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Number of worker processes that coerce and serialize report rows. "
+                "By default report rows are processed by the tap process itself."
+            ),
+        ),
     ).to_dict()
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize the tap.
+
+        Args:
+            args: Positional arguments for the base tap class.
+            kwargs: Keyword arguments for the base tap class.
+        """
+        super().__init__(*args, **kwargs)
+        self.tenants = get_tenants(self.config)
+        self.sync_lock = SyncLock()
+        self.history = RunHistory(self.config.get("history_path"))
+        self.budget = SyncBudget(self.config.get("sync_budget_seconds"))
+        self.telemetry = Telemetry()
+        self.endpoints = EndpointRegistry(
+            self.config.get("circuit_breaker_threshold", 5),
+            self.config.get("circuit_breaker_reset_seconds", 60),
+        )
+        self._authenticators: dict[str | None, CriteoAuthenticator] = {}
+        self._rate_limiters: dict[str | None, RateLimiter] = {}
+        self._row_hash_stores: dict[str, RowHashStore] = {}
+        self._row_hash_lock = threading.Lock()
+        self._tenants_lock = threading.Lock()
+        #: Hedged requests in flight, each using up to two hedge executor threads
+        self.hedge_slots = threading.BoundedSemaphore(
+            self.config.get("max_concurrent_streams", 1),
+        )
+
+        workers = self.config.get("report_workers", 0)
+        self.report_executor: ProcessPoolExecutor | None = (
+            create_executor(workers) if workers else None
+        )
+
+    @override
+    def _validate_config(self, *, raise_errors: bool = True) -> list[str]:
+        """Validate the config, including the settings its JSON schema cannot check.
+
+        Without validation, e.g. when discovering streams, errors are only logged.
+
+        Args:
+            raise_errors: Whether to raise an exception if the config is invalid.
+
+        Returns:
+            A list of validation errors.
+
+        Raises:
+            ConfigValidationError: If credentials are missing, or if the shard or
+                intraday settings are inconsistent, and errors are raised.
+        """
+        errors = super()._validate_config(raise_errors=raise_errors)
+        if not self.config.get("tenants"):
+            errors.extend(
+                f"{setting} is required unless tenants are set"
+                for setting in ("client_id", "client_secret", "advertiser_ids")
+                if setting not in self.config
+            )
+        names = [tenant.get("name") for tenant in self.config.get("tenants", [])]
+        if len(set(names)) < len(names):
+            errors.append("tenant names must be unique")
+        if self.config.get("shard_index", 0) >= self.config.get("shard_count", 1):
+            errors.append("shard_index must be lower than shard_count")
+        errors.extend(
+            f"intraday report '{report['name']}' must have the Hour dimension"
+            for report in self.config.get("reports", [])
+            if report.get("intraday") and "Hour" not in report.get("dimensions", [])
+        )
+        if errors and raise_errors:
+            msg = "Config validation failed"
+            raise ConfigValidationError(msg, errors=errors)
+        for error in errors:
+            self.logger.warning("Invalid config: %s", error)
+        return errors
+
+    @property
+    def authenticator(self) -> CriteoAuthenticator:
+        """Return the authenticator of the first tenant."""
+        return self.get_authenticator(None)
+
+    def get_tenant(self, name: str | None) -> Tenant:
+        """Return a tenant by name.
+
+        Args:
+            name: Tenant name, or None for the first tenant.
+
+        Returns:
+            The tenant.
+        """
+        if name is None:
+            return self.tenants[0]
+        return next(tenant for tenant in self.tenants if tenant.name == name)
+
+    def get_authenticator(self, tenant_name: str | None) -> CriteoAuthenticator:
+        """Return the authenticator of a tenant, shared by all streams.
+
+        Each tenant's access token is only requested again once it expires.
+
+        Args:
+            tenant_name: Tenant name, or None for the first tenant.
+
+        Returns:
+            The tenant's authenticator.
+        """
+        tenant = self.get_tenant(tenant_name)
+        with self._tenants_lock:
+            if tenant.name not in self._authenticators:
+                authenticator = CriteoAuthenticator(
+                    client_id=tenant.client_id,
+                    client_secret=tenant.client_secret,
+                    auth_endpoint="https://api.criteo.com/oauth2/token",
+                )
+                authenticator.telemetry = self.telemetry
+                if self.config.get("cassette_path"):
+                    # Token requests are recorded and replayed too
+                    authenticator._session.mount(  # noqa: SLF001
+                        "https://",
+                        self.transport_adapter,
+                    )
+                self._authenticators[tenant.name] = authenticator
+            return self._authenticators[tenant.name]
+
+    def get_rate_limiter(self, tenant_name: str | None) -> RateLimiter | None:
+        """Return the limiter of the requests of a tenant, if it has a rate limit.
+
+        Args:
+            tenant_name: Tenant name, or None for the first tenant.
+
+        Returns:
+            The limiter shared by all streams, or None.
+        """
+        tenant = self.get_tenant(tenant_name)
+        if not tenant.max_requests_per_second:
+            return None
+        with self._tenants_lock:
+            if tenant.name not in self._rate_limiters:
+                self._rate_limiters[tenant.name] = RateLimiter(
+                    tenant.max_requests_per_second,
+                )
+            return self._rate_limiters[tenant.name]
+
+    def get_row_hash_store(self, path: str) -> RowHashStore:
+        """Return a store of the hashes of emitted report rows.
+
+        Args:
+            path: Path of the SQLite file.
+
+        Returns:
+            The store shared by all streams, e.g. a report and its intraday stream,
+            so that each file has a single connection.
+        """
+        with self._row_hash_lock:
+            if path not in self._row_hash_stores:
+                self._row_hash_stores[path] = RowHashStore(path)
+            return self._row_hash_stores[path]
+
+    @cached_property
+    def name_index(self) -> NameIndex:
+        """Return the entity names report rows are enriched with."""
+        return NameIndex(
+            self.streams,
+            self.config.get("name_cache_path"),
+            lock=self.sync_lock,
+        )
+
+    @cached_property
+    def hedge_executor(self) -> ThreadPoolExecutor:
+        """Return the threads sending hedged requests and their duplicates.
+
+        A request whose duplicate won keeps its thread until it completes, at worst
+        until it times out. Requests are not hedged while all threads are in use.
+        """
+        return ThreadPoolExecutor(
+            max_workers=2 * self.config.get("max_concurrent_streams", 1),
+            thread_name_prefix="hedge",
+        )
+
+    @cached_property
+    def requests_session(self) -> requests.Session:
+        """Return the HTTP session shared by all streams.
+
+        Its connection pool keeps up to ``max_connections_per_host`` connections
+        open, so that concurrent streams reuse them instead of opening new ones.
+        """
+        session = requests.Session()
+        session.mount("https://", self.transport_adapter)
+        if self.config.get("cassette_path"):
+            session.mount("http://", self.transport_adapter)
+        return session
+
+    @cached_property
+    def transport_adapter(self) -> requests.adapters.BaseAdapter:
+        """Return the transport adapter of the Criteo API requests.
+
+        With a cassette, the adapter records exchanges into it, or replays them.
+        """
+        pool_size = self.config.get("max_connections_per_host", 10)
+        path = self.config.get("cassette_path")
+        if not path:
+            return requests.adapters.HTTPAdapter(
+                pool_maxsize=pool_size,
+                pool_block=True,
+            )
+        if self.config.get("cassette_mode", "record") == "replay":
+            self.logger.info("Replaying HTTP exchanges from %s", path)
+            return ReplayAdapter(path, speed=self.config.get("cassette_speed", 1))
+
+        self.logger.info("Recording HTTP exchanges into %s", path)
+        return RecordingAdapter(
+            CassetteRecorder(
+                path,
+                config=self.config,
+                streams=[
+                    name for name, stream in self.streams.items() if stream.selected
+                ],
+            ),
+            pool_maxsize=pool_size,
+            pool_block=True,
+        )
+
+    def get_sync_streams(
+        self,
+        stream_names: Collection[str] | None = None,
+    ) -> list[Stream]:
+        """Return the selected top-level streams this tap process syncs.
+
+        Args:
+            stream_names: Only return the streams with these names.
+
+        Returns:
+            Streams to sync. Child streams are synced by their parent.
+        """
+        streams = []
+        for stream in self.streams.values():
+            if stream_names is not None and stream.name not in stream_names:
+                continue
+
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+                continue
+
+            if stream.parent_stream_type:
+                continue
+
+            criteo_stream = cast("CriteoStream", stream)
+            if (
+                self.config.get("shard_index", 0)
+                and not criteo_stream.advertiser_scoped
+            ):
+                self.logger.info(
+                    "Skipping stream '%s', which is synced by the first shard.",
+                    stream.name,
+                )
+                continue
+
+            if criteo_stream.advertiser_scoped and not (
+                criteo_stream.get_advertiser_partitions("advertiserId")
+            ):
+                self.logger.info(
+                    "Skipping stream '%s', since this shard has no advertisers.",
+                    stream.name,
+                )
+                continue
+
+            streams.append(stream)
+
+        return streams
+
+    def run_sync(self, stream_names: Collection[str] | None = None) -> None:
+        """Sync all selected streams, possibly several at the same time.
+
+        This is equivalent to :meth:`~singer_sdk.Tap.sync_all`, except that
+        top-level streams run on a pool of ``max_concurrent_streams`` workers,
+        longest first according to the run history. With a sync budget, streams
+        are started by priority, then shortest first, and the streams and partitions
+        left when the budget runs out are deferred to the next run.
+
+        Args:
+            stream_names: Only sync the streams with these names.
+
+        Raises:
+            FatalSyncError: If report partitions failed, once the other partitions
+                are synced.
+        """
+        self.budget.start()
+        for stream in self.streams.values():
+            if hasattr(stream, "failed_partitions"):
+                stream.failed_partitions.clear()
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        if self.state:
+            self.state_writer.write_state(self.state)
+
+        streams = self.get_sync_streams(stream_names)
+        # Metrics are cumulative when the tap runs several syncs, e.g. as a daemon
+        totals_before = {name: self._get_stream_totals(name) for name in self.streams}
+        exporter = TelemetryExporter(
+            self.telemetry,
+            textfile_path=self.config.get("metrics_textfile_path"),
+            push_url=self.config.get("metrics_push_url"),
+            interval=self.config.get("metrics_interval_seconds"),
+        )
+        try:
+            with exporter:
+                sync_streams(
+                    streams,
+                    lock=self.sync_lock,
+                    history=self.history,
+                    max_workers=self.config.get("max_concurrent_streams", 1),
+                    budget=self.budget,
+                    priorities=self.config.get("stream_priorities"),
+                )
+        finally:
+            for name in self.streams:
+                request_count, records, request_seconds = (
+                    after - before
+                    for after, before in zip(
+                        self._get_stream_totals(name),
+                        totals_before[name],
+                        strict=True,
+                    )
+                )
+                stats: dict[str, Any] = {}
+                if request_count:
+                    stats.update(
+                        requests=request_count,
+                        records=records,
+                        request_seconds=request_seconds,
+                    )
+                if request_count or name in self.budget.deferred:
+                    stats["deferred_partitions"] = self.budget.deferred.get(name, [])
+                if stats:
+                    self.history.record(name, **stats)
+                self.history.record_partition_costs(
+                    name,
+                    cast("CriteoStream", self.streams[name]).pop_partition_costs(),
+                )
+            self.history.save()
+            self._report_deferred()
+
+        failed = self._get_failed_partitions()
+        if failed:
+            msg = f"Failed to sync report partitions: {failed}"
+            raise FatalSyncError(msg)
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def _report_deferred(self) -> None:
+        """Log and count the streams and partitions deferred to the next run."""
+        for name, contexts in self.budget.deferred.items():
+            self.telemetry.inc("deferred_partitions", len(contexts), stream=name)
+            self.logger.warning(
+                "Deferred %s of stream '%s' to the next run",
+                "all partitions" if contexts == [None] else contexts,
+                name,
+            )
+
+    def _get_failed_partitions(self) -> dict[str, list[dict]]:
+        """Return the report partitions that failed in the last sync, by stream."""
+        failed = {
+            name: getattr(stream, "failed_partitions", [])
+            for name, stream in self.streams.items()
+        }
+        return {name: contexts for name, contexts in failed.items() if contexts}
+
+    def _get_stream_totals(self, stream_name: str) -> tuple[float, float, float]:
+        """Return the requests, records and request seconds of a stream so far."""
+        return (
+            self.telemetry.total("requests", stream=stream_name),
+            self.telemetry.total("records", stream=stream_name),
+            self.telemetry.total_latency(stream=stream_name),
+        )
+
+    def close(self) -> None:
+        """Stop the report worker processes and hedged request threads, if any.
+
+        A cassette being recorded and the row hash files are closed too.
+        """
+        if "transport_adapter" in vars(self):
+            self.transport_adapter.close()
+        if self.report_executor:
+            self.report_executor.shutdown(cancel_futures=True)
+            self.report_executor = None
+        if "hedge_executor" in vars(self):
+            self.hedge_executor.shutdown(wait=False)
+            del self.hedge_executor
+        with self._row_hash_lock:
+            for store in self._row_hash_stores.values():
+                store.close()
+            self._row_hash_stores.clear()
+
+    @override
+    @classmethod
+    def invoke(  # type: ignore[override]
+        cls,
+        *,
+        about: bool = False,
+        about_format: str | None = None,
+        config: _ConfigInput | None = None,
+        state: IO[str] | None = None,
+        catalog: IO[str] | None = None,
+        shard_index: int | None = None,
+        shard_count: int | None = None,
+        plan: bool = False,
+    ) -> None:
+        """Invoke the tap's command line interface.
+
+        Args:
+            about: Display package metadata and settings.
+            about_format: Specify output style for `--about`.
+            config: Configuration file location or 'ENV' to use environment
+                variables. Accepts multiple inputs as a tuple.
+            catalog: Use a Singer catalog file with the tap.
+            state: Use a bookmarks file for incremental replication.
+            shard_index: Override the `shard_index` setting.
+            shard_count: Override the `shard_count` setting.
+            plan: Print the requests a sync would issue, with cost estimates,
+                instead of syncing.
+        """
+        super(Tap, cls).invoke(about=about, about_format=about_format)
+        cls.print_version(print_fn=cls.logger.info)
+        config = config or _ConfigInput()
+
+        overrides = {"shard_index": shard_index, "shard_count": shard_count}
+        tap = cls(
+            config={
+                **config.config,
+                **{key: value for key, value in overrides.items() if value is not None},
+            },
+            state=None if state is None else load_json(state.read()),
+            catalog=None if catalog is None else load_json(catalog.read()),
+            parse_env_config=config.parse_env,
+            validate_config=True,
+        )
+        if plan:
+            from tap_criteo.planner import plan_sync  # noqa: PLC0415
+
+            click.echo(json.dumps(plan_sync(tap), indent=2))
+            return
+
+        try:
+            tap.run_sync()
+        finally:
+            tap.close()
+
+    @override
+    @classmethod
+    def get_singer_command(cls) -> click.Command:
+        """Add sharding and planning options to the tap's command line interface.
+
+        Returns:
+            A click.Command object.
+        """
+        command = super().get_singer_command()
+        command.params.extend(
+            [
+                click.Option(
+                    ["--shard-index"],
+                    type=click.IntRange(min=0),
+                    help="Index of this tap process among the shards.",
+                ),
+                click.Option(
+                    ["--shard-count"],
+                    type=click.IntRange(min=1),
+                    help="Number of shards the advertisers are split across.",
+                ),
+                click.Option(
+                    ["--plan"],
+                    is_flag=True,
+                    help=(
+                        "Print the requests a sync would issue and their estimated "
+                        "cost, without sending any."
+                    ),
+                ),
+            ],
+        )
+        return command
+
+    @override
+    def run_discovery(self) -> str:
+        """Write the catalog JSON to STDOUT and to the catalog cache, if enabled.
+
+        Returns:
+            The catalog as a string of JSON.
+        """
+        catalog_text = super().run_discovery()
+        if cache_path := self.config.get("catalog_cache_path"):
+            CatalogCache(cache_path).save(
+                get_catalog_key(self.config),
+                json.loads(catalog_text),
+            )
+        return catalog_text
+
     @override
     def discover_streams(self) -> Sequence[Stream]:
         """Return a list of discovered streams."""
         objects = [
-            stream_class(tap=self)
+            load_stream_class(path)(tap=self)
             for api in ("current",)
-            for stream_class in OBJECT_STREAMS[api]
+            for path in OBJECT_STREAMS[api]
         ]
 
+        report_class = cast(
+            "type[StatsReportStream]",
+            load_stream_class(REPORTS_BASE),
+        )
         reports = [
-            REPORTS_BASE(tap=self, report=report) for report in self.config["reports"]
+            report_class(tap=self, report=report) for report in self.config["reports"]
         ]
+        intraday_class = cast(
+            "type[StatsReportStream]",
+            load_stream_class(INTRADAY_REPORTS_BASE),
+        )
+        reports.extend(
+            intraday_class(tap=self, report=report)
+            for report in self.config["reports"]
+            if report.get("intraday")
+        )
 
         return objects + reports
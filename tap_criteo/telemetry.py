@@ -0,0 +1,252 @@
+"""Request and throughput metrics, exported in the Prometheus text format."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+import requests  # type: ignore[import-untyped]
+
+from tap_criteo.files import write_text_atomic
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+PREFIX = "tap_criteo"
+
+#: Upper bounds of the request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+COUNTERS = {
+    "requests": "HTTP requests sent, by response status.",
+    "response_bytes": "Bytes received in HTTP response bodies.",
+    "records": "Records written.",
+    "retries": "HTTP requests retried after a failure.",
+    "rate_limited": "HTTP requests rejected with a 429 status.",
+    "token_refreshes": "OAuth access tokens requested.",
+    "validated_records": "Records validated against their stream schema.",
+    "validation_seconds": "Time spent validating records.",
+    "invalid_records": "Records that failed validation.",
+    "deferred_partitions": "Streams and partitions deferred to the next run.",
+    "failed_partitions": "Report partitions that failed once their retries ran out.",
+    "hedged_requests": "HTTP requests sent again because they were slower than usual.",
+    "hedge_wins": "Hedged HTTP requests whose duplicate responded first.",
+    "circuit_trips": "Times the circuit breaker of an endpoint opened.",
+    "circuit_rejections": "HTTP requests not sent because their circuit was open.",
+    "rate_limit_wait_seconds": "Time spent waiting for the rate limit of a tenant.",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+logger = logging.getLogger(__name__)
+
+
+def _format_labels(labels: Labels, **extra: str) -> str:
+    """Format metric labels, e.g. ``{stream="ads",endpoint="/ads"}``."""
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Telemetry:
+    """Thread-safe counters and histograms for a tap run."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = defaultdict(
+            lambda: defaultdict(float),
+        )
+        self._latencies: dict[Labels, list[int]] = {}
+        self._latency_sums: dict[Labels, float] = defaultdict(float)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increment a counter.
+
+        Args:
+            name: Counter name, one of :data:`COUNTERS`.
+            value: Amount to add.
+            labels: Metric labels, e.g. ``stream`` and ``endpoint``.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._counters[name][key] += value
+
+    def total(self, name: str, **labels: str) -> float:
+        """Return the sum of a counter over the samples matching the labels.
+
+        Args:
+            name: Counter name, one of :data:`COUNTERS`.
+            labels: Labels the samples must have, e.g. ``stream``.
+
+        Returns:
+            The counter total.
+        """
+        with self._lock:
+            return sum(
+                value
+                for key, value in self._counters[name].items()
+                if labels.items() <= dict(key).items()
+            )
+
+    def total_latency(self, **labels: str) -> float:
+        """Return the time spent on HTTP requests matching the labels.
+
+        Args:
+            labels: Labels the requests must have, e.g. ``stream``.
+
+        Returns:
+            The total request duration, in seconds.
+        """
+        with self._lock:
+            return sum(
+                value
+                for key, value in self._latency_sums.items()
+                if labels.items() <= dict(key).items()
+            )
+
+    def observe_latency(self, seconds: float, **labels: str) -> None:
+        """Record the duration of an HTTP request.
+
+        Args:
+            seconds: Request duration.
+            labels: Metric labels, e.g. ``stream`` and ``endpoint``.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            buckets = self._latencies.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 1))
+            buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self._latency_sums[key] += seconds
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            The metrics, one sample per line.
+        """
+        lines = []
+        with self._lock:
+            for name, description in COUNTERS.items():
+                metric = f"{PREFIX}_{name}_total"
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(
+                    f"{metric}{_format_labels(labels)} {value:g}"
+                    for labels, value in sorted(self._counters[name].items())
+                )
+
+            metric = f"{PREFIX}_request_duration_seconds"
+            lines.append(f"# HELP {metric} HTTP request duration.")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, buckets in sorted(self._latencies.items()):
+                count = 0
+                for bound, bucket in zip(
+                    (*(f"{b:g}" for b in LATENCY_BUCKETS), "+Inf"),
+                    buckets,
+                    strict=True,
+                ):
+                    count += bucket
+                    le = _format_labels(labels, le=bound)
+                    lines.append(f"{metric}_bucket{le} {count}")
+                lines.append(
+                    f"{metric}_sum{_format_labels(labels)} "
+                    f"{self._latency_sums[labels]:g}",
+                )
+                lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str | Path) -> None:
+        """Write the metrics to a file for the node exporter textfile collector.
+
+        Args:
+            path: Path of the ``.prom`` file, replaced atomically.
+        """
+        write_text_atomic(path, self.render())
+
+    def push(self, url: str) -> None:
+        """Push the metrics to an HTTP endpoint, such as a Prometheus Pushgateway.
+
+        Args:
+            url: Endpoint URL, e.g.
+                ``http://localhost:9091/metrics/job/tap-criteo``.
+        """
+        response = requests.put(url, data=self.render().encode(), timeout=10)
+        response.raise_for_status()
+
+
+class TelemetryExporter:
+    """Export metrics at the end of a run and, optionally, during it."""
+
+    def __init__(
+        self,
+        telemetry: Telemetry,
+        *,
+        textfile_path: str | None = None,
+        push_url: str | None = None,
+        interval: float | None = None,
+    ) -> None:
+        """Initialize the exporter.
+
+        Args:
+            telemetry: Metrics to export.
+            textfile_path: File the metrics are written to.
+            push_url: Endpoint the metrics are pushed to.
+            interval: Seconds between exports during the run. By default metrics
+                are only exported when the run ends.
+        """
+        self.telemetry = telemetry
+        self.textfile_path = textfile_path
+        self.push_url = push_url
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def export(self) -> None:
+        """Export the metrics to the configured destinations.
+
+        Export failures are logged rather than raised, so that they never fail a
+        sync.
+        """
+        try:
+            if self.textfile_path:
+                self.telemetry.write_textfile(self.textfile_path)
+            if self.push_url:
+                self.telemetry.push(self.push_url)
+        except OSError:
+            logger.exception("Failed to export metrics")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.export()
+
+    def __enter__(self) -> None:
+        """Start exporting metrics at intervals, if configured."""
+        if self.interval and (self.textfile_path or self.push_url):
+            self._thread = threading.Thread(
+                target=self._run,
+                name="telemetry",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the periodic exports and export the final metrics."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        self.export()
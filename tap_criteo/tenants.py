@@ -0,0 +1,163 @@
+"""Criteo API apps, or tenants, synced by a single tap process."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from singer_sdk import StreamSchema
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from singer_sdk import Stream
+
+#: Key of the tenant name in partitions, state and records
+TENANT_KEY = "tenant"
+
+
+class Tenant:
+    """Criteo API app, with its credentials and advertisers."""
+
+    def __init__(
+        self,
+        *,
+        name: str | None,
+        client_id: str,
+        client_secret: str,
+        advertiser_ids: list[str],
+        max_requests_per_second: float | None = None,
+    ) -> None:
+        """Initialize a tenant.
+
+        Args:
+            name: Name records and state are tagged with, or None for the single
+                tenant of a tap configured without ``tenants``.
+            client_id: OAuth client ID of the app.
+            client_secret: OAuth client secret of the app.
+            advertiser_ids: Advertisers synced for the app.
+            max_requests_per_second: Rate limit of the app's requests.
+        """
+        self.name = name
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.advertiser_ids = advertiser_ids
+        self.max_requests_per_second = max_requests_per_second
+
+    @property
+    def tag(self) -> dict[str, str]:
+        """Return the partition keys identifying the tenant, if it has a name."""
+        return {TENANT_KEY: self.name} if self.name else {}
+
+
+def get_tenants(config: Mapping[str, Any]) -> list[Tenant]:
+    """Return the tenants of a tap configuration.
+
+    Without ``tenants``, the top-level credentials and advertisers make up a single
+    unnamed tenant, so records and state are not tagged.
+
+    Args:
+        config: Tap configuration.
+
+    Returns:
+        The tenants, in their configured order.
+    """
+    if not config.get("tenants"):
+        return [
+            Tenant(
+                name=None,
+                client_id=config.get("client_id", ""),
+                client_secret=config.get("client_secret", ""),
+                advertiser_ids=config.get("advertiser_ids", []),
+            ),
+        ]
+
+    return [
+        Tenant(
+            name=tenant["name"],
+            client_id=tenant["client_id"],
+            client_secret=tenant["client_secret"],
+            advertiser_ids=tenant.get("advertiser_ids", []),
+            max_requests_per_second=tenant.get("max_requests_per_second"),
+        )
+        for tenant in config["tenants"]
+    ]
+
+
+def add_tenant_property(schema: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a stream schema with the tenant property.
+
+    Args:
+        schema: Stream schema, left unchanged.
+
+    Returns:
+        The schema, with a ``tenant`` string property.
+    """
+    return {
+        **schema,
+        "properties": {**schema["properties"], TENANT_KEY: {"type": "string"}},
+    }
+
+
+class TenantStreamSchema(StreamSchema):
+    """Stream schema descriptor adding the tenant property when tenants are set.
+
+    The schema source caches the schemas it loads, so they are copied rather than
+    updated.
+    """
+
+    @override
+    def get_stream_schema(
+        self,
+        stream: Stream,
+        stream_class: type[Stream],
+    ) -> dict[str, Any]:
+        """Return the stream schema, with the tenant property in multi-tenant mode.
+
+        Args:
+            stream: The stream instance to get the schema from.
+            stream_class: The stream class to get the schema from.
+
+        Returns:
+            A JSON schema dictionary.
+        """
+        schema = super().get_stream_schema(stream, stream_class)
+        # The stream is None when the schema is read from the stream class
+        if stream is None or not stream.config.get("tenants"):
+            return schema
+        return add_tenant_property(schema)
+
+
+class RateLimiter:
+    """Thread-safe limit on the rate of requests, spacing them evenly."""
+
+    def __init__(self, per_second: float) -> None:
+        """Initialize the limiter.
+
+        Args:
+            per_second: Maximum number of requests per second.
+        """
+        self.interval = 1 / per_second
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Wait until a request can be sent.
+
+        Returns:
+            The time waited, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._next - now, 0)
+            self._next = max(self._next, now) + self.interval
+        if wait:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,77 @@
+"""Optional validation of records against their stream schema."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from singer_sdk.exceptions import InvalidRecord
+from singer_sdk.sinks.core import JSONSchemaValidator
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+#: Which records are validated: none of them, all of them, one in every
+#: ``validation_sample_interval`` records, or those of the first page of each
+#: partition
+VALIDATION_MODES = ("none", "all", "sample", "first_page")
+
+
+class RecordValidator:
+    """Validator of the records of a stream.
+
+    The schema is checked and the validator is built once, when the validator is
+    created, rather than for each record.
+    """
+
+    def __init__(
+        self,
+        schema: Mapping[str, Any],
+        *,
+        mode: str = "all",
+        sample_interval: int = 100,
+    ) -> None:
+        """Build the validator.
+
+        Args:
+            schema: Stream schema.
+            mode: One of :data:`VALIDATION_MODES`.
+            sample_interval: In ``sample`` mode, validate one in this many records.
+        """
+        self.mode = mode
+        self.sample_interval = max(sample_interval, 1)
+        self._validator = JSONSchemaValidator(dict(schema))
+        self._seen = 0
+
+    def selects(self, *, first_page: bool) -> bool:
+        """Check whether the next record must be validated.
+
+        Args:
+            first_page: Whether the record comes from the first page of its
+                partition.
+
+        Returns:
+            True if the record must be validated.
+        """
+        if self.mode == "all":
+            return True
+        if self.mode == "first_page":
+            return first_page
+        if self.mode == "sample":
+            self._seen += 1
+            return (self._seen - 1) % self.sample_interval == 0
+        return False
+
+    def validate(self, record: dict[str, Any]) -> str | None:
+        """Validate a record.
+
+        Args:
+            record: Record data.
+
+        Returns:
+            The validation error, or None if the record is valid.
+        """
+        try:
+            self._validator.validate(record)
+        except InvalidRecord as e:
+            return e.error_message
+        return None
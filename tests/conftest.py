@@ -1 +1,43 @@
 """Pytest configuration for tests in this directory."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+import requests  # type: ignore[import-untyped]
+from singer_sdk.authenticators import OAuthAuthenticator
+from singer_sdk.helpers._util import utc_now
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@pytest.fixture
+def offline_auth(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Issue a fake access token instead of calling the OAuth endpoint."""
+
+    def update_access_token(self: OAuthAuthenticator) -> None:
+        self.access_token = "token"  # noqa: S105
+        self.expires_in = 3600
+        self.last_refreshed = utc_now()
+
+    monkeypatch.setattr(
+        OAuthAuthenticator,
+        "update_access_token",
+        update_access_token,
+    )
+
+
+@pytest.fixture
+def report_response() -> Callable[[list[dict]], requests.Response]:
+    """Return a builder of statistics report responses."""
+
+    def build(rows: list[dict]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"Rows": rows}).encode()  # noqa: SLF001
+        return response
+
+    return build
@@ -0,0 +1,277 @@
+"""Local stand-in for the Criteo API, injecting faults into its responses."""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+#: Days of report data served for each advertiser
+REPORT_DAYS = [date(2025, 6, 1) + timedelta(days=i) for i in range(60)]
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Degraded API conditions.
+
+    Every ``fault_every`` requests, the next ``burst`` requests fail with ``fault``.
+    Bursts are shorter than the tap's retry attempts, so that every request
+    eventually succeeds.
+    """
+
+    name: str
+    #: Median and spread of the lognormal response latency, in seconds
+    latency_median: float = 0.001
+    latency_sigma: float = 0.0
+    #: One of ``throttle``, ``server_error``, ``reset`` or ``truncate``
+    fault: str | None = None
+    fault_every: int = 0
+    burst: int = 1
+    #: Retry-After header value of throttled responses, in seconds
+    retry_after: int = 1
+
+
+PROFILES = [
+    FaultProfile("healthy"),
+    FaultProfile("slow", latency_median=0.005, latency_sigma=1.0),
+    FaultProfile("throttled", fault="throttle", fault_every=4, burst=2),
+    FaultProfile("server_errors", fault="server_error", fault_every=5, burst=3),
+    FaultProfile("connection_resets", fault="reset", fault_every=6),
+    FaultProfile("truncated_bodies", fault="truncate", fault_every=3),
+]
+
+
+@dataclass
+class ServerStats:
+    """Requests served and faults injected by the server."""
+
+    requests: int = 0
+    faults: dict[str, int] = field(default_factory=dict)
+
+
+class CriteoServer(ThreadingHTTPServer):
+    """Criteo API stand-in, serving deterministic data on a local port.
+
+    It serves advertisers, paginated ads and creatives, and report rows.
+    """
+
+    daemon_threads = True
+
+    def __init__(  # noqa: PLR0913
+        self,
+        profile: FaultProfile,
+        *,
+        advertiser_ids: list[str],
+        ads: int = 120,
+        creatives: int = 70,
+        seed: int = 0,
+        integer_ids: bool = False,
+    ) -> None:
+        """Start listening on a free local port.
+
+        Args:
+            profile: Faults to inject.
+            advertiser_ids: Advertisers of the account.
+            ads: Number of ads of each advertiser.
+            creatives: Number of creatives of each advertiser.
+            seed: Seed of the latency distribution.
+            integer_ids: Serve advertiser IDs as JSON numbers instead of strings.
+        """
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.profile = profile
+        self.advertiser_ids = advertiser_ids
+        self.ads = ads
+        self.creatives = creatives
+        self.integer_ids = integer_ids
+        self.stats = ServerStats()
+        self._rng = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._burst_left = 0
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self.shutdown()
+        self.server_close()
+
+    def next_fault(self) -> tuple[str | None, float]:
+        """Count a request and draw its fault and latency."""
+        profile = self.profile
+        with self._lock:
+            self.stats.requests += 1
+            if (
+                self._burst_left == 0
+                and profile.fault_every
+                and self.stats.requests % profile.fault_every == 0
+            ):
+                self._burst_left = profile.burst
+
+            fault = None
+            if profile.fault and self._burst_left:
+                self._burst_left -= 1
+                fault = profile.fault
+                self.stats.faults[fault] = self.stats.faults.get(fault, 0) + 1
+
+            latency = 0.0
+            if profile.latency_median:
+                latency = self._rng.lognormvariate(
+                    math.log(profile.latency_median),
+                    profile.latency_sigma,
+                )
+        return fault, latency
+
+    def expected_report_rows(self, advertiser_id: str) -> list[dict[str, Any]]:
+        """Return the report rows of an advertiser, one per day."""
+        return [
+            {
+                "AdvertiserId": advertiser_id,
+                "Day": day.isoformat(),
+                "Clicks": str(day.toordinal() % 97 + int(advertiser_id)),
+            }
+            for day in REPORT_DAYS
+        ]
+
+    def expected_entities(self, kind: str, advertiser_id: str) -> list[dict]:
+        """Return the ads or creatives of an advertiser."""
+        count = self.ads if kind == "ads" else self.creatives
+        return [
+            {
+                "id": f"{advertiser_id}-{i}",
+                "type": kind.title().rstrip("s"),
+                "attributes": {
+                    "advertiserId": advertiser_id,
+                    "name": f"{kind} {i}",
+                },
+            }
+            for i in range(count)
+        ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: CriteoServer
+
+    def log_message(self, *args: Any) -> None:  # noqa: ANN401
+        """Keep test output quiet."""
+
+    def do_GET(self) -> None:
+        self._handle(None)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self._handle(json.loads(self.rfile.read(length) or b"{}"))
+
+    def _handle(self, payload: dict | None) -> None:
+        fault, latency = self.server.next_fault()
+        time.sleep(latency)
+        if fault == "reset":
+            # Close the connection abruptly, without a response
+            self.connection.setsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_LINGER,
+                struct.pack("ii", 1, 0),
+            )
+            self.close_connection = True
+            return
+        if fault == "throttle":
+            self._send(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                {"errors": [{"title": "Too many requests"}]},
+                headers={"Retry-After": str(self.server.profile.retry_after)},
+            )
+            return
+        if fault == "server_error":
+            self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"errors": [{"title": "Service unavailable"}]},
+            )
+            return
+
+        body = self._route(payload)
+        if body is None:
+            self._send(HTTPStatus.NOT_FOUND, {"errors": [{"title": "Not found"}]})
+            return
+        self._send(HTTPStatus.OK, body, truncate=fault == "truncate")
+
+    def _route(self, payload: dict | None) -> dict | None:
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts == ["2026-01", "advertisers", "me"]:
+            return {
+                "data": [
+                    {
+                        "id": (
+                            int(advertiser_id)
+                            if self.server.integer_ids
+                            else advertiser_id
+                        ),
+                        "type": "Advertiser",
+                        "attributes": {"advertiserName": f"Advertiser {advertiser_id}"},
+                    }
+                    for advertiser_id in self.server.advertiser_ids
+                ],
+            }
+        if parts == ["2026-01", "statistics", "report"] and payload:
+            start = datetime.fromisoformat(payload["startDate"]).date()
+            end = datetime.fromisoformat(payload["endDate"]).date()
+            rows = [
+                row
+                for advertiser_id in payload["advertiserIds"].split(",")
+                for row in self.server.expected_report_rows(advertiser_id)
+                if start <= date.fromisoformat(row["Day"]) <= end
+            ]
+            return {"Rows": rows}
+        if (
+            len(parts) == 5  # noqa: PLR2004
+            and parts[:3] == ["2026-01", "marketing-solutions", "advertisers"]
+            and parts[4] in {"ads", "creatives"}
+        ):
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["50"])[0])
+            entities = self.server.expected_entities(parts[4], parts[3])
+            return {"data": entities[offset : offset + limit]}
+        return None
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: dict,
+        *,
+        headers: dict[str, str] | None = None,
+        truncate: bool = False,
+    ) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        # A truncated body is cut short of its announced length
+        self.wfile.write(content[: len(content) // 2] if truncate else content)
+        if truncate:
+            self.close_connection = True
@@ -0,0 +1,82 @@
+"""Tests for the incremental audiences stream."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+import requests  # type: ignore[import-untyped]
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from tap_criteo.streams.v202601 import AudiencesStream
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1", "2"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [],
+}
+
+STATE = {
+    "bookmarks": {
+        "audiences": {
+            "partitions": [
+                {
+                    "context": {"advertiserId": "1"},
+                    "replication_key": "updatedAt",
+                    "replication_key_value": "2025-06-10T00:00:00Z",
+                },
+            ],
+        },
+    },
+}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_audiences_are_filtered_on_advertiser_bookmarks(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Audiences updated before their advertiser's bookmark are dropped."""
+    tap = TapCriteo(config=CONFIG, state=STATE)
+    stream = cast("AudiencesStream", tap.streams["audiences"])
+    payloads = []
+
+    def request_audiences(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        payload = json.loads(prepared_request.body or "{}")
+        payloads.append(payload)
+        advertiser_id = payload["data"]["attributes"]["advertiserIds"][0]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(  # noqa: SLF001
+            {
+                "data": [
+                    {
+                        "id": f"{advertiser_id}-{day}",
+                        "type": "Audience",
+                        "attributes": {"updatedAt": f"2025-06-{day}T00:00:00Z"},
+                    }
+                    for day in ("01", "10", "20")
+                ],
+            },
+        ).encode()
+        return response
+
+    monkeypatch.setattr(stream, "_request", request_audiences)
+    ids = [
+        record["id"]
+        for partition in stream.partitions or []
+        for record in stream.get_records(partition)
+    ]
+
+    assert [p["data"]["attributes"]["advertiserIds"] for p in payloads] == [
+        ["1"],
+        ["2"],
+    ]
+    assert ids == ["1-10", "1-20", "2-01", "2-10", "2-20"]
@@ -0,0 +1,131 @@
+"""Tests for the sync time budget."""
+
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from tap_criteo.history import RunHistory
+from tap_criteo.scheduling import schedule_streams
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import requests  # type: ignore[import-untyped]
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1", "2"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]},
+        {"name": "displays", "dimensions": ["Day"], "metrics": ["Displays"]},
+    ],
+    "sync_budget_seconds": 60,
+}
+
+
+def test_priorities_then_shortest_first(tmp_path: Path):
+    """Higher priorities start first, then the shortest streams."""
+    history = RunHistory(tmp_path / "history.json")
+    history.record("clicks", duration=5.0)
+    history.record("displays", duration=1.0)
+
+    tap = TapCriteo(config=CONFIG)
+    reports = [tap.streams[name] for name in ("clicks", "displays", "audiences")]
+    ordered = schedule_streams(
+        reports,
+        history,
+        priorities={"audiences": 1},
+        shortest_first=True,
+    )
+
+    assert [stream.name for stream in ordered] == ["audiences", "displays", "clicks"]
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_partitions_are_deferred_when_the_budget_runs_out(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Partitions left when the budget runs out are synced first by the next run."""
+    config = {**CONFIG, "history_path": str(tmp_path / "history.json")}
+    tap = TapCriteo(config=config)
+    stream = tap.streams["clicks"]
+    for name in tap.streams:
+        tap.streams[name].selected = name == "clicks"
+
+    def request(*_: Any) -> requests.Response:  # noqa: ANN401
+        # The budget runs out during the first request
+        monkeypatch.setattr(tap.budget, "_deadline", 0.0)
+        return report_response([{"Day": "2025-06-02", "Clicks": "1"}])
+
+    monkeypatch.setattr(stream, "_request", request)
+    tap.run_sync()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    assert [record["AdvertiserId"] for record in records] == ["1"]
+    assert tap.telemetry.total("deferred_partitions", stream="clicks") == 1
+
+    history = RunHistory(tmp_path / "history.json")
+    assert history.streams["clicks"]["deferred_partitions"] == [{"AdvertiserId": "2"}]
+
+    next_tap = TapCriteo(config=config)
+    assert next_tap.streams["clicks"].partitions == [
+        {"AdvertiserId": "2"},
+        {"AdvertiserId": "1"},
+    ]
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_partitions_are_ordered_by_cost(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """The cheapest partitions are synced first, costs counted across threads."""
+    config = {
+        **CONFIG,
+        "advertiser_ids": ["1", "2", "3"],
+        "history_path": str(tmp_path / "history.json"),
+        "prefetch_partitions": 2,
+    }
+    tap = TapCriteo(config=config)
+    stream = tap.streams["clicks"]
+    for name in tap.streams:
+        tap.streams[name].selected = name == "clicks"
+    seconds = {"1": 5, "2": 1, "3": 3}
+    requests_sent = []
+
+    def request(_: Any, context: dict) -> requests.Response:  # noqa: ANN401
+        requests_sent.append(context)
+        response = report_response([])
+        response.elapsed = timedelta(seconds=seconds[context["AdvertiserId"]])
+        return response
+
+    monkeypatch.setattr(stream, "_request", request)
+    tap.run_sync()
+
+    assert stream._sync_costs["requests"] == len(requests_sent)  # noqa: SLF001
+    costs = RunHistory(tmp_path / "history.json").streams["clicks"]
+    windows = len(requests_sent) // len(seconds)
+    assert costs["partition_seconds"] == {
+        json.dumps({"AdvertiserId": advertiser_id}): cost * windows
+        for advertiser_id, cost in seconds.items()
+    }
+
+    next_tap = TapCriteo(config=config)
+    assert next_tap.streams["clicks"].partitions == [
+        {"AdvertiserId": "2"},
+        {"AdvertiserId": "3"},
+        {"AdvertiserId": "1"},
+    ]
@@ -0,0 +1,133 @@
+"""Tests for recording and replaying cassettes of HTTP exchanges."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from criteo_server import PROFILES, CriteoServer
+
+from tap_criteo.cassettes import Scrubber
+from tap_criteo.client import CriteoStream
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+ADVERTISER_IDS = ["4242", "5353"]
+SYNCED_STREAMS = {"advertisers", "ads", "daily_clicks"}
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {
+            "name": "daily_clicks",
+            "dimensions": ["Day"],
+            "metrics": ["Clicks"],
+            "window_days": 30,
+        },
+    ],
+}
+
+
+def sync(config: dict[str, Any], capsys: pytest.CaptureFixture[str]) -> dict[str, int]:
+    """Sync the tested streams, and return their record counts."""
+    tap = TapCriteo(config=config)
+    for name, stream in tap.streams.items():
+        stream.selected = name in SYNCED_STREAMS
+    try:
+        tap.run_sync()
+    finally:
+        tap.close()
+
+    counts: dict[str, int] = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            counts[message["stream"]] = counts.get(message["stream"], 0) + 1
+    return counts
+
+
+def test_scrubber():
+    """IDs get consistent pseudonyms, and names and tokens are hidden."""
+    scrubber = Scrubber()
+    document = scrubber.scrub(
+        {
+            "access_token": "secret",
+            "Rows": [{"AdvertiserId": "4242", "Advertiser": "Acme", "Clicks": "3"}],
+            "advertiserIds": "4242,17",
+            "dimensions": ["Day"],
+        },
+    )
+
+    assert document == {
+        "access_token": "scrubbed",
+        "Rows": [{"AdvertiserId": "1001", "Advertiser": "xxxx", "Clicks": "3"}],
+        "advertiserIds": "1001,12",
+        "dimensions": ["Day"],
+    }
+    assert scrubber.scrub_url("https://api/advertisers/4242/ads?offset=50") == (
+        "/advertisers/1001/ads?offset=50"
+    )
+    assert scrubber.scrub({"id": 4242}) == {"id": 1001}
+
+
+@pytest.mark.usefixtures("offline_auth")
+@pytest.mark.parametrize("integer_ids", [False, True], ids=["strings", "integers"])
+def test_record_and_replay(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+    integer_ids: bool,  # noqa: FBT001
+):
+    """A replayed cassette syncs the same records, without the original IDs."""
+    cassette = tmp_path / "sync.jsonl.gz"
+    server = CriteoServer(
+        PROFILES[0],
+        advertiser_ids=ADVERTISER_IDS,
+        integer_ids=integer_ids,
+    )
+    server.start()
+    monkeypatch.setattr(CriteoStream, "url_base", server.url)
+    try:
+        recorded = sync(
+            {
+                **CONFIG,
+                "advertiser_ids": ADVERTISER_IDS,
+                "cassette_path": str(cassette),
+            },
+            capsys,
+        )
+    finally:
+        server.stop()
+
+    text = gzip.decompress(cassette.read_bytes()).decode()
+    for advertiser_id in ADVERTISER_IDS:
+        # Report metrics may contain the same digits
+        for leak in (
+            f"/{advertiser_id}/",
+            f'Id": "{advertiser_id}',
+            f'"id": {advertiser_id}',
+            f'"{advertiser_id}-',
+        ):
+            assert leak not in text
+    header = json.loads(text.splitlines()[0])
+    assert header["advertiser_ids"] == ["1001", "1002"]
+    assert set(header["streams"]) == SYNCED_STREAMS
+
+    replayed = sync(
+        {
+            **CONFIG,
+            "advertiser_ids": header["advertiser_ids"],
+            "cassette_path": str(cassette),
+            "cassette_mode": "replay",
+            "cassette_speed": 0,
+        },
+        capsys,
+    )
+    assert replayed == recorded
+    assert recorded.keys() == SYNCED_STREAMS
@@ -0,0 +1,102 @@
+"""Tests for the discovered catalog cache."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {"name": "clicks", "dimensions": ["Campaign", "Day"], "metrics": ["Clicks"]},
+    ],
+}
+
+MAIN = "from tap_criteo.cli import main; main()"
+
+WITHOUT_SDK = """
+import sys
+from tap_criteo.cli import main
+main()
+assert "singer_sdk" not in sys.modules
+"""
+
+
+def test_discovery_is_served_from_cache(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+):
+    """A second discovery prints the cached catalog without loading the SDK."""
+    config = {**CONFIG, "catalog_cache_path": str(tmp_path / "catalog.json")}
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+
+    TapCriteo(config=config, setup_mapper=False).run_discovery()
+    discovered = json.loads(capsys.readouterr().out)
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", WITHOUT_SDK, "--config", str(config_path), "--discover"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert json.loads(result.stdout) == discovered
+
+    config_path.write_text(json.dumps({**config, "reports": []}))
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", MAIN, "--config", str(config_path), "--discover"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    streams = [entry["tap_stream_id"] for entry in json.loads(result.stdout)["streams"]]
+    assert "clicks" not in streams
+
+
+def test_version_is_printed_without_the_sdk(capsys: pytest.CaptureFixture[str]):
+    """The version is printed as the SDK would, without loading it."""
+    TapCriteo.print_version()
+    expected = capsys.readouterr().out
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", WITHOUT_SDK, "--version"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert result.stdout == expected
+
+
+def test_about_is_printed_without_the_sdk_once_cached(tmp_path: Path):
+    """The --about output is cached by its first run, and printed without the SDK."""
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path)}
+    args = ["--about", "--format", "json"]
+    first = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", MAIN, *args],
+        capture_output=True,
+        check=True,
+        text=True,
+        env=env,
+    )
+    cached = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", WITHOUT_SDK, *args],
+        capture_output=True,
+        check=True,
+        text=True,
+        env=env,
+    )
+    assert cached.stdout == first.stdout
+    assert json.loads(cached.stdout)["name"] == "tap-criteo"
@@ -0,0 +1,68 @@
+"""Tests for the base Criteo stream."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+from singer_sdk.helpers._util import utc_now
+
+from tap_criteo.auth import CriteoAuthenticator
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import pytest
+    import requests  # type: ignore[import-untyped]
+
+    from tap_criteo.client import CriteoStream
+
+MAX_CONNECTIONS = 4
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]},
+        {"name": "displays", "dimensions": ["Day"], "metrics": ["Displays"]},
+    ],
+}
+
+
+def test_streams_share_token_and_connections(
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """A single access token and connection pool serve every stream."""
+    token_requests = []
+
+    def update_access_token(self: CriteoAuthenticator) -> None:
+        token_requests.append(self)
+        self.access_token = "token"  # noqa: S105
+        self.expires_in = 3600
+        self.last_refreshed = utc_now()
+
+    monkeypatch.setattr(
+        CriteoAuthenticator,
+        "update_access_token",
+        update_access_token,
+    )
+
+    tap = TapCriteo(config={**CONFIG, "max_connections_per_host": MAX_CONNECTIONS})
+    reports = [
+        cast("CriteoStream", tap.streams[name]) for name in ("clicks", "displays")
+    ]
+    for stream in reports:
+        monkeypatch.setattr(
+            stream,
+            "_request",
+            lambda *_: report_response([{"Day": "2025-06-02", "Clicks": "1"}]),
+        )
+        stream.sync()
+
+    assert len(token_requests) == 1
+    assert reports[0].requests_session is reports[1].requests_session
+    adapter = tap.requests_session.get_adapter("https://api.criteo.com")
+    assert adapter._pool_maxsize == MAX_CONNECTIONS  # noqa: SLF001
@@ -0,0 +1,83 @@
+"""Tests for the daemon mode."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_criteo.daemon import SyncDaemon
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import requests  # type: ignore[import-untyped]
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [{"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]}],
+}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_syncs_reuse_the_tap(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Syncs share a token and get their own output, and the state carries over."""
+    tap = TapCriteo(config=CONFIG)
+
+    def send(*_: Any, **__: Any) -> requests.Response:  # noqa: ANN401
+        return report_response([{"Day": "2025-06-02", "Clicks": "1"}])
+
+    monkeypatch.setattr(tap.requests_session, "send", send)
+    state_path = tmp_path / "state.json"
+    daemon = SyncDaemon(tap, output_dir=tmp_path, keep=2, state_path=state_path)
+    for _ in range(3):
+        daemon.run_once()
+
+    outputs = sorted(tmp_path.glob("run-*.singer.jsonl"))
+    assert len(outputs) == 2  # noqa: PLR2004
+    for output in outputs:
+        messages = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [m["stream"] for m in messages if m["type"] == "RECORD"] == ["clicks"]
+
+    state = json.loads(state_path.read_text())
+    clicks = state["bookmarks"]["clicks"]["partitions"][0]
+    assert clicks["replication_key_value"] == "2025-06-02"
+    assert tap.telemetry.total("token_refreshes") == 1
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_failed_syncs_publish_nothing(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """A failed sync leaves no output and the next one emits its records again."""
+    tap = TapCriteo(config=CONFIG)
+    unauthorized = report_response([])
+    unauthorized.status_code = 401
+    responses = [unauthorized, report_response([{"Day": "2025-06-02", "Clicks": "1"}])]
+    monkeypatch.setattr(tap.requests_session, "send", lambda *_, **__: responses[0])
+    daemon = SyncDaemon(tap, output_dir=tmp_path)
+    state = json.loads(json.dumps(tap.state))
+
+    with pytest.raises(FatalAPIError):
+        daemon.run_once()
+    assert list(tmp_path.iterdir()) == []
+    assert tap.state == state
+
+    responses.pop(0)
+    daemon.run_once()
+    (output,) = tmp_path.iterdir()
+    messages = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [m["stream"] for m in messages if m["type"] == "RECORD"] == ["clicks"]
@@ -0,0 +1,50 @@
+"""Tests for decoding responses into flat records."""
+
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+import requests  # type: ignore[import-untyped]
+
+from tap_criteo.tap import TapCriteo
+
+CONFIG = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [],
+}
+
+
+def test_entries_are_flattened_while_decoding():
+    """Attributes are merged into the record, without the fields of no schema."""
+    response = requests.Response()
+    response._content = json.dumps(  # noqa: SLF001
+        {
+            "data": [
+                {
+                    "id": "7",
+                    "type": "Campaign",
+                    "attributes": {
+                        "name": "Sale",
+                        "spendLimit": {"spendLimitAmount": {"value": 1.5}},
+                        "unknown": "dropped",
+                    },
+                },
+            ],
+            "meta": {"totalItems": 1},
+        },
+    ).encode()
+
+    stream = TapCriteo(config=CONFIG).streams["campaigns"]
+
+    assert list(stream.parse_response(response)) == [
+        {
+            "id": "7",
+            "type": "Campaign",
+            "name": "Sale",
+            "spendLimit": {"spendLimitAmount": {"value": Decimal("1.5")}},
+        },
+    ]
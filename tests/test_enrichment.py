@@ -0,0 +1,102 @@
+"""Tests for local enrichment of report rows with entity names."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests  # type: ignore[import-untyped]
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "enrich_names": True,
+    "reports": [
+        {"name": "clicks", "dimensions": ["Campaign", "Day"], "metrics": ["Clicks"]},
+    ],
+}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_names_are_filled_from_campaigns(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Reports request campaign IDs and get names from the cached campaigns."""
+    config = {**CONFIG, "name_cache_path": str(tmp_path / "names.json")}
+    payloads = []
+    campaign_requests = []
+
+    def request_report(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        payloads.append(json.loads(prepared_request.body or "{}"))
+        return report_response(
+            [{"CampaignId": "7", "Day": "2025-06-02", "Clicks": "1"}],
+        )
+
+    def request_campaigns(*_: Any) -> requests.Response:  # noqa: ANN401
+        campaign_requests.append(1)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(  # noqa: SLF001
+            {"data": [{"id": "7", "type": "Campaign", "attributes": {"name": "Sale"}}]},
+        ).encode()
+        return response
+
+    for _ in range(2):
+        tap = TapCriteo(config=config)
+        monkeypatch.setattr(tap.streams["clicks"], "_request", request_report)
+        monkeypatch.setattr(tap.streams["campaigns"], "_request", request_campaigns)
+        records = list(tap.streams["clicks"].get_records({"AdvertiserId": "1"}))
+
+        assert records == [{"Campaign": "Sale", "Day": "2025-06-02", "Clicks": "1"}]
+
+    assert [p["dimensions"] for p in payloads] == [["CampaignId", "Day"]] * 2
+    assert len(campaign_requests) == 1
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_concurrent_lookups_wait_for_one_refresh(monkeypatch: pytest.MonkeyPatch):
+    """Threads holding the sync lock wait for the names another one requests."""
+    tap = TapCriteo(config=CONFIG)
+    campaign_requests = []
+
+    def request_campaigns(*_: Any) -> requests.Response:  # noqa: ANN401
+        campaign_requests.append(1)
+        time.sleep(0.1)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(  # noqa: SLF001
+            {"data": [{"id": "7", "type": "Campaign", "attributes": {"name": "Sale"}}]},
+        ).encode()
+        return response
+
+    monkeypatch.setattr(tap.streams["campaigns"], "_request", request_campaigns)
+    names = []
+
+    def look_up() -> None:
+        with tap.sync_lock.held():
+            names.append(tap.name_index.get("campaigns", 7))
+
+    threads = [threading.Thread(target=look_up) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert names == ["Sale"] * 3
+    assert len(campaign_requests) == 1
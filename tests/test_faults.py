@@ -0,0 +1,135 @@
+"""Scalability of syncs under degraded API conditions.
+
+Each fault profile runs a full sync of a report and of the paginated ads and
+creatives against a local stand-in server, then checks that no record was lost or
+duplicated and that the state is correct. Throughput, retries and injected faults
+are recorded as test properties, e.g. in the JUnit XML report.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+import backoff
+import pytest
+from criteo_server import PROFILES, REPORT_DAYS, CriteoServer, FaultProfile
+from singer_sdk.helpers._state import get_state_partitions_list
+
+from tap_criteo.client import CriteoStream
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+ADVERTISER_IDS = ["1", "2"]
+SYNCED_STREAMS = {"advertisers", "ads", "creatives", "daily_clicks"}
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ADVERTISER_IDS,
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {
+            "name": "daily_clicks",
+            "dimensions": ["Day"],
+            "metrics": ["Clicks"],
+            "window_days": 30,
+        },
+    ],
+}
+
+
+@pytest.fixture
+def serve(
+    monkeypatch: pytest.MonkeyPatch,
+    offline_auth: None,  # noqa: ARG001
+) -> Iterator[Callable[[FaultProfile], CriteoServer]]:
+    """Start stand-in servers the tap sends its requests to.
+
+    Retry waits are shortened, so that each profile runs in seconds.
+    """
+    servers: list[CriteoServer] = []
+
+    def start(profile: FaultProfile) -> CriteoServer:
+        server = CriteoServer(profile, advertiser_ids=[*ADVERTISER_IDS, "3"])
+        server.start()
+        servers.append(server)
+        monkeypatch.setattr(CriteoStream, "url_base", server.url)
+        return server
+
+    monkeypatch.setattr(
+        CriteoStream,
+        "backoff_wait_generator",
+        lambda _: backoff.constant(interval=0.01),
+    )
+    monkeypatch.setattr(CriteoStream, "backoff_jitter", lambda _, value: value)
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=lambda profile: profile.name)
+def test_sync_under_faults(
+    profile: FaultProfile,
+    serve: Callable[[FaultProfile], CriteoServer],
+    capsys: pytest.CaptureFixture[str],
+    record_property: Callable[[str, object], None],
+):
+    """Records are neither lost nor duplicated, and bookmarks are correct."""
+    server = serve(profile)
+    tap = TapCriteo(config=CONFIG)
+    for name, stream in tap.streams.items():
+        stream.selected = name in SYNCED_STREAMS
+
+    start = time.perf_counter()
+    tap.run_sync()
+    elapsed = time.perf_counter() - start
+
+    records: dict[str, list[dict]] = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+
+    record_count = sum(len(stream_records) for stream_records in records.values())
+    record_property("records_per_second", round(record_count / elapsed))
+    record_property("requests", server.stats.requests)
+    record_property("retries", tap.telemetry.total("retries"))
+    record_property("faults", server.stats.faults)
+    record_property("hedged_requests", tap.telemetry.total("hedged_requests"))
+    record_property("circuit_trips", tap.telemetry.total("circuit_trips"))
+
+    if profile.fault:
+        assert server.stats.faults[profile.fault] > 0
+        assert tap.telemetry.total("retries") == sum(server.stats.faults.values())
+    # Fault bursts are shorter than the retries of a request, so no request runs
+    # out of retries, and no circuit opens
+    assert tap.telemetry.total("circuit_trips") == 0
+    assert tap.telemetry.total("circuit_rejections") == 0
+
+    for kind in ("ads", "creatives"):
+        assert sorted(record["id"] for record in records[kind]) == sorted(
+            entity["id"]
+            for advertiser_id in ADVERTISER_IDS
+            for entity in server.expected_entities(kind, advertiser_id)
+        )
+
+    report = tap.streams["daily_clicks"]
+    assert not getattr(report, "failed_partitions", None)
+    assert sorted(
+        (record["AdvertiserId"], record["Day"], record["Clicks"])
+        for record in records["daily_clicks"]
+    ) == sorted(
+        (row["AdvertiserId"], row["Day"], int(row["Clicks"]))
+        for advertiser_id in ADVERTISER_IDS
+        for row in server.expected_report_rows(advertiser_id)
+    )
+
+    bookmarks = {
+        partition["context"]["AdvertiserId"]: partition["replication_key_value"]
+        for partition in get_state_partitions_list(tap.state, "daily_clicks") or []
+    }
+    assert bookmarks == dict.fromkeys(ADVERTISER_IDS, REPORT_DAYS[-1].isoformat())
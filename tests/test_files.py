@@ -0,0 +1,30 @@
+"""Tests for atomic file writes."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from tap_criteo.files import atomic_write, write_text_atomic
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_failed_writes_keep_the_previous_file(tmp_path: Path):
+    """A file is only replaced once fully written, and leaves no temporary file."""
+    path = tmp_path / "state.json"
+    write_text_atomic(path, "previous")
+
+    def write() -> None:
+        with atomic_write(path) as file:
+            file.write("partial")
+            msg = "interrupted"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="interrupted"):
+        write()
+
+    assert path.read_text() == "previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
@@ -0,0 +1,125 @@
+"""Tests for intraday report streams."""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+from singer_sdk.exceptions import ConfigValidationError
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import requests  # type: ignore[import-untyped]
+
+    from tap_criteo.streams.v202601 import IntradayReportStream, StatsReportStream
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {
+            "name": "pacing",
+            "dimensions": ["Hour"],
+            "metrics": ["Clicks"],
+            "intraday": True,
+        },
+    ],
+}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_intraday_syncs_emit_changed_hours(
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Only today's hours are requested, and unchanged hours are not emitted again."""
+    tap = TapCriteo(config=CONFIG)
+    stream = tap.streams["pacing_intraday"]
+    clicks = iter([["1", "2"], ["1", "3"]])
+    start_dates = []
+
+    def request_report(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        start_dates.append(json.loads(prepared_request.body or "{}")["startDate"])
+        return report_response(
+            [
+                {"Hour": f"2025-06-02T0{hour}:00:00", "Clicks": value}
+                for hour, value in enumerate(next(clicks))
+            ],
+        )
+
+    monkeypatch.setattr(stream, "_request", request_report)
+    stream.sync()
+    stream.sync()
+
+    now = datetime.now(timezone.utc)
+    earliest = min(
+        now.replace(hour=0, minute=0, second=0, microsecond=0),
+        now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=1),
+    )
+    assert {datetime.fromisoformat(s) for s in start_dates} == {earliest}
+    assert tap.telemetry.total("records", stream="pacing_intraday") == 3  # noqa: PLR2004
+    assert "pacing" in tap.streams
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_intraday_syncs_prune_past_days_hashes(
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Hashes kept past the days they could be compared are dropped."""
+    tap = TapCriteo(config=CONFIG)
+    stream = tap.streams["pacing_intraday"]
+    monkeypatch.setattr(
+        stream,
+        "_request",
+        lambda *_: report_response([{"Hour": "2025-06-02T00:00:00", "Clicks": "1"}]),
+    )
+    stream.sync()
+    stream.sync()
+    assert tap.telemetry.total("records", stream="pacing_intraday") == 1
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + timedelta(days=3).total_seconds())
+    stream.sync()
+    assert tap.telemetry.total("records", stream="pacing_intraday") == 2  # noqa: PLR2004
+
+
+def test_intraday_reports_need_hours():
+    """Intraday reports without the Hour dimension are rejected."""
+    report = {**CONFIG["reports"][0], "dimensions": ["Day"]}
+    with pytest.raises(ConfigValidationError):
+        TapCriteo(config={**CONFIG, "reports": [report]})
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_intraday_hash_files_are_shared_and_pruned(tmp_path: Path):
+    """Intraday streams prune their own hashes in the file of their report."""
+    path = str(tmp_path / "hashes.db")
+    report = {**CONFIG["reports"][0], "row_hash_path": path}
+    tap = TapCriteo(config={**CONFIG, "reports": [report]})
+    stream = cast("IntradayReportStream", tap.streams["pacing_intraday"])
+    store = stream.row_hashes
+    assert store is cast("StatsReportStream", tap.streams["pacing"]).row_hashes
+
+    batch = store.batch()
+    batch.changed(["pacing", "1", "2025-06-02T00:00:00"], ["1"])
+    batch.changed(["pacing_intraday", "1", "2025-06-02T00:00:00"], ["1"])
+    batch.commit()
+    assert store.prune(timedelta(days=-1), ["pacing_intraday"]) == 1
+
+    batch = store.batch()
+    assert batch.changed(["pacing_intraday", "1", "2025-06-02T00:00:00"], ["1"])
+    assert not batch.changed(["pacing", "1", "2025-06-02T00:00:00"], ["1"])
+    tap.close()
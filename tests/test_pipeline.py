@@ -0,0 +1,211 @@
+"""Tests for the staged record pipeline."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from criteo_server import PROFILES, REPORT_DAYS, CriteoServer
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers._state import get_state_partitions_list
+
+from tap_criteo.client import CriteoStream
+from tap_criteo.pipeline import MAX_PREFETCH_PARTITIONS, Prefetcher, pipelined
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+
+    import requests  # type: ignore[import-untyped]
+
+ADVERTISER_IDS = ["1", "2"]
+REQUEST_SECONDS = 0.2
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ADVERTISER_IDS,
+    "start_date": "2025-06-01T00:00:00Z",
+    "pipeline_queue_depth": 2,
+    "reports": [
+        {
+            "name": "daily_clicks",
+            "dimensions": ["Day"],
+            "metrics": ["Clicks"],
+            "window_days": 30,
+        },
+    ],
+}
+
+
+def test_pipelined_backpressure_and_errors():
+    """Items are produced at most a queue ahead, and errors reach the caller."""
+    produced = []
+
+    def produce() -> Iterator[int]:
+        for i in range(10):
+            produced.append(i)
+            yield i
+        msg = "last page failed"
+        raise ValueError(msg)
+
+    consumed = []
+
+    def consume() -> None:
+        for item in pipelined(produce(), depth=2):
+            time.sleep(0.01)
+            # This item, two queued, and one waiting for room
+            assert len(produced) - len(consumed) <= 4  # noqa: PLR2004
+            consumed.append(item)
+
+    with pytest.raises(ValueError, match="last page failed"):
+        consume()
+
+    assert consumed == list(range(10))
+
+
+def test_pipelined_stops_with_caller():
+    """When the caller stops early, the items are closed on their thread."""
+    closed = threading.Event()
+
+    def produce() -> Iterator[int]:
+        try:
+            yield from range(100)
+        finally:
+            closed.set()
+
+    items = pipelined(produce(), depth=1)
+    assert next(items) == 0
+    items.close()  # type: ignore[attr-defined]
+
+    assert closed.is_set()
+
+
+def test_prefetcher_starts_partitions_ahead():
+    """Taking a partition starts the next ones, up to the configured number."""
+    started = []
+
+    def fetch(context: Mapping[str, Any]) -> list[str]:
+        started.append(context["id"])
+        return [context["id"]]
+
+    contexts = [{"id": str(i)} for i in range(5)]
+    prefetcher = Prefetcher(contexts, fetch, ahead=2, depth=1)
+    try:
+        assert list(prefetcher.take({"id": "0"}) or []) == ["0"]
+        assert started == ["0", "1", "2"]
+        # Partitions taken out of order are started on demand
+        assert list(prefetcher.take({"id": "4"}) or []) == ["4"]
+        assert list(prefetcher.take({"id": "1"}) or []) == ["1"]
+        assert started == ["0", "1", "2", "4", "3"]
+        assert prefetcher.take({"id": "4"}) is None
+        assert prefetcher.take({"id": "unknown"}) is None
+    finally:
+        prefetcher.close()
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_prefetched_partitions_overlap_requests(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """The requests of upcoming partitions are in flight at the same time."""
+    advertiser_ids = [str(i) for i in range(1, 5)]
+    tap = TapCriteo(
+        config={
+            **CONFIG,
+            "advertiser_ids": advertiser_ids,
+            "pipeline_queue_depth": 0,
+            "prefetch_partitions": 3,
+            "reports": [{**CONFIG["reports"][0], "window_days": None}],
+        },
+    )
+    stream = tap.streams["daily_clicks"]
+
+    def request(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        time.sleep(REQUEST_SECONDS)
+        payload = json.loads(prepared_request.body or "{}")
+        return report_response(
+            [{"AdvertiserId": payload["advertiserIds"], "Day": "2025-06-02"}],
+        )
+
+    monkeypatch.setattr(stream, "_request", request)
+    start = time.perf_counter()
+    stream.sync()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < REQUEST_SECONDS * len(advertiser_ids) / 2
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [
+        message["record"]["AdvertiserId"]
+        for message in messages
+        if message["type"] == "RECORD"
+    ] == advertiser_ids
+
+
+def test_prefetched_partitions_are_bounded():
+    """Each prefetched partition takes a thread, so only a few are allowed."""
+    with pytest.raises(ConfigValidationError):
+        TapCriteo(config={**CONFIG, "prefetch_partitions": MAX_PREFETCH_PARTITIONS + 1})
+
+
+@pytest.mark.usefixtures("offline_auth")
+@pytest.mark.parametrize(
+    "options",
+    [
+        pytest.param({}, id="pipeline"),
+        pytest.param({"prefetch_partitions": 2}, id="pipeline-prefetch"),
+        pytest.param(
+            {"pipeline_queue_depth": 0, "prefetch_partitions": 1},
+            id="prefetch",
+        ),
+    ],
+)
+def test_pipelined_sync(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    options: dict[str, Any],
+):
+    """A pipelined sync writes the same records and bookmarks as an inline one."""
+    server = CriteoServer(PROFILES[0], advertiser_ids=ADVERTISER_IDS)
+    server.start()
+    monkeypatch.setattr(CriteoStream, "url_base", server.url)
+    tap = TapCriteo(config={**CONFIG, **options})
+    for name, stream in tap.streams.items():
+        stream.selected = name in {"advertisers", "ads", "daily_clicks"}
+
+    try:
+        tap.run_sync()
+    finally:
+        server.stop()
+
+    records: dict[str, list[dict]] = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+
+    assert [record["id"] for record in records["ads"]] == [
+        entity["id"]
+        for advertiser_id in ADVERTISER_IDS
+        for entity in server.expected_entities("ads", advertiser_id)
+    ]
+    assert sorted(
+        (record["AdvertiserId"], record["Day"]) for record in records["daily_clicks"]
+    ) == sorted(
+        (row["AdvertiserId"], row["Day"])
+        for advertiser_id in ADVERTISER_IDS
+        for row in server.expected_report_rows(advertiser_id)
+    )
+    bookmarks = {
+        partition["context"]["AdvertiserId"]: partition["replication_key_value"]
+        for partition in get_state_partitions_list(tap.state, "daily_clicks") or []
+    }
+    assert bookmarks == dict.fromkeys(ADVERTISER_IDS, REPORT_DAYS[-1].isoformat())
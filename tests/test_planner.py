@@ -0,0 +1,86 @@
+"""Tests for dry-run sync planning."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from tap_criteo.history import RunHistory
+from tap_criteo.planner import plan_sync
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+UTC = timezone.utc
+REPORT_URL = "https://api.criteo.com/2026-01/statistics/report"
+LAST_ADS_REQUESTS = 6
+
+
+def test_plan_reports_and_children(tmp_path: Path):
+    """Report windows and child partitions are expanded and estimated offline."""
+    yesterday = datetime.now(UTC) - timedelta(days=1)
+    history = RunHistory(tmp_path / "history.json")
+    history.record("clicks", requests=4, records=400, request_seconds=8.0)
+    history.record("ads", requests=LAST_ADS_REQUESTS, records=300, request_seconds=3.0)
+    history.save()
+
+    config: dict[str, Any] = {
+        "client_id": "client-id",
+        "client_secret": "client-secret",
+        "advertiser_ids": ["1", "2"],
+        "start_date": (yesterday - timedelta(days=20)).isoformat(),
+        "history_path": str(tmp_path / "history.json"),
+        "reports": [
+            {
+                "name": "clicks",
+                "dimensions": ["Day"],
+                "metrics": ["Clicks"],
+                "window_days": 10,
+            },
+        ],
+    }
+    state = {
+        "bookmarks": {
+            "clicks": {
+                "partitions": [
+                    {
+                        "context": {"AdvertiserId": "1"},
+                        "replication_key": "Day",
+                        "replication_key_value": yesterday.date().isoformat(),
+                    },
+                ],
+            },
+        },
+    }
+    plan = plan_sync(TapCriteo(config=config, state=state))
+
+    reports = [r for r in plan["requests"] if r["stream"] == "clicks"]
+    assert [r["advertiserId"] for r in reports] == ["1", "2", "2", "2"]
+    assert all(r["url"] == REPORT_URL for r in reports)
+
+    ads = [r["url"] for r in plan["requests"] if r["stream"] == "ads"]
+    assert ads == [
+        "https://api.criteo.com/2026-01/marketing-solutions/advertisers/1/ads",
+        "https://api.criteo.com/2026-01/marketing-solutions/advertisers/2/ads",
+    ]
+
+    assert plan["streams"]["clicks"] == {
+        "planned_requests": 4,
+        "estimated_requests": 4,
+        "estimated_rows": 400,
+        "estimated_seconds": 8.0,
+    }
+    assert plan["streams"]["ads"]["estimated_requests"] == LAST_ADS_REQUESTS
+    assert "campaigns" in plan["total"]["streams_without_history"]
+    assert plan["streams"]["campaigns"]["estimated_rows"] is None
+    assert plan["total"]["estimated_rows"] is None
+
+    for name in plan["total"]["streams_without_history"]:
+        history.record(name, requests=1, records=10, request_seconds=1.0)
+    history.save()
+    plan = plan_sync(TapCriteo(config=config, state=state))
+    assert not plan["total"]["streams_without_history"]
+    assert plan["total"]["estimated_rows"] == sum(
+        s["estimated_rows"] for s in plan["streams"].values()
+    )
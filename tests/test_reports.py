@@ -0,0 +1,457 @@
+"""Tests for statistics report streams."""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
+
+import backoff
+import pytest
+from singer_sdk.exceptions import FatalAPIError, FatalSyncError, RetriableAPIError
+
+from tap_criteo.hashes import RowHashStore
+from tap_criteo.offload import CHUNK_SIZE, offload_records
+from tap_criteo.scheduling import SyncLock
+from tap_criteo.streams.v202601 import StatsReportStream
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+    import requests  # type: ignore[import-untyped]
+
+UTC = timezone.utc
+WINDOW_DAYS = 10
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1", "2"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {
+            "name": "daily_clicks",
+            "dimensions": ["CampaignId", "Day"],
+            "metrics": ["Clicks"],
+            "window_days": WINDOW_DAYS,
+        },
+    ],
+}
+
+
+@pytest.fixture
+def stream(offline_auth: None) -> StatsReportStream:  # noqa: ARG001
+    """Return the report stream of a tap built from the test config."""
+    tap = TapCriteo(config=CONFIG)
+    report = tap.streams["daily_clicks"]
+    assert isinstance(report, StatsReportStream)
+    return report
+
+
+def test_report_partitions(stream: StatsReportStream):
+    """Reports are partitioned by advertiser and bookmarked on the time dimension."""
+    assert stream.partitions == [{"AdvertiserId": "1"}, {"AdvertiserId": "2"}]
+    assert stream.replication_key == "Day"
+    assert stream.primary_keys == ("CampaignId", "Day", "AdvertiserId")
+    assert "AdvertiserId" in stream.schema["properties"]
+
+
+def test_report_windows_start_at_bookmark(stream: StatsReportStream):
+    """Existing advertisers resume from their bookmark, new ones backfill."""
+    stream.tap_state["bookmarks"] = {
+        "daily_clicks": {
+            "partitions": [
+                {
+                    "context": {"AdvertiserId": "1"},
+                    "replication_key": "Day",
+                    "replication_key_value": "2025-07-01",
+                },
+            ],
+        },
+    }
+    stream._write_starting_replication_value({"AdvertiserId": "1"})  # noqa: SLF001
+    stream._write_starting_replication_value({"AdvertiserId": "2"})  # noqa: SLF001
+
+    existing = stream.get_report_windows({"AdvertiserId": "1"})
+    new = stream.get_report_windows({"AdvertiserId": "2"})
+
+    assert existing[0][0] == datetime(2025, 7, 1, tzinfo=UTC)
+    assert new[0][0] == datetime(2025, 6, 1, tzinfo=UTC)
+    assert existing[0][1] - existing[0][0] == timedelta(days=WINDOW_DAYS - 1)
+    # End dates are inclusive, so windows must not share a day
+    assert all(
+        b[0] - a[1] == timedelta(days=1) and a[1].date() < b[0].date()
+        for a, b in pairwise(existing)
+    )
+
+
+def test_failing_partition_does_not_block_others(
+    stream: StatsReportStream,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """An advertiser failing transiently keeps its bookmark while others advance."""
+    stream.window_days = None
+    monkeypatch.setattr(stream, "backoff_wait_generator", lambda: backoff.constant(0))
+
+    def request(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        payload = json.loads(prepared_request.body or "{}")
+        if payload["advertiserIds"] == "1":
+            msg = "Service Unavailable"
+            raise RetriableAPIError(msg)
+        return report_response(
+            [{"CampaignId": "10", "Day": "2025-06-02", "Clicks": "3"}],
+        )
+
+    monkeypatch.setattr(stream, "_request", request)
+    stream.sync()
+
+    partitions = stream.tap_state["bookmarks"]["daily_clicks"]["partitions"]
+    by_advertiser = {p["context"]["AdvertiserId"]: p for p in partitions}
+    assert "replication_key_value" not in by_advertiser["1"]
+    assert by_advertiser["2"]["replication_key_value"] == "2025-06-02"
+    assert stream.failed_partitions == [{"AdvertiserId": "1"}]
+    assert stream.telemetry.total("failed_partitions") == 1
+
+
+def test_bookmarks_never_move_back(
+    stream: StatsReportStream,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Rows older than the bookmark, e.g. from the lookback, do not move it back."""
+    stream.window_days = None
+    stream.lookback_days = 7
+    stream.tap_state["bookmarks"] = {
+        "daily_clicks": {
+            "partitions": [
+                {
+                    "context": {"AdvertiserId": advertiser_id},
+                    "replication_key": "Day",
+                    "replication_key_value": "2025-07-10",
+                }
+                for advertiser_id in ("1", "2")
+            ],
+        },
+    }
+
+    def request(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        payload = json.loads(prepared_request.body or "{}")
+        day = "2025-07-05" if payload["advertiserIds"] == "1" else "2025-07-12"
+        return report_response([{"CampaignId": "10", "Day": day, "Clicks": "3"}])
+
+    monkeypatch.setattr(stream, "_request", request)
+    stream.sync()
+
+    partitions = stream.tap_state["bookmarks"]["daily_clicks"]["partitions"]
+    by_advertiser = {p["context"]["AdvertiserId"]: p for p in partitions}
+    assert by_advertiser["1"]["replication_key_value"] == "2025-07-10"
+    assert by_advertiser["2"]["replication_key_value"] == "2025-07-12"
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_failed_partitions_fail_the_run(
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Failed partitions are reported by the exit code, and reset by each sync."""
+    tap = TapCriteo(config={**CONFIG, "advertiser_ids": ["1"]})
+    stream = tap.streams["daily_clicks"]
+    assert isinstance(stream, StatsReportStream)
+    stream.window_days = None
+    monkeypatch.setattr(stream, "backoff_wait_generator", lambda: backoff.constant(0))
+    failing = True
+
+    def request(*_: object) -> requests.Response:
+        if failing:
+            msg = "Service Unavailable"
+            raise RetriableAPIError(msg)
+        return report_response([])
+
+    monkeypatch.setattr(stream, "_request", request)
+    with pytest.raises(FatalSyncError, match="daily_clicks"):
+        tap.run_sync(["daily_clicks"])
+
+    failing = False
+    tap.run_sync(["daily_clicks"])
+    assert stream.failed_partitions == []
+
+
+def test_fatal_errors_stop_the_sync(
+    stream: StatsReportStream,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Errors that retrying cannot fix, like rejected credentials, are raised."""
+
+    def request(*_: object) -> requests.Response:
+        msg = "Unauthorized"
+        raise FatalAPIError(msg)
+
+    monkeypatch.setattr(stream, "_request", request)
+    with pytest.raises(FatalAPIError, match="Unauthorized"):
+        stream.sync()
+    assert stream.failed_partitions == []
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_reports_without_advertisers_cover_all_of_them(
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Without configured advertisers, reports are not filtered by advertiser."""
+    tap = TapCriteo(config={**CONFIG, "advertiser_ids": []})
+    stream = tap.streams["daily_clicks"]
+    assert isinstance(stream, StatsReportStream)
+    stream.window_days = None
+    payloads = []
+
+    def request(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        payloads.append(json.loads(prepared_request.body or "{}"))
+        return report_response([])
+
+    monkeypatch.setattr(stream, "_request", request)
+    assert stream.partitions == [{}]
+    stream.sync()
+
+    assert len(payloads) == 1
+    assert "advertiserIds" not in payloads[0]
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_offloaded_rows_match_inline_rows(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Rows processed by worker processes are written like inline ones."""
+    rows = [
+        {"CampaignId": str(i), "Day": "2025-06-02", "Clicks": str(i)}
+        for i in range(2500)
+    ]
+
+    def sync(config: dict[str, Any]) -> list[dict]:
+        tap = TapCriteo(config=config)
+        stream = tap.streams["daily_clicks"]
+        monkeypatch.setattr(stream, "_request", lambda *_: report_response(rows))
+        stream.sync()
+        if tap.report_executor:
+            tap.report_executor.shutdown()
+        messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        return [m["record"] for m in messages if m["type"] == "RECORD"]
+
+    config = {
+        **CONFIG,
+        "advertiser_ids": ["1"],
+        "reports": [{**CONFIG["reports"][0], "window_days": None}],
+    }
+    inline = sync(config)
+    offloaded = sync({**config, "report_workers": 2})
+
+    assert offloaded == inline
+    assert offloaded[-1] == {
+        "CampaignId": "2499",
+        "Day": "2025-06-02",
+        "Clicks": 2499,
+        "AdvertiserId": "1",
+    }
+
+
+def test_offloaded_rows_are_read_as_needed(stream: StatsReportStream):
+    """Only a bounded number of chunks is read ahead of the records yielded."""
+    read = 0
+
+    def rows() -> Iterator[dict[str, Any]]:
+        nonlocal read
+        for i in range(10 * CHUNK_SIZE):
+            read += 1
+            yield {"CampaignId": str(i), "Day": "2025-06-02", "Clicks": "1"}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        records = offload_records(
+            rows(),
+            executor=executor,
+            lock=SyncLock(),
+            max_pending=4,
+            stream_name=stream.name,
+            schema=stream.schema,
+            mask=stream.mask,
+            context={"AdvertiserId": "1"},
+            version=None,
+            level=stream.TYPE_CONFORMANCE_LEVEL,
+        )
+        next(records)
+        assert read <= 5 * CHUNK_SIZE
+        assert sum(1 for _ in records) == 10 * CHUNK_SIZE - 1
+
+
+def test_overlapping_windows_emit_latest_rows(
+    stream: StatsReportStream,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Rows repeated across windows are emitted once, with their latest values."""
+    stream._config["dedup_memory_rows"] = 1  # noqa: SLF001
+    windows = iter(range(100))
+
+    def request(*_: Any) -> requests.Response:  # noqa: ANN401
+        window = next(windows)
+        return report_response(
+            [
+                {"CampaignId": "10", "Day": "2025-06-01", "Clicks": str(window)},
+                {"CampaignId": str(window), "Day": "2025-06-02", "Clicks": "1"},
+            ],
+        )
+
+    monkeypatch.setattr(stream, "_request", request)
+    records = list(stream.get_records({"AdvertiserId": "1"}))
+    window_count = len(stream.get_report_windows({"AdvertiserId": "1"}))
+
+    assert len(records) == window_count + 1
+    assert records[0] == {
+        "CampaignId": "10",
+        "Day": "2025-06-01",
+        "Clicks": str(window_count - 1),
+    }
+
+
+def test_unchanged_rows_are_skipped(
+    stream: StatsReportStream,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Rows requested again are only emitted when their metrics changed."""
+    stream.window_days = None
+    stream.row_hash_path = str(tmp_path / "hashes.db")
+    rows = [
+        {"CampaignId": "10", "Day": "2025-06-01", "Clicks": "1"},
+        {"CampaignId": "10", "Day": "2025-06-02", "Clicks": "2"},
+    ]
+    monkeypatch.setattr(stream, "_request", lambda *_: report_response(rows))
+
+    first = list(stream.get_records({"AdvertiserId": "1"}))
+    rows[1] = {"CampaignId": "10", "Day": "2025-06-02", "Clicks": "3"}
+    second = list(stream.get_records({"AdvertiserId": "1"}))
+    other_advertiser = list(stream.get_records({"AdvertiserId": "2"}))
+
+    assert first == [
+        {"CampaignId": "10", "Day": "2025-06-01", "Clicks": "1"},
+        {"CampaignId": "10", "Day": "2025-06-02", "Clicks": "2"},
+    ]
+    assert second == [{"CampaignId": "10", "Day": "2025-06-02", "Clicks": "3"}]
+    assert other_advertiser == rows
+
+
+def test_row_hashes_are_committed_once_rows_are_written(
+    stream: StatsReportStream,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Rows requested ahead of an interrupted write are emitted again."""
+    stream.window_days = None
+    stream.row_hash_path = str(tmp_path / "hashes.db")
+    stream._config["pipeline_queue_depth"] = 2  # noqa: SLF001
+    rows = [
+        {"CampaignId": str(i), "Day": "2025-06-01", "Clicks": "1"} for i in range(3)
+    ]
+    monkeypatch.setattr(stream, "_request", lambda *_: report_response(rows))
+
+    records = iter(stream.get_records({"AdvertiserId": "1"}))
+    next(records)
+    # Let the pipeline stages request and process all rows
+    time.sleep(0.2)
+    records.close()  # type: ignore[attr-defined]
+
+    assert len(list(stream.get_records({"AdvertiserId": "1"}))) == len(rows)
+    assert list(stream.get_records({"AdvertiserId": "1"})) == []
+
+
+def test_row_hashes_are_rolled_back_to_a_checkpoint(tmp_path: Path):
+    """Hashes committed after a checkpoint are replaced or removed by a rollback."""
+    store = RowHashStore(tmp_path / "hashes.db")
+    batch = store.batch()
+    assert batch.changed(["1"], ["1"])
+    batch.commit()
+
+    store.checkpoint()
+    batch = store.batch()
+    assert batch.changed(["1"], ["2"])
+    assert batch.changed(["2"], ["1"])
+    batch.commit()
+    store.rollback()
+
+    batch = store.batch()
+    assert not batch.changed(["1"], ["1"])
+    assert batch.changed(["2"], ["1"])
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_deselected_metrics_are_not_requested():
+    """Metrics deselected in the catalog are dropped from the report request."""
+    report = {
+        "name": "daily_clicks",
+        "dimensions": ["CampaignId", "Day"],
+        "metrics": ["Clicks", "Displays"],
+    }
+    catalog = TapCriteo(config={**CONFIG, "reports": [report]}).catalog_dict
+    entry = next(s for s in catalog["streams"] if s["tap_stream_id"] == "daily_clicks")
+    for metadata in entry["metadata"]:
+        if metadata["breadcrumb"] == ["properties", "Displays"]:
+            metadata["metadata"]["selected"] = False
+
+    tap = TapCriteo(config={**CONFIG, "reports": [report]}, catalog=catalog)
+    stream = tap.streams["daily_clicks"]
+    payload = stream.prepare_request_payload(
+        {"AdvertiserId": "1", "startDate": "2025-06-01", "endDate": "2025-06-02"},
+        None,
+    )
+
+    assert payload["dimensions"] == ["CampaignId", "Day"]
+    assert payload["metrics"] == ["Clicks"]
+    schema_message = next(stream._generate_schema_messages())  # noqa: SLF001
+    assert "Displays" not in schema_message.schema["properties"]
+
+
+@pytest.mark.usefixtures("offline_auth")
+@pytest.mark.parametrize(
+    ("numeric_mode", "schema_type", "cost"),
+    [
+        ("decimal", "number", Decimal("12.3456")),
+        ("float", "number", 12.3456),
+        ("scaled_int", "integer", 1234560),
+    ],
+)
+def test_numeric_modes(numeric_mode: str, schema_type: str, cost: float):
+    """Currency metrics are converted, and typed, according to the numeric mode."""
+    report = {
+        "name": "daily_cost",
+        "dimensions": ["Day"],
+        "metrics": ["Clicks", "AdvertiserCost"],
+        "numeric_mode": numeric_mode,
+        "numeric_scale": 5,
+    }
+    tap = TapCriteo(config={**CONFIG, "reports": [report]})
+    stream = tap.streams["daily_cost"]
+    record = stream.post_process(
+        {"Day": "2025-06-02", "Clicks": "3", "AdvertiserCost": "12.3456"},
+    )
+
+    assert record == {"Day": "2025-06-02", "Clicks": 3, "AdvertiserCost": cost}
+    assert type(record["AdvertiserCost"]) is type(cost)
+    assert stream.schema["properties"]["AdvertiserCost"]["type"] == schema_type
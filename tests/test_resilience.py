@@ -0,0 +1,196 @@
+"""Tests for hedged requests and circuit breakers."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+import backoff
+import pytest
+import requests  # type: ignore[import-untyped]
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_criteo.client import CriteoStream
+from tap_criteo.resilience import CircuitBreaker, is_idempotent
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tap_criteo.streams.v202601 import StatsReportStream
+
+SLOW_SECONDS = 1.0
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1", "2"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [{"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]}],
+}
+
+
+def build_sender(
+    status: int,
+    body: dict,
+    *,
+    slow_calls: int = 0,
+) -> Callable[..., requests.Response]:
+    """Return a stand-in for ``Session.send``, slow for its first calls."""
+    calls = []
+
+    def send(request: requests.PreparedRequest, **_: Any) -> requests.Response:  # noqa: ANN401
+        calls.append(request)
+        if len(calls) <= slow_calls:
+            time.sleep(SLOW_SECONDS)
+        response = requests.Response()
+        response.status_code = status
+        response.request = request
+        response._content = json.dumps(body).encode()  # noqa: SLF001
+        return response
+
+    return send
+
+
+def test_circuit_breaker():
+    """The circuit opens on consecutive failures and lets a trial request through."""
+    breaker = CircuitBreaker(threshold=2, reset_seconds=0.05)
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+    time.sleep(0.05)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_client_errors_end_the_trial(monkeypatch: pytest.MonkeyPatch):
+    """A trial request failing with a client error lets the next one through."""
+    tap = TapCriteo(
+        config={
+            **CONFIG,
+            "circuit_breaker_threshold": 1,
+            "circuit_breaker_reset_seconds": 0,
+        },
+    )
+    stream = cast("CriteoStream", tap.streams["campaigns"])
+    breaker = stream.endpoint_health.breaker
+    breaker.record_failure()
+    monkeypatch.setattr(tap.requests_session, "send", build_sender(400, {}))
+
+    with pytest.raises(FatalAPIError):
+        list(stream.get_records(None))
+    assert not breaker.in_trial
+    assert not breaker.is_open
+
+    body = {"data": [{"id": "1", "type": "Campaign"}]}
+    monkeypatch.setattr(tap.requests_session, "send", build_sender(200, body))
+    assert [record["id"] for record in stream.get_records(None)] == ["1"]
+    assert breaker.allow()
+    assert breaker.failures == 0
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_slow_requests_are_hedged(monkeypatch: pytest.MonkeyPatch):
+    """A request slower than usual is sent again, and the duplicate wins."""
+    tap = TapCriteo(config={**CONFIG, "hedge_requests": True})
+    stream = cast("CriteoStream", tap.streams["advertisers"])
+    for _ in range(20):
+        stream.endpoint_health.latencies.observe(0.01)
+    body = {"data": [{"id": "1", "type": "Advertiser"}]}
+    send = build_sender(200, body, slow_calls=1)
+    monkeypatch.setattr(tap.requests_session, "send", send)
+
+    start = time.perf_counter()
+    records = list(stream.get_records(None))
+    elapsed = time.perf_counter() - start
+    tap.close()
+
+    assert [record["id"] for record in records] == ["1"]
+    assert elapsed < SLOW_SECONDS
+    assert tap.telemetry.total("hedged_requests") == 1
+    assert tap.telemetry.total("hedge_wins") == 1
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_slow_report_requests_are_hedged(monkeypatch: pytest.MonkeyPatch):
+    """Report requests only read data, so they are hedged despite being POSTs."""
+    tap = TapCriteo(config={**CONFIG, "hedge_requests": True})
+    stream = cast("StatsReportStream", tap.streams["clicks"])
+    for _ in range(20):
+        stream.endpoint_health.latencies.observe(0.01)
+    send = build_sender(200, {"Rows": []}, slow_calls=1)
+    monkeypatch.setattr(tap.requests_session, "send", send)
+
+    start = time.perf_counter()
+    assert list(stream.get_records({"AdvertiserId": "1"})) == []
+    elapsed = time.perf_counter() - start
+    tap.close()
+
+    assert elapsed < SLOW_SECONDS
+    assert tap.telemetry.total("hedged_requests") == 1
+    assert tap.telemetry.total("hedge_wins") == 1
+
+
+def test_only_idempotent_requests_are_hedged():
+    """Other POST requests may have side effects, so they are never hedged."""
+    url = "https://api.criteo.com/2026-01"
+    requests_by_path = {
+        ("GET", "/advertisers/me"): True,
+        ("POST", "/marketing-solutions/campaigns/search"): True,
+        ("POST", "/statistics/report"): True,
+        ("POST", "/marketing-solutions/audiences"): False,
+        ("PATCH", "/marketing-solutions/campaigns/search"): False,
+    }
+    for (method, path), idempotent in requests_by_path.items():
+        request = requests.Request(method, url + path).prepare()
+        assert is_idempotent(request) is idempotent
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_open_circuit_defers_partitions(monkeypatch: pytest.MonkeyPatch):
+    """Once an endpoint keeps failing, its remaining partitions are deferred."""
+    tap = TapCriteo(
+        config={
+            **CONFIG,
+            "advertiser_ids": ["1", "2", "3"],
+            "circuit_breaker_threshold": 2,
+        },
+    )
+    stream = cast("StatsReportStream", tap.streams["clicks"])
+    monkeypatch.setattr(tap.requests_session, "send", build_sender(503, {}))
+    monkeypatch.setattr(
+        CriteoStream,
+        "backoff_wait_generator",
+        lambda _: backoff.constant(interval=0),
+    )
+
+    for partition in stream.partitions or []:
+        assert list(stream.get_records(partition)) == []
+
+    # Each request is only counted as a failure once its retries ran out
+    assert stream.failed_partitions == [{"AdvertiserId": "1"}, {"AdvertiserId": "2"}]
+    assert tap.budget.deferred == {"clicks": [{"AdvertiserId": "3"}]}
+    assert tap.telemetry.total("circuit_trips") == 1
+    assert tap.telemetry.total("requests") == 2 * stream.backoff_max_tries()
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_open_circuit_defers_object_streams(monkeypatch: pytest.MonkeyPatch):
+    """Object streams are deferred too, instead of failing the sync."""
+    tap = TapCriteo(config={**CONFIG, "circuit_breaker_threshold": 1})
+    stream = cast("CriteoStream", tap.streams["campaigns"])
+    stream.endpoint_health.breaker.record_failure()
+    send = build_sender(200, {"data": []})
+    monkeypatch.setattr(tap.requests_session, "send", send)
+
+    assert list(stream.get_records(None)) == []
+
+    assert tap.budget.deferred == {"campaigns": [None]}
+    assert tap.telemetry.total("circuit_rejections") == 1
+    assert tap.telemetry.total("requests") == 0
@@ -0,0 +1,32 @@
+"""Tests for compact report rows."""
+
+from __future__ import annotations
+
+import json
+
+from tap_criteo.dedup import LatestRowIndex
+from tap_criteo.rows import make_row_type
+
+
+def test_compact_rows_round_trip():
+    """Compact rows keep their values, missing fields and unexpected keys."""
+    row_type = make_row_type(
+        "ReportRow",
+        ["Day", "Device", "Clicks"],
+        interned=["Day", "Device"],
+    )
+    index = LatestRowIndex(row_type=row_type)
+    index.add(("2025-06-01",), {"Day": "2025-06-01", "Clicks": "1", "Extra": "x"})
+    index.add(("2025-06-02",), {"Device": "Tablet", "Day": "2025-06-02"})
+    index.add(("2025-06-01",), {"Day": "2025-06-01", "Clicks": "2"})
+
+    first = row_type.from_dict(json.loads('{"Device": "Tablet"}'))
+    second = row_type.from_dict(json.loads('{"Device": "Tablet"}'))
+
+    assert first.Device is second.Device  # type: ignore[attr-defined]
+    assert not hasattr(first, "__dict__")
+    assert list(index) == [
+        {"Day": "2025-06-01", "Clicks": "2"},
+        {"Day": "2025-06-02", "Device": "Tablet"},
+    ]
+    assert index.duplicates == 1
@@ -0,0 +1,91 @@
+"""Tests for concurrent stream scheduling."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from tap_criteo.history import RunHistory
+from tap_criteo.scheduling import schedule_streams, sync_streams
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import requests  # type: ignore[import-untyped]
+
+REQUEST_SECONDS = 0.2
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [
+        {"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]},
+        {"name": "displays", "dimensions": ["Day"], "metrics": ["Displays"]},
+        {"name": "visits", "dimensions": ["Day"], "metrics": ["Visits"]},
+    ],
+}
+
+
+def test_longest_streams_first(tmp_path: Path):
+    """Streams are ordered by recorded duration, unknown ones first."""
+    history = RunHistory(tmp_path / "history.json")
+    history.record("clicks", duration=1.0)
+    history.record("displays", duration=5.0)
+    history.save()
+
+    tap = TapCriteo(config=CONFIG)
+    reports = [tap.streams[name] for name in ("clicks", "displays", "visits")]
+    ordered = schedule_streams(reports, RunHistory(tmp_path / "history.json"))
+
+    assert [stream.name for stream in ordered] == ["visits", "displays", "clicks"]
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_streams_overlap_requests(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Streams wait on the API concurrently and write whole, ordered messages."""
+    tap = TapCriteo(config={**CONFIG, "max_concurrent_streams": 3})
+    reports = [tap.streams[name] for name in ("clicks", "displays", "visits")]
+
+    def request(*_: Any) -> requests.Response:  # noqa: ANN401
+        time.sleep(REQUEST_SECONDS)
+        return report_response([{"Day": "2025-06-02", "Clicks": "1"}])
+
+    for stream in reports:
+        monkeypatch.setattr(stream, "_request", request)
+
+    start = time.perf_counter()
+    sync_streams(reports, lock=tap.sync_lock, history=tap.history, max_workers=3)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < REQUEST_SECONDS * len(reports)
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    for stream in reports:
+        types = [m["type"] for m in messages if m.get("stream") == stream.name]
+        assert types == ["SCHEMA", "RECORD"]
+        assert tap.history.get_duration(stream.name)
+
+
+def test_durations_leave_out_lock_waits(monkeypatch: pytest.MonkeyPatch):
+    """A stream waiting for another one to release the lock is not charged for it."""
+    tap = TapCriteo(config={**CONFIG, "max_concurrent_streams": 2})
+    reports = [tap.streams[name] for name in ("clicks", "displays")]
+    for stream in reports:
+        monkeypatch.setattr(stream, "sync", lambda: time.sleep(REQUEST_SECONDS))
+
+    sync_streams(reports, lock=tap.sync_lock, history=tap.history, max_workers=2)
+
+    durations = sorted(tap.history.get_duration(stream.name) or 0 for stream in reports)
+    assert durations[0] >= REQUEST_SECONDS
+    assert durations[1] < 1.5 * REQUEST_SECONDS
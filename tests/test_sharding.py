@@ -0,0 +1,115 @@
+"""Tests for advertiser sharding."""
+
+from __future__ import annotations
+
+import json
+from itertools import chain
+from typing import Any
+
+import pytest
+from singer_sdk.exceptions import ConfigValidationError
+
+from tap_criteo.sharding import merge_states, shard_advertiser_ids
+from tap_criteo.tap import TapCriteo
+
+ADVERTISER_IDS = [str(advertiser_id) for advertiser_id in range(100, 150)]
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ADVERTISER_IDS,
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [{"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]}],
+}
+
+
+def test_shards_partition_advertisers():
+    """Every advertiser belongs to exactly one shard."""
+    shards = [
+        shard_advertiser_ids(ADVERTISER_IDS, shard_index=index, shard_count=3)
+        for index in range(3)
+    ]
+
+    assert sorted(chain.from_iterable(shards)) == sorted(ADVERTISER_IDS)
+    assert all(shards)
+
+
+def test_report_partitions_follow_shard():
+    """Report partitions only cover the advertisers of the tap's shard."""
+    tap = TapCriteo(config={**CONFIG, "shard_index": 1, "shard_count": 3})
+    expected = shard_advertiser_ids(ADVERTISER_IDS, shard_index=1, shard_count=3)
+
+    partitions = tap.streams["clicks"].partitions or []
+
+    assert [p["AdvertiserId"] for p in partitions] == expected
+
+
+def test_invalid_shard_index():
+    """The shard index must be lower than the number of shards."""
+    with pytest.raises(ConfigValidationError):
+        TapCriteo(config={**CONFIG, "shard_index": 2, "shard_count": 2})
+
+
+def test_merge_states_keeps_newest_bookmarks():
+    """Each partition keeps the bookmark that is furthest ahead."""
+
+    def partition(advertiser_id: str, day: str) -> dict:
+        return {
+            "context": {"AdvertiserId": advertiser_id},
+            "replication_key": "Day",
+            "replication_key_value": day,
+        }
+
+    shard_0 = {
+        "bookmarks": {
+            "clicks": {
+                "partitions": [
+                    partition("1", "2025-06-10"),
+                    partition("2", "2025-06-01"),
+                ],
+            },
+            "campaigns": {},
+        },
+    }
+    shard_1 = {
+        "bookmarks": {
+            "clicks": {
+                "partitions": [
+                    partition("2", "2025-06-10"),
+                    partition("3", "2025-06-10"),
+                ],
+            },
+        },
+    }
+
+    merged = merge_states([shard_0, shard_1])
+
+    assert merged["bookmarks"]["clicks"]["partitions"] == [
+        partition("1", "2025-06-10"),
+        partition("2", "2025-06-10"),
+        partition("3", "2025-06-10"),
+    ]
+    assert merged["bookmarks"]["campaigns"] == {}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_shard_without_advertisers_syncs_nothing(
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """A shard that owns none of the advertisers skips advertiser-scoped streams."""
+    assert shard_advertiser_ids(["1"], shard_index=0, shard_count=4) == []
+    tap = TapCriteo(
+        config={**CONFIG, "advertiser_ids": ["1"], "shard_index": 0, "shard_count": 4},
+    )
+
+    def request(*_: object) -> None:
+        pytest.fail("No request should be sent")
+
+    for stream in tap.streams.values():
+        monkeypatch.setattr(stream, "_request", request)
+
+    tap.run_sync(["clicks", "audiences", "advertisers", "ads", "creatives"])
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert not [message for message in messages if message["type"] == "RECORD"]
@@ -0,0 +1,69 @@
+"""Tests for run metrics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import backoff
+import pytest
+
+from tap_criteo.tap import TapCriteo
+from tap_criteo.telemetry import TelemetryExporter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import requests  # type: ignore[import-untyped]
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1"],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [{"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]}],
+}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_metrics_textfile(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Requests, retries, rate limits, records and tokens are counted."""
+    tap = TapCriteo(config=CONFIG)
+    stream = tap.streams["clicks"]
+
+    rate_limited = report_response([])
+    rate_limited.status_code = 429
+    responses = iter(
+        [rate_limited, report_response([{"Day": "2025-06-02", "Clicks": "1"}])],
+    )
+
+    monkeypatch.setattr(tap.requests_session, "send", lambda *_, **__: next(responses))
+    monkeypatch.setattr(stream, "backoff_wait_generator", lambda: backoff.constant(0))
+    monkeypatch.setattr(stream, "backoff_jitter", lambda _: 0)
+
+    textfile = tmp_path / "tap_criteo.prom"
+    with TelemetryExporter(tap.telemetry, textfile_path=str(textfile)):
+        stream.sync()
+
+    endpoint = 'endpoint="/2026-01/statistics/report"'
+    labels = f'{endpoint},stream="clicks"'
+    metrics = textfile.read_text().splitlines()
+    assert (
+        f'tap_criteo_requests_total{{{endpoint},status="200",stream="clicks"}} 1'
+        in (metrics)
+    )
+    assert (
+        f'tap_criteo_requests_total{{{endpoint},status="429",stream="clicks"}} 1'
+        in (metrics)
+    )
+    assert f"tap_criteo_rate_limited_total{{{labels}}} 1" in metrics
+    assert f"tap_criteo_retries_total{{{labels}}} 1" in metrics
+    assert 'tap_criteo_records_total{stream="clicks"} 1' in metrics
+    assert "tap_criteo_token_refreshes_total 1" in metrics
+    assert f'tap_criteo_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in (
+        metrics
+    )
@@ -0,0 +1,140 @@
+"""Tests for syncing several tenants in a single run."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import requests  # type: ignore[import-untyped]
+from singer_sdk.authenticators import OAuthAuthenticator
+from singer_sdk.exceptions import ConfigValidationError
+from singer_sdk.helpers._state import get_state_partitions_list
+from singer_sdk.helpers._util import utc_now
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TENANTS = {"acme": ["1", "2"], "globex": ["3"]}
+
+CONFIG: dict[str, Any] = {
+    "tenants": [
+        {
+            "name": name,
+            "client_id": f"{name}-id",
+            "client_secret": f"{name}-secret",
+            "advertiser_ids": advertiser_ids,
+        }
+        for name, advertiser_ids in TENANTS.items()
+    ],
+    "start_date": "2025-06-01T00:00:00Z",
+    "reports": [{"name": "clicks", "dimensions": ["Day"], "metrics": ["Clicks"]}],
+}
+
+
+@pytest.fixture
+def tenant_auth(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Issue a fake access token per client ID."""
+
+    def update_access_token(self: OAuthAuthenticator) -> None:
+        self.access_token = f"token-{self.client_id}"
+        self.expires_in = 3600
+        self.last_refreshed = utc_now()
+
+    monkeypatch.setattr(OAuthAuthenticator, "update_access_token", update_access_token)
+
+
+def build_sender(
+    sent: list[requests.PreparedRequest],
+) -> Callable[..., requests.Response]:
+    """Return a stand-in for ``Session.send``, serving each tenant's account."""
+
+    def send(request: requests.PreparedRequest, **_: Any) -> requests.Response:  # noqa: ANN401
+        sent.append(request)
+        token = request.headers["Authorization"].removeprefix("Bearer token-")
+        tenant = token.removesuffix("-id")
+        if request.method == "POST":
+            advertiser_id = json.loads(request.body)["advertiserIds"]
+            body: dict = {
+                "Rows": [{"AdvertiserId": advertiser_id, "Day": "2025-06-01"}],
+            }
+        else:
+            body = {
+                "data": [
+                    {"id": advertiser_id, "type": "Advertiser", "attributes": {}}
+                    for advertiser_id in TENANTS[tenant]
+                ],
+            }
+        response = requests.Response()
+        response.status_code = 200
+        response.request = request
+        response._content = json.dumps(body).encode()  # noqa: SLF001
+        return response
+
+    return send
+
+
+@pytest.mark.usefixtures("tenant_auth")
+def test_tenants_sync(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+):
+    """Requests use their tenant's credentials, and records and state are tagged."""
+    tap = TapCriteo(config=CONFIG)
+    for name, stream in tap.streams.items():
+        stream.selected = name in {"advertisers", "clicks"}
+    sent: list[requests.PreparedRequest] = []
+    monkeypatch.setattr(tap.requests_session, "send", build_sender(sent))
+
+    tap.run_sync()
+
+    records: dict[str, list[dict]] = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+
+    assert sorted((r["tenant"], r["id"]) for r in records["advertisers"]) == [
+        ("acme", "1"),
+        ("acme", "2"),
+        ("globex", "3"),
+    ]
+    assert sorted((r["tenant"], r["AdvertiserId"]) for r in records["clicks"]) == [
+        ("acme", "1"),
+        ("acme", "2"),
+        ("globex", "3"),
+    ]
+    assert {
+        (json.loads(request.body)["advertiserIds"], request.headers["Authorization"])
+        for request in sent
+        if request.method == "POST"
+    } == {
+        ("1", "Bearer token-acme-id"),
+        ("2", "Bearer token-acme-id"),
+        ("3", "Bearer token-globex-id"),
+    }
+    assert sorted(
+        partition["context"]["tenant"]
+        for partition in get_state_partitions_list(tap.state, "clicks") or []
+    ) == ["acme", "acme", "globex"]
+
+
+def test_credentials_required_without_tenants():
+    """Top-level credentials are required unless tenants are set."""
+    config = {key: value for key, value in CONFIG.items() if key != "tenants"}
+    with pytest.raises(ConfigValidationError) as exc_info:
+        TapCriteo(config=config)
+    assert exc_info.value.errors == [
+        "client_id is required unless tenants are set",
+        "client_secret is required unless tenants are set",
+        "advertiser_ids is required unless tenants are set",
+    ]
+
+
+def test_streams_are_discovered_without_credentials():
+    """Missing credentials are only reported when the config is not validated."""
+    config = {"start_date": CONFIG["start_date"], "reports": CONFIG["reports"]}
+    tap = TapCriteo(config=config, validate_config=False)
+    assert "clicks" in {entry["tap_stream_id"] for entry in tap.catalog_dict["streams"]}
@@ -0,0 +1,59 @@
+"""Tests for optional record validation."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from tap_criteo.tap import TapCriteo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import requests  # type: ignore[import-untyped]
+
+START = datetime.now(timezone.utc) - timedelta(days=3)
+
+CONFIG: dict[str, Any] = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "advertiser_ids": ["1", "2"],
+    "start_date": START.isoformat(),
+    "record_validation": "first_page",
+    "reports": [
+        {
+            "name": "clicks",
+            "dimensions": ["Day"],
+            "metrics": ["Clicks"],
+            "window_days": 1,
+        },
+    ],
+}
+
+
+@pytest.mark.usefixtures("offline_auth")
+def test_first_page_validation(
+    monkeypatch: pytest.MonkeyPatch,
+    report_response: Callable[[list[dict]], requests.Response],
+):
+    """Only the rows of the first report window of each advertiser are validated."""
+    tap = TapCriteo(config=CONFIG)
+    stream = tap.streams["clicks"]
+
+    def request_report(
+        prepared_request: requests.PreparedRequest,
+        context: dict,  # noqa: ARG001
+    ) -> requests.Response:
+        day = json.loads(prepared_request.body or "{}")["startDate"][:10]
+        return report_response([{"Day": day, "Clicks": "1"}])
+
+    monkeypatch.setattr(stream, "_request", request_report)
+    stream.sync()
+
+    assert tap.telemetry.total("records", stream="clicks") > 2  # noqa: PLR2004
+    assert tap.telemetry.total("validated_records", stream="clicks") == 2  # noqa: PLR2004
+    assert tap.telemetry.total("validation_seconds", stream="clicks") > 0
+    assert tap.telemetry.total("invalid_records", stream="clicks") == 0